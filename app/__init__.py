@@ -4,8 +4,19 @@ from werkzeug.exceptions import HTTPException  # Importing HTTPException for han
 
 from .config import Config  # Importing configuration settings from a separate module
 from .routes.article_routes import article_bp  # Importing article routes blueprint
+from .routes.batch_routes import batch_bp  # Importing batch request routes blueprint
+from .routes.job_routes import job_bp  # Importing background job routes blueprint
+from .routes.profile_routes import profile_bp  # Importing request profile routes blueprint
+from .routes.stats_routes import stats_bp  # Importing runtime statistics routes blueprint
 from .routes.user_routes import user_bp  # Importing user routes blueprint
+from .services.token_service import token_service  # Importing the token service that tracks revoked tokens
 from .swagger_config import create_swagger_blueprint  # Importing function to create Swagger UI blueprint
+from .utils.compression import init_compression  # Importing response compression setup
+from .utils.database import init_database  # Importing the per-request database connection handling
+from .utils.deadlines import init_deadlines  # Importing request deadline setup
+from .utils.idempotency import init_idempotency  # Importing the store of idempotent responses
+from .utils.profiling import init_profiling  # Importing on-demand request profiling setup
+from .utils.rate_limiting import init_rate_limiting  # Importing rate limiting and admission control setup
 
 
 def create_app():
@@ -36,6 +47,17 @@ def create_app():
         return jsonify({"error": "Expired token",
                         "message": "The token has expired. Please log in again."}), 401  # Return error message for expired token
 
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        """Reject tokens that were revoked (logout, password change, account deletion)."""
+        return token_service.is_revoked(jwt_payload['jti'])  # Answered from memory, without a database query
+
+    @jwt.revoked_token_loader
+    def revoked_token_response(jwt_header, jwt_payload):
+        """Handles the case where a revoked token is used."""
+        return jsonify({"error": "Revoked token",
+                        "message": "The token has been revoked. Please log in again."}), 401  # Return error message for revoked token
+
     @app.errorhandler(Exception)
     def handle_exception(e):
         """Handle all unhandled exceptions and return a JSON response."""
@@ -52,6 +74,17 @@ def create_app():
     # Register blueprints for user and article routes with a common URL prefix
     app.register_blueprint(user_bp, url_prefix='/api')  # Register user routes
     app.register_blueprint(article_bp, url_prefix='/api')  # Register article routes
+    app.register_blueprint(job_bp, url_prefix='/api')  # Register background job routes
+    app.register_blueprint(batch_bp, url_prefix='/api')  # Register batch request routes
+    app.register_blueprint(stats_bp, url_prefix='/api')  # Register runtime statistics routes
+    app.register_blueprint(profile_bp, url_prefix='/api')  # Register request profile routes
     app.register_blueprint(swaggerui_blueprint)  # Register Swagger UI blueprint for API documentation
 
+    init_database(app)  # Return each request's database connections to the pool when it ends
+    init_compression(app)  # Compress large responses negotiated via Accept-Encoding
+    init_deadlines(app)  # Give each request a deadline, enforced on its slow queries
+    init_rate_limiting(app)  # Limit requests per client and route class, and shed load when saturated
+    init_idempotency(app)  # Store the responses of writes made with an Idempotency-Key, to replay them
+    init_profiling(app)  # Profile requests carrying the profiling token, or a sampled share of them
+
     return app  # Return the configured Flask app instance
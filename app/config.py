@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from a .env file
@@ -19,9 +20,146 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = 1 * 60 * 60  # Access token now expires in 1 hour (3600 seconds)
     JWT_REFRESH_TOKEN_EXPIRES = 30 * 24 * 60 * 60  # Refresh token expires in 30 days
 
+    # Token revocation settings
+    TOKEN_BLOCKLIST_CAPACITY = int(os.getenv('TOKEN_BLOCKLIST_CAPACITY', '100000'))  # Revoked tokens per Bloom filter
+    TOKEN_BLOCKLIST_FALSE_POSITIVE_RATE = float(os.getenv('TOKEN_BLOCKLIST_FALSE_POSITIVE_RATE', '0.01'))
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = float(os.getenv('TOKEN_BLOCKLIST_SYNC_INTERVAL', '2'))  # Seconds between polls
+    TOKEN_BLOCKLIST_SYNC_MARGIN = float(os.getenv('TOKEN_BLOCKLIST_SYNC_MARGIN', '10'))  # Look-back of each poll
+    TOKEN_BLOCKLIST_PRUNE_INTERVAL = float(os.getenv('TOKEN_BLOCKLIST_PRUNE_INTERVAL', '3600'))  # Expired token pruning
+
     # MySQL database connection settings
     MYSQL_HOST = os.getenv('MYSQL_HOST', 'localhost')  # Host where the MySQL server is running
     MYSQL_PORT = os.getenv('MYSQL_PORT', '3306')  # Port for MySQL connection
     MYSQL_USER = os.getenv('MYSQL_USER', 'root')  # MySQL user for authentication
     MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD', '')  # Password for the MySQL user
     MYSQL_DATABASE = os.getenv('MYSQL_DATABASE', 'mysql')  # Name of the database to connect to
+
+    # Connection pool settings (connections are bound to a thread for the duration of a request or job)
+    DB_POOL_MAX_IDLE = int(os.getenv('DB_POOL_MAX_IDLE', '16'))  # Idle connections kept per process
+    DB_POOL_PING_AFTER = float(os.getenv('DB_POOL_PING_AFTER', '30'))  # Idle seconds after which a ping checks it
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '32'))  # Prepared statements per connection
+
+    # Sharding settings (the articles of each user live in one database; empty = only the main database)
+    ARTICLE_SHARDS = os.getenv('ARTICLE_SHARDS', '')  # Extra shards: database names or mysql:// URLs, comma-separated
+    SHARD_VIRTUAL_NODES = int(os.getenv('SHARD_VIRTUAL_NODES', '64'))  # Points per shard on the hash ring
+    SHARD_DIRECTORY_REFRESH = float(os.getenv('SHARD_DIRECTORY_REFRESH', '30'))  # Seconds between directory reloads
+    SHARD_QUERY_WORKERS = int(os.getenv('SHARD_QUERY_WORKERS', '8'))  # Threads querying shards in parallel
+
+    # Production server settings (used by gunicorn.conf.py)
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '0'))  # Worker processes (0 = sized to the available cores)
+    WEB_THREADS = int(os.getenv('WEB_THREADS', '4'))  # Request threads per worker process
+
+    # Group commit settings (concurrent article writes of a process share one transaction and commit)
+    GROUP_COMMIT_ENABLED = os.getenv('GROUP_COMMIT_ENABLED', 'false').lower() == 'true'  # Batch single writes
+    GROUP_COMMIT_WINDOW_MS = float(os.getenv('GROUP_COMMIT_WINDOW_MS', '2'))  # Time a group waits for more writes
+    GROUP_COMMIT_MAX_SIZE = int(os.getenv('GROUP_COMMIT_MAX_SIZE', '64'))  # Writes committed together at most
+
+    # Bulk import settings
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '500'))  # Number of entries inserted per transaction
+
+    # Response compression settings
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'  # Compress large responses
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))  # Smallest body (bytes) worth compressing
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', '6'))  # gzip compression level (1-9)
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', '3'))  # zstd level (1-22), used when installed
+    COMPRESSION_CACHE_MAX_BYTES = int(os.getenv('COMPRESSION_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))  # Cache budget
+
+    # Rate limiting and admission control settings
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'  # Enforce per-client limits
+    # Token buckets per route class, as "class=requests/seconds" pairs
+    RATE_LIMITS = os.getenv('RATE_LIMITS', 'login=10/60,search=60/60,write=120/60,read=600/60')
+    RATE_LIMIT_MAX_BUCKETS = int(os.getenv('RATE_LIMIT_MAX_BUCKETS', '100000'))  # Buckets kept in memory
+    RATE_LIMIT_STORAGE_URL = os.getenv('RATE_LIMIT_STORAGE_URL')  # Optional Redis URL to share buckets
+    MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', '32'))  # Requests served at once (0 = no limit)
+    RATE_LIMIT_QUEUE_TIMEOUT = float(os.getenv('RATE_LIMIT_QUEUE_TIMEOUT', '0.5'))  # Seconds to wait for a free slot
+
+    # Idempotency key settings (Idempotency-Key header on the article write routes)
+    IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '86400'))  # Seconds a response is replayed for a key
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv('IDEMPOTENCY_MAX_ENTRIES', '10000'))  # Responses kept in memory
+    IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT', '30'))  # Seconds a duplicate waits for the first
+    IDEMPOTENCY_STORAGE_URL = os.getenv('IDEMPOTENCY_STORAGE_URL')  # Optional Redis URL to share stored responses
+    IDEMPOTENCY_CLAIM_TTL = float(os.getenv('IDEMPOTENCY_CLAIM_TTL', '60'))  # Seconds a dead process's key stays claimed
+
+    # Request deadline settings (queries of slow routes are interrupted when the request's time is up)
+    REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT', '30'))  # Default seconds a request may take (0 = no deadline)
+    # Per-endpoint timeouts, as "endpoint=seconds" pairs
+    REQUEST_TIMEOUTS = os.getenv('REQUEST_TIMEOUTS', 'article.search_articles=5')
+    REQUEST_MAX_TIMEOUT = float(os.getenv('REQUEST_MAX_TIMEOUT', '60'))  # Longest timeout a client may ask for
+
+    # Request coalescing settings
+    SINGLE_FLIGHT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', '10'))  # Seconds to wait for a shared read
+
+    # Article list settings (filtered, sorted and paginated lists)
+    ARTICLE_PAGE_SIZE = int(os.getenv('ARTICLE_PAGE_SIZE', '100'))  # Default articles per page
+    ARTICLE_MAX_PAGE_SIZE = int(os.getenv('ARTICLE_MAX_PAGE_SIZE', '1000'))  # Largest page accepted
+
+    # Batch request settings (POST /api/batch)
+    BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '20'))  # Sub-requests per batch
+    BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', '4'))  # Worker threads running concurrent reads in each process
+
+    # DOI lookup settings
+    DOI_LOOKUP_MAX = int(os.getenv('DOI_LOOKUP_MAX', '1000'))  # Maximum number of DOIs resolved per request
+
+    # Related articles (TF-IDF) index settings
+    RELATED_MEMORY_BUDGET = int(os.getenv('RELATED_MEMORY_BUDGET', str(64 * 1024 * 1024)))  # Matrix budget in bytes
+    RELATED_REBUILD_INTERVAL = float(os.getenv('RELATED_REBUILD_INTERVAL', '30'))  # Min seconds between rebuilds
+    RELATED_MAX_RESULTS = int(os.getenv('RELATED_MAX_RESULTS', '50'))  # Largest k accepted by the endpoint
+
+    # Citation graph settings
+    CITATION_BATCH_MAX = int(os.getenv('CITATION_BATCH_MAX', '1000'))  # Citations added or removed per request
+    CITATION_MAX_DEPTH = int(os.getenv('CITATION_MAX_DEPTH', '3'))  # Deepest traversal accepted by the endpoint
+    CITATION_MAX_NODES = int(os.getenv('CITATION_MAX_NODES', '1000'))  # Articles reached before a traversal stops
+    CITATION_MAX_EDGES = int(os.getenv('CITATION_MAX_EDGES', '10000'))  # Citations read per traversal level
+    CITATION_CACHE_SIZE = int(os.getenv('CITATION_CACHE_SIZE', '1024'))  # Cached neighborhoods (0 disables the cache)
+    CITATION_CACHE_TTL = float(os.getenv('CITATION_CACHE_TTL', '60'))  # Seconds a cached neighborhood is served
+
+    # Article snapshot settings (article reads served from a memory-mapped file shared by the processes)
+    ARTICLE_SNAPSHOT_PATH = os.getenv('ARTICLE_SNAPSHOT_PATH',
+                                      os.path.join(tempfile.gettempdir(), 'article-snapshot', 'articles.snapshot'))
+    ARTICLE_SNAPSHOT_SERVING = os.getenv('ARTICLE_SNAPSHOT_SERVING', 'false').lower() == 'true'  # Serve reads from it
+    ARTICLE_SNAPSHOT_CHECK_INTERVAL = float(os.getenv('ARTICLE_SNAPSHOT_CHECK_INTERVAL', '1'))  # Seconds between checks
+
+    # Near-duplicate detection settings (MinHash signatures in an LSH index)
+    DUPLICATE_PERMUTATIONS = int(os.getenv('DUPLICATE_PERMUTATIONS', '128'))  # Hash functions per signature
+    DUPLICATE_BANDS = int(os.getenv('DUPLICATE_BANDS', '32'))  # LSH bands (each of PERMUTATIONS / BANDS rows)
+    DUPLICATE_THRESHOLD = float(os.getenv('DUPLICATE_THRESHOLD', '0.6'))  # Min estimated similarity reported
+    DUPLICATE_LIMIT = int(os.getenv('DUPLICATE_LIMIT', '100'))  # Default number of duplicate pairs returned
+
+    # In-memory index settings (trigram, autocomplete, related and duplicate indexes of each process)
+    INDEX_SYNC_INTERVAL = float(os.getenv('INDEX_SYNC_INTERVAL', '1'))  # Min seconds between change log reads
+    INDEX_SYNC_BATCH_SIZE = int(os.getenv('INDEX_SYNC_BATCH_SIZE', '1000'))  # Changes read per query
+    INDEX_SYNC_REPLAY = float(os.getenv('INDEX_SYNC_REPLAY', '300'))  # Seconds of changes re-applied after a build
+
+    # Fuzzy (trigram) search settings
+    FUZZY_SEARCH_THRESHOLD = float(os.getenv('FUZZY_SEARCH_THRESHOLD', '0.5'))  # Min share of query trigrams matched
+    FUZZY_SEARCH_LIMIT = int(os.getenv('FUZZY_SEARCH_LIMIT', '20'))  # Maximum number of fuzzy search results
+
+    # Autocomplete settings
+    SUGGEST_LIMIT = int(os.getenv('SUGGEST_LIMIT', '10'))  # Default number of suggestions returned
+
+    # Change feed settings
+    CHANGE_FEED_PAGE_SIZE = int(os.getenv('CHANGE_FEED_PAGE_SIZE', '500'))  # Default changes per page
+    CHANGE_FEED_MAX_PAGE_SIZE = int(os.getenv('CHANGE_FEED_MAX_PAGE_SIZE', '2000'))  # Largest page accepted
+
+    # Request profiling settings (sampled stacks of individual requests, in collapsed-stack format)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'  # Allow requests to be profiled
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN')  # Secret sent in X-Profile-Token to profile a request
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))  # Share of requests profiled at random (0-1)
+    PROFILING_SLOW_MS = float(os.getenv('PROFILING_SLOW_MS', '0'))  # Sampled requests faster than this are not stored
+    PROFILING_INTERVAL_MS = float(os.getenv('PROFILING_INTERVAL_MS', '5'))  # Milliseconds between stack samples
+    PROFILING_DIR = os.getenv('PROFILING_DIR', os.path.join(tempfile.gettempdir(), 'api-profiles'))  # Ring buffer
+    PROFILING_MAX_PROFILES = int(os.getenv('PROFILING_MAX_PROFILES', '200'))  # Profiles kept in the ring buffer
+
+    # User deletion settings (the articles of a deleted user are purged by a background job)
+    USER_PURGE_BATCH_SIZE = int(os.getenv('USER_PURGE_BATCH_SIZE', '500'))  # Articles deleted per transaction
+    USER_PURGE_PAUSE_MS = int(os.getenv('USER_PURGE_PAUSE_MS', '50'))  # Pause between batches, leaving room for others
+    USER_PURGE_REFRESH_INTERVAL = float(os.getenv('USER_PURGE_REFRESH_INTERVAL', '1'))  # Seconds between reloads
+    # of the users being deleted (whose articles are hidden) by each process
+
+    # Background job settings
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))  # Worker threads running background jobs in each process
+    JOB_PROGRESS_INTERVAL = float(os.getenv('JOB_PROGRESS_INTERVAL', '1'))  # Min seconds between progress writes
+    JOB_STALE_SECONDS = int(os.getenv('JOB_STALE_SECONDS', '600'))  # Silence after which a running job is failed
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '5'))  # Seconds between looks for jobs of other processes
+    JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', '7'))  # Days finished jobs are kept
+    JOB_SPOOL_DIR = os.getenv('JOB_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'article-jobs'))  # Upload files
@@ -0,0 +1,63 @@
+class Job:
+    """
+    The 'Job' class represents a background job of the Scientific Article Management System, such as
+    a bulk import or an index rebuild. It holds the job's parameters, its progress and, once it has
+    finished, its result or error.
+    """
+
+    def __init__(self, id, type, status, user_id, params, progress, total, result, error, attempts,
+                 cancel_requested, created_at, started_at, finished_at, updated_at):
+        # Initialize a new instance of the Job class with the following attributes:
+
+        self.id = id
+        # 'id' is the unique identifier of the job (a random hexadecimal string)
+
+        self.type = type
+        # 'type' is the name of the handler that runs the job (e.g. 'import_articles')
+
+        self.status = status
+        # 'status' is one of 'queued', 'running', 'succeeded', 'failed' or 'cancelled'
+
+        self.user_id = user_id
+        # 'user_id' is the identifier of the user the job works for, if any
+
+        self.params = params
+        # 'params' is a dictionary with the arguments of the handler
+
+        self.progress = progress
+        # 'progress' is the number of work items processed so far
+
+        self.total = total
+        # 'total' is the number of work items to process, or None if unknown
+
+        self.result = result
+        # 'result' is the value returned by the handler once the job succeeded
+
+        self.error = error
+        # 'error' is the error message of a failed job
+
+        self.attempts = attempts
+        # 'attempts' is the number of times the job was started
+
+        self.cancel_requested = bool(cancel_requested)
+        # 'cancel_requested' is True once a client asked to cancel the running job
+
+        self.created_at = created_at
+        # 'created_at' is when the job was submitted
+
+        self.started_at = started_at
+        # 'started_at' is when the current attempt started
+
+        self.finished_at = finished_at
+        # 'finished_at' is when the job succeeded, failed or was cancelled
+
+        self.updated_at = updated_at
+        # 'updated_at' is when the job last reported progress
+
+    def to_dict(self):
+        """Return the job as a JSON-serializable dictionary for API responses."""
+        data = dict(self.__dict__)
+        for key in ('created_at', 'started_at', 'finished_at', 'updated_at'):
+            if data[key] is not None and not isinstance(data[key], str):
+                data[key] = data[key].isoformat()  # Dates are returned in ISO 8601 format
+        return data
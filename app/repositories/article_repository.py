@@ -1,34 +1,110 @@
 import json  # Import the JSON library for converting lists to JSON strings
+import re  # Import the re module to recognize complete DOIs
 
-import mysql.connector  # Import the MySQL connector library to interact with the MySQL database
 from werkzeug.exceptions import BadRequest
 
 from app.config import Config  # Import the configuration settings
 from app.models.article import Article  # Import the Article model to work with article data
+from app.repositories.base_repository import BaseRepository  # Import the base class giving the thread's connection
+from app.utils.database import get_connection  # Import the per-thread connection pool
+from app.utils.deadlines import enforce, fetch_all  # Import the helpers enforcing request deadlines
+from app.utils.group_commit import GroupCommit  # Import GroupCommit to share commits between concurrent writes
+from app.utils.sharding import shard_router  # Import the router sending each user's articles to its shard
 
+DOI_PATTERN = re.compile(r"^10\.\d{4,9}/\S+$")  # A complete (normalized) DOI, e.g. "10.1234/abc"
 
-class ArticleRepository:
+
+class ArticleRepository(BaseRepository):
     """
     The ArticleRepository class handles interactions with the database for article-related operations.
     It provides a clear separation between business logic and data access logic,
     ensuring that all database queries (e.g., fetching, saving, updating articles) are managed
     in a central, structured manner.
+
+    Articles are sharded by user (see ShardRouter): each query runs on the shard of the user it
+    concerns, or of the article ID it is given, and the IDs returned encode their shard. With a
+    single shard the IDs are the plain row IDs of the main database.
     """
 
-    def __init__(self):
-        # Initialize the database connection using parameters from the Config class
-        self.connection = mysql.connector.connect(
-            host=Config.MYSQL_HOST,  # Database host
-            port=Config.MYSQL_PORT,  # Database port
-            user=Config.MYSQL_USER,  # Database user
-            password=Config.MYSQL_PASSWORD,  # Database password
-            database=Config.MYSQL_DATABASE  # Database name
-        )
-        self.cursor = self.connection.cursor()  # Create a cursor to execute database queries
+    def __init__(self, router=None):
+        self.router = router or shard_router
+        # Concurrent single-article writes share commits when group commit is enabled
+        self.group_commit = GroupCommit(Config.GROUP_COMMIT_WINDOW_MS / 1000,
+                                        Config.GROUP_COMMIT_MAX_SIZE) if Config.GROUP_COMMIT_ENABLED else None
+
+    def _connection(self, shard):
+        """The current thread's connection to a shard."""
+        name, options = self.router.connection(shard)
+        return get_connection(name, **options)
+
+    def _fetch_all(self, shard, query, params, deadline=None):
+        """Run a query on a shard and return its rows, interrupting it at the request's deadline (see `fetch_all`)."""
+        name, options = self.router.connection(shard)
+        return fetch_all(name, options, query, params, deadline)
+
+    def _enforce(self, shard, deadline):
+        """Interrupt the statements of the block on a shard at the request's deadline (see `enforce`)."""
+        name, options = self.router.connection(shard)
+        return enforce(name, options, deadline)
+
+    def _to_article(self, shard, row):
+        """Convert a scientific_articles row of a shard into an Article with its global ID."""
+        article = Article(*row)  # Unpack the row directly into the Article constructor
+        for field in ('authors', 'keywords'):
+            if isinstance(getattr(article, field), (bytes, bytearray)):  # Prepared statements return JSON as bytes
+                setattr(article, field, getattr(article, field).decode('utf-8'))
+        article.id = self.router.encode_id(shard, article.id)
+        return article
+
+    def _write(self, shard, operation):
+        """
+        Run a write on a shard and commit it.
+
+        The write gets its own transaction, or, with group commit enabled, joins the next group of
+        concurrent writes to the shard (see GroupCommit); either way it is committed (or has failed
+        and been rolled back) when this returns.
+        """
+        if self.group_commit is not None:
+            return self.group_commit.run(shard, operation, lambda: self._connection(shard))
+        connection = self._connection(shard)
+        try:
+            result = operation()
+            connection.commit()  # Commit the transaction to save changes
+        except Exception:
+            connection.rollback()  # Never leave half of the write pending on the connection
+            raise
+        return result
 
     def create_article(self, article):
         """Insert a new article into the database."""
-        self.cursor.execute(
+        shard = self.router.shard_for_user(article.user_id)
+        self._write(shard, lambda: self._insert_article(shard, article))
+        return article  # Return the newly created article
+
+    def create_articles(self, articles):
+        """
+        Insert several articles in a single transaction.
+
+        All rows are committed together; if any insert fails the whole batch is rolled back
+        and the error is re-raised, so the caller can retry the entries individually.
+        The articles must belong to users of the same shard (e.g. to a single user).
+        """
+        shards = {self.router.shard_for_user(article.user_id) for article in articles}
+        if len(shards) > 1:
+            raise ValueError("A batch of articles must belong to a single shard.")
+        shard = shards.pop() if shards else 0
+        try:
+            for article in articles:
+                self._insert_article(shard, article)
+            self._connection(shard).commit()  # Commit the whole batch at once
+        except Exception:
+            self._connection(shard).rollback()  # Discard the partially inserted batch
+            raise
+        return articles  # Return the newly created articles
+
+    def _insert_article(self, shard, article):
+        """Insert an article and its change log entry into a shard, without committing."""
+        cursor = self.router.statements(shard).execute(
             """
             INSERT INTO scientific_articles 
             (title, authors, publication_date, keywords, abstract, journal, doi, pages, user_id) 
@@ -46,47 +122,312 @@ class ArticleRepository:
                 article.user_id
             )  # Parameterized query
         )
-        self.connection.commit()  # Commit the transaction to save changes
-        article.id = self.cursor.lastrowid  # Set the article ID to the last inserted row ID
-        return article  # Return the newly created article
+        local_id = cursor.lastrowid  # Read before the change log insert reuses the cursor
+        self._log_change(shard, local_id, article.user_id, 'upsert')
+        article.id = self.router.encode_id(shard, local_id)  # Set the article ID from the inserted row ID
+
+    def _log_change(self, shard, local_id, user_id, operation):
+        """Append an entry to a shard's article change log, in the current transaction."""
+        self.router.statements(shard).execute(
+            "INSERT INTO article_changes (article_id, user_id, operation) VALUES (%s, %s, %s)",
+            (local_id, user_id, operation)  # Parameterized query
+        )
+
+    def get_changes(self, user_id, since, limit, deadline=None):
+        """
+        Fetch a user's article changes with a sequence number greater than `since`, oldest first.
+
+        Sequence numbers are assigned when a change is inserted but become visible when its
+        transaction commits, so a change could be committed after a higher one has been served (and
+        the client's `since` token has moved past it). The changes are therefore read with a locking
+        read, which waits for the transactions still writing changes of the user in the range
+        (e.g. an import batch or a group commit) to commit or roll back, and the page never skips a
+        change. Sequence numbers are those of the user's shard.
+        """
+        shard = self.router.shard_for_user(user_id)
+        try:
+            rows = self._fetch_all(
+                shard,
+                """
+                SELECT seq, article_id, operation FROM article_changes
+                WHERE user_id = %s AND seq > %s
+                ORDER BY seq LIMIT %s FOR SHARE
+                """,
+                (user_id, since, limit),  # Parameterized query to prevent SQL injection
+                deadline
+            )
+        finally:
+            self._connection(shard).commit()  # Release the shared locks at once
+        return [(seq, self.router.encode_id(shard, local_id), operation)
+                for seq, local_id, operation in rows]  # Return (seq, article_id, operation) rows
+
+    def get_shard_changes(self, shard, since, limit):
+        """
+        Fetch the article changes of every user of a shard with a sequence number greater than
+        `since`, oldest first.
+
+        As in `get_changes`, the changes are read with a locking read, which waits for the
+        transactions still writing changes in the range, so a reader following the sequence numbers
+        never skips a change.
+        """
+        try:
+            rows = self._fetch_all(
+                shard,
+                "SELECT seq, article_id, operation FROM article_changes WHERE seq > %s ORDER BY seq LIMIT %s FOR SHARE",
+                (since, limit)  # Parameterized query to prevent SQL injection
+            )
+        finally:
+            self._connection(shard).commit()  # Release the shared locks at once
+        return [(seq, self.router.encode_id(shard, local_id), operation)
+                for seq, local_id, operation in rows]  # Return (seq, article_id, operation) rows
+
+    def get_change_positions(self, seconds):
+        """
+        Return, for each shard, the sequence number of its last change logged more than `seconds`
+        seconds ago (0 if there is none), reading only the recent end of each change log.
+        """
+
+        def fetch(shard):
+            rows = self._fetch_all(
+                shard,
+                """
+                SELECT seq FROM article_changes WHERE changed_at < NOW(6) - INTERVAL %s MICROSECOND
+                ORDER BY seq DESC LIMIT 1
+                """,
+                (int(seconds * 1000000),)  # Parameterized query
+            )
+            return rows[0][0] if rows else 0
 
-    def get_article_by_id(self, article_id):
-        """Fetch an article from the database using the article ID."""
-        self.cursor.execute(
-            "SELECT * FROM scientific_articles WHERE id = %s",
-            (article_id,)  # Parameterized query to prevent SQL injection
+        return dict(enumerate(self.router.scatter(fetch)))
+
+    def get_index_generation(self):
+        """Return the generation of the in-memory indexes, stored on the main database."""
+        rows = self._fetch_all(0, "SELECT generation FROM index_generation WHERE id = 1", ())
+        return rows[0][0] if rows else 0
+
+    def increment_index_generation(self):
+        """Increment the generation of the in-memory indexes, asking every process to rebuild them."""
+        connection = self._connection(0)
+        self.router.cursor(0).execute("UPDATE index_generation SET generation = generation + 1 WHERE id = 1")
+        connection.commit()  # Commit the transaction to save changes
+
+    def get_article_ids_by_dois(self, user_id, dois, deadline=None):
+        """Map each of the given (normalized) DOIs that exist in a user's library to its article ID."""
+        if not dois:
+            return {}
+        placeholders = ', '.join(['%s'] * len(dois))  # One placeholder per DOI
+        shard = self.router.shard_for_user(user_id)
+        rows = self._fetch_all(
+            shard, f"SELECT doi, id FROM scientific_articles WHERE user_id = %s AND doi IN ({placeholders})",
+            (user_id, *dois),  # Parameterized query to prevent SQL injection
+            deadline
+        )
+        # Build the DOI to ID mapping
+        return {doi: self.router.encode_id(shard, local_id) for doi, local_id in rows}
+
+    def get_article_by_doi(self, user_id, doi):
+        """Fetch an article from a user's library using its exact (normalized) DOI."""
+        shard = self.router.shard_for_user(user_id)
+        cursor = self.router.cursor(shard)
+        cursor.execute(
+            "SELECT * FROM scientific_articles WHERE user_id = %s AND doi = %s LIMIT 1",
+            (user_id, doi)  # Parameterized query to prevent SQL injection
         )
-        result = self.cursor.fetchone()  # Fetch one result from the executed query
+        result = cursor.fetchone()  # Fetch one result from the executed query
         if result:
-            return Article(*result)  # Unpack result directly into Article constructor
+            return self._to_article(shard, result)
         return None  # Return None if no article found
 
-    def get_all_articles(self):
-        """Fetch all articles from the database."""
-        self.cursor.execute("SELECT * FROM scientific_articles")
-        results = self.cursor.fetchall()  # Fetch all results from the executed query
-        return [Article(*article) for article in results]  # Convert each result into an Article instance
+    def get_article_by_id(self, article_id, deadline=None):
+        """Fetch an article from the database using the article ID, within the request's `deadline` (if any)."""
+        location = self.router.decode_id(article_id)
+        if location is None:
+            return None  # The ID does not belong to any shard
+        shard, local_id = location
+        with self._enforce(shard, deadline):
+            cursor = self.router.statements(shard).execute(  # The most frequent lookup, so kept prepared
+                "SELECT * FROM scientific_articles WHERE id = %s",
+                (local_id,)  # Parameterized query to prevent SQL injection
+            )
+            result = cursor.fetchone()  # Fetch one result from the executed query
+        if result:
+            return self._to_article(shard, result)
+        return None  # Return None if no article found
 
-    def get_articles_by_user_id(self, user_id):
-        """Fetch articles from the database using the user ID."""
-        self.cursor.execute(
-            "SELECT * FROM scientific_articles WHERE user_id = %s",
-            (user_id,)  # Parameterized query to prevent SQL injection
+    def get_articles_by_ids(self, article_ids, deadline=None):
+        """
+        Fetch several articles from the database with a single query per shard, run in parallel, within
+        the request's `deadline` (if any).
+        """
+        local_ids = {}  # shard -> IDs within the shard
+        for location in filter(None, map(self.router.decode_id, article_ids)):
+            local_ids.setdefault(location[0], []).append(location[1])
+        if not local_ids:
+            return []
+
+        def fetch(shard):
+            ids = local_ids[shard]
+            placeholders = ', '.join(['%s'] * len(ids))  # One placeholder per article ID
+            rows = self._fetch_all(
+                shard, f"SELECT * FROM scientific_articles WHERE id IN ({placeholders})",
+                tuple(ids),  # Parameterized query to prevent SQL injection
+                deadline
+            )
+            return [self._to_article(shard, row) for row in rows]  # Convert each result into an Article
+
+        return [article for articles in self.router.scatter(fetch, sorted(local_ids)) for article in articles]
+
+    def get_all_articles(self, deadline=None):
+        """Fetch all articles from the database, querying the shards in parallel, within the `deadline` (if any)."""
+
+        def fetch(shard):
+            rows = self._fetch_all(shard, "SELECT * FROM scientific_articles", (), deadline)
+            return [self._to_article(shard, row) for row in rows]  # Convert each result into an Article
+
+        return [article for articles in self.router.scatter(fetch) for article in articles]
+
+    def find_articles(self, query, user_id=None, deadline=None):
+        """
+        Fetch a page of articles matching the filters of an ArticleQuery, in its sort order, within
+        the request's `deadline` (if any).
+
+        The conditions and the ORDER BY are built only from whitelisted columns, with the values
+        passed as parameters, and match the composite indexes of migration 006: equality on
+        `user_id` (and `journal`), then a range scan on the sort column and the ID. Without a user,
+        every shard is queried in parallel for a page and the pages are merged.
+
+        **Returns:**
+            - Up to `query.limit + 1` articles; the extra one tells the caller another page follows.
+        """
+        column, direction = query.column, 'DESC' if query.descending else 'ASC'
+        conditions, params = [], []
+        if user_id is not None:
+            conditions.append("user_id = %s")
+            params.append(user_id)
+        if query.journal is not None:
+            conditions.append("journal = %s")
+            params.append(query.journal)
+        if query.date_from is not None:
+            conditions.append("publication_date >= %s")
+            params.append(query.date_from)
+        if query.date_to is not None:
+            conditions.append("publication_date <= %s")
+            params.append(query.date_to)
+        if query.min_pages is not None:
+            conditions.append("pages >= %s")
+            params.append(query.min_pages)
+        if query.max_pages is not None:
+            conditions.append("pages <= %s")
+            params.append(query.max_pages)
+
+        def fetch(shard):
+            shard_conditions, shard_params = list(conditions), list(params)
+            if query.after is not None:
+                value, article_id = query.after
+                bound = self.router.local_bound(shard, article_id)  # The cursor's ID on this shard
+                operator = '<' if query.descending else '>'
+                if column == 'id':
+                    shard_conditions.append(f"id {operator} %s")
+                    shard_params.append(bound)
+                else:
+                    shard_conditions.append(f"({column}, id) {operator} (%s, %s)")
+                    shard_params.extend([value, bound])
+            where = f"WHERE {' AND '.join(shard_conditions)}" if shard_conditions else ""
+            order = f"{column} {direction}, id {direction}" if column != 'id' else f"id {direction}"
+            rows = self._fetch_all(
+                shard, f"SELECT * FROM scientific_articles {where} ORDER BY {order} LIMIT %s",
+                (*shard_params, query.limit + 1),  # Parameterized query to prevent SQL injection
+                deadline
+            )
+            return [self._to_article(shard, row) for row in rows]  # Convert each result into an Article
+
+        if user_id is not None:
+            return fetch(self.router.shard_for_user(user_id))
+        if not self.router.sharded:
+            return fetch(0)
+        articles = [article for page in self.router.scatter(fetch) for article in page]
+        articles.sort(key=query.sort_key, reverse=query.descending)  # Merge the pages of the shards
+        return articles[:query.limit + 1]
+
+    def get_articles_by_user_id(self, user_id, deadline=None):
+        """Fetch articles from the database using the user ID, within the request's `deadline` (if any)."""
+        shard = self.router.shard_for_user(user_id)
+        results = self._fetch_all(
+            shard, "SELECT * FROM scientific_articles WHERE user_id = %s",
+            (user_id,),  # Parameterized query to prevent SQL injection
+            deadline
         )
-        results = self.cursor.fetchall()  # Fetch all results from the executed query
         if results:
-            return [Article(*article) for article in results]  # Convert each result into an Article instance
+            return [self._to_article(shard, article) for article in results]  # Convert each result into an Article
         return None  # Return None if no articles found
 
-    def search_articles(self, user_id, search_term, search_type):
+    def count_articles_by_user_id(self, user_id):
+        """Count the articles of a user."""
+        cursor = self.router.cursor(self.router.shard_for_user(user_id))
+        cursor.execute(
+            "SELECT COUNT(*) FROM scientific_articles WHERE user_id = %s",
+            (user_id,)  # Parameterized query to prevent SQL injection
+        )
+        return cursor.fetchone()[0]
+
+    def get_article_ids_by_user_id(self, user_id, limit):
+        """Fetch the IDs of up to `limit` articles of a user, lowest first."""
+        shard = self.router.shard_for_user(user_id)
+        cursor = self.router.cursor(shard)
+        cursor.execute(
+            "SELECT id FROM scientific_articles WHERE user_id = %s ORDER BY id LIMIT %s",
+            (user_id, limit)  # Parameterized query to prevent SQL injection
+        )
+        return [self.router.encode_id(shard, row[0]) for row in cursor.fetchall()]
+
+    def delete_user_articles(self, user_id, article_ids):
+        """
+        Delete a batch of a user's articles in a single transaction, leaving a tombstone for each
+        in the change log. Returns the number of articles deleted.
+        """
+        shard = self.router.shard_for_user(user_id)
+        local_ids = [self.router.decode_id(article_id)[1] for article_id in article_ids]
+        placeholders = ', '.join(['%s'] * len(local_ids))  # One placeholder per article ID
+
+        def delete():
+            cursor = self.router.cursor(shard)
+            cursor.execute(
+                f"""
+                INSERT INTO article_changes (article_id, user_id, operation)
+                SELECT id, user_id, 'delete' FROM scientific_articles WHERE user_id = %s AND id IN ({placeholders})
+                """,
+                (user_id, *local_ids)  # Parameterized query to prevent SQL injection
+            )
+            cursor.execute(
+                f"DELETE FROM scientific_articles WHERE user_id = %s AND id IN ({placeholders})",
+                (user_id, *local_ids)  # Parameterized query to prevent SQL injection
+            )
+            return cursor.rowcount
+
+        connection = self._connection(shard)
+        try:
+            deleted = delete()
+            connection.commit()  # A small transaction per batch: short row locks and little undo log
+        except Exception:
+            connection.rollback()  # Never leave half of the batch pending on the connection
+            raise
+        return deleted
+
+    def search_articles(self, user_id, search_term, search_type, deadline=None):
         """
         Search for scientific articles by title, keywords, or DOI based on the search type.
+
+        Partial matches scan the user's articles, so the query is bounded by the request's `deadline` (if any).
         """
         search_query = f"%{search_term}%"  # Prepare the search term for partial matching
 
         if search_type == "title":
             query = "SELECT * FROM scientific_articles WHERE user_id = %s AND title LIKE %s"
             params = (user_id, search_query)
+        elif search_type == "doi" and DOI_PATTERN.match(search_term):
+            # A complete DOI is looked up by exact match, using the (user_id, doi) index
+            query = "SELECT * FROM scientific_articles WHERE user_id = %s AND doi = %s"
+            params = (user_id, search_term)
         elif search_type == "doi":
             query = "SELECT * FROM scientific_articles WHERE user_id = %s AND doi LIKE %s"
             params = (user_id, search_query)
@@ -99,40 +440,58 @@ class ArticleRepository:
         else:
             raise BadRequest("Invalid search type. Use 'title', 'keywords', or 'doi'.")
 
-        self.cursor.execute(query, params)  # Execute the appropriate query
-        results = self.cursor.fetchall()  # Fetch all results matching the search criteria
+        shard = self.router.shard_for_user(user_id)
+        results = self._fetch_all(shard, query, params, deadline)  # Fetch all results matching the search criteria
         if results:
-            return [Article(*article) for article in results]  # Convert each result into an Article instance
+            return [self._to_article(shard, article) for article in results]  # Convert each result into an Article
         return []  # Return an empty list if no articles found
 
     def update_article(self, article_id, article):
         """Update an existing article's information in the database."""
-        self.cursor.execute(
-            """
-            UPDATE scientific_articles 
-            SET title = %s, authors = %s, publication_date = %s, keywords = %s, 
-            abstract = %s, journal = %s, doi = %s, pages = %s 
-            WHERE id = %s
-            """,
-            (
-                article.title,
-                json.dumps(article.authors),  # Convert authors list to JSON
-                article.publication_date,
-                json.dumps(article.keywords),  # Convert keywords list to JSON
-                article.abstract,
-                article.journal,
-                article.doi,
-                article.pages,
-                article_id
-            )  # Parameterized query
-        )
-        self.connection.commit()  # Commit the transaction to save changes
+        shard, local_id = self.router.decode_id(article_id)
+
+        def update():
+            cursor = self.router.cursor(shard)
+            cursor.execute(
+                """
+                UPDATE scientific_articles 
+                SET title = %s, authors = %s, publication_date = %s, keywords = %s, 
+                abstract = %s, journal = %s, doi = %s, pages = %s 
+                WHERE id = %s
+                """,
+                (
+                    article.title,
+                    json.dumps(article.authors),  # Convert authors list to JSON
+                    article.publication_date,
+                    json.dumps(article.keywords),  # Convert keywords list to JSON
+                    article.abstract,
+                    article.journal,
+                    article.doi,
+                    article.pages,
+                    local_id
+                )  # Parameterized query
+            )
+            self._log_change(shard, local_id, article.user_id, 'upsert')  # In the same transaction
+
+        self._write(shard, update)
         return article  # Return the updated article
 
     def delete_article(self, article_id):
-        """Delete an article from the database using the article ID."""
-        self.cursor.execute(
-            "DELETE FROM scientific_articles WHERE id = %s",
-            (article_id,)  # Parameterized query to prevent SQL injection
-        )
-        self.connection.commit()  # Commit the transaction to save changes
+        """Delete an article from the database using the article ID, leaving a tombstone in the change log."""
+        shard, local_id = self.router.decode_id(article_id)
+
+        def delete():
+            cursor = self.router.cursor(shard)
+            cursor.execute(
+                """
+                INSERT INTO article_changes (article_id, user_id, operation)
+                SELECT id, user_id, 'delete' FROM scientific_articles WHERE id = %s
+                """,
+                (local_id,)  # Parameterized query to prevent SQL injection
+            )
+            cursor.execute(
+                "DELETE FROM scientific_articles WHERE id = %s",
+                (local_id,)  # Parameterized query to prevent SQL injection
+            )
+
+        self._write(shard, delete)
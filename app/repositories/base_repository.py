@@ -0,0 +1,30 @@
+from app.utils.database import get_connection, get_cursor, get_statements  # Import the per-thread connection pool
+
+
+class BaseRepository:
+    """
+    Base class of the repositories, giving them the database connection and cursor of the
+    current thread.
+
+    Connections are opened lazily on first use rather than when the repository is created, so
+    module-level services can be created before a server forks its worker processes, and each
+    thread (and each process) uses its own connection.
+    """
+
+    connection_name = 'default'  # Repositories with the same name share the thread's connection
+    connection_options = {}  # Extra arguments for mysql.connector.connect
+
+    @property
+    def connection(self):
+        """The MySQL connection of the current thread."""
+        return get_connection(self.connection_name, **self.connection_options)
+
+    @property
+    def cursor(self):
+        """The cursor of the current thread's connection."""
+        return get_cursor(self.connection_name, **self.connection_options)
+
+    @property
+    def statements(self):
+        """The prepared statement cache of the current thread's connection, for hot, fixed statements."""
+        return get_statements(self.connection_name, **self.connection_options)
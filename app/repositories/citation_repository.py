@@ -0,0 +1,87 @@
+from app.repositories.base_repository import BaseRepository  # Import the base class giving the thread's connection
+
+# Column matched against the frontier of a traversal, and column of the neighbors it leads to
+DIRECTION_COLUMNS = {'out': ('citing_id', 'cited_id'), 'in': ('cited_id', 'citing_id')}
+
+
+class CitationRepository(BaseRepository):
+    """
+    The CitationRepository class handles interactions with the database for the citation graph.
+    Each row of `article_citations` is an edge from a citing article to a cited article, by global
+    article ID; the table lives on the main database whatever shards the articles are on.
+    """
+
+    def add_citations(self, citing_id, cited_ids):
+        """Record that an article cites the given articles, ignoring existing citations; return the number added."""
+        placeholders = ', '.join(['(%s, %s)'] * len(cited_ids))
+        self.cursor.execute(
+            f"INSERT IGNORE INTO article_citations (citing_id, cited_id) VALUES {placeholders}",
+            [value for cited_id in cited_ids for value in (citing_id, cited_id)]  # Parameterized query
+        )
+        added = self.cursor.rowcount  # Existing citations are not counted
+        self.connection.commit()  # Commit the transaction to save changes
+        return added
+
+    def remove_citations(self, citing_id, cited_ids):
+        """Remove citations of an article and return the number removed."""
+        placeholders = ', '.join(['%s'] * len(cited_ids))
+        self.cursor.execute(
+            f"DELETE FROM article_citations WHERE citing_id = %s AND cited_id IN ({placeholders})",
+            (citing_id, *cited_ids)  # Parameterized query to prevent SQL injection
+        )
+        removed = self.cursor.rowcount
+        self.connection.commit()  # Commit the transaction to save changes
+        return removed
+
+    def remove_article_citations(self, article_id):
+        """Remove every citation from or to an article and return the IDs of the articles at their other end."""
+        self.cursor.execute(
+            """
+            SELECT cited_id FROM article_citations WHERE citing_id = %s
+            UNION SELECT citing_id FROM article_citations WHERE cited_id = %s
+            """,
+            (article_id, article_id)  # Parameterized query to prevent SQL injection
+        )
+        neighbors = [row[0] for row in self.cursor.fetchall()]
+        self.cursor.execute(
+            "DELETE FROM article_citations WHERE citing_id = %s OR cited_id = %s",
+            (article_id, article_id)  # Parameterized query to prevent SQL injection
+        )
+        self.connection.commit()  # Commit the transaction to save changes
+        return neighbors
+
+    def remove_articles_citations(self, article_ids):
+        """Remove every citation from or to any of the given articles and return the IDs of the articles at their other end."""
+        placeholders = ', '.join(['%s'] * len(article_ids))
+        self.cursor.execute(
+            f"""
+            SELECT cited_id FROM article_citations WHERE citing_id IN ({placeholders})
+            UNION SELECT citing_id FROM article_citations WHERE cited_id IN ({placeholders})
+            """,
+            (*article_ids, *article_ids)  # Parameterized query to prevent SQL injection
+        )
+        neighbors = [row[0] for row in self.cursor.fetchall()]
+        self.cursor.execute(
+            f"DELETE FROM article_citations WHERE citing_id IN ({placeholders}) OR cited_id IN ({placeholders})",
+            (*article_ids, *article_ids)  # Parameterized query to prevent SQL injection
+        )
+        self.connection.commit()  # Commit the transaction to save changes
+        return neighbors
+
+    def get_citation_edges(self, article_ids, direction, limit):
+        """
+        Fetch the citations leaving (`direction='out'`) or reaching (`'in'`) any of the given articles,
+        with a single query, as (citing_id, cited_id) pairs ordered by article and neighbor.
+
+        At most `limit` edges are returned.
+        """
+        column, neighbor = DIRECTION_COLUMNS[direction]
+        placeholders = ', '.join(['%s'] * len(article_ids))
+        self.cursor.execute(
+            f"""
+            SELECT citing_id, cited_id FROM article_citations
+            WHERE {column} IN ({placeholders}) ORDER BY {column}, {neighbor} LIMIT %s
+            """,
+            (*article_ids, limit)  # Parameterized query to prevent SQL injection
+        )
+        return self.cursor.fetchall()
@@ -0,0 +1,154 @@
+import json  # Import the JSON library to store job parameters and results
+
+from app.models.job import Job  # Import the Job model to work with job data
+from app.repositories.base_repository import BaseRepository  # Import the base class giving the thread's connection
+
+# Columns of the jobs table, in the order of the Job constructor
+JOB_COLUMNS = ("id, type, status, user_id, params, progress, total, result, error, attempts, cancel_requested, "
+               "created_at, started_at, finished_at, updated_at")
+
+
+class JobRepository(BaseRepository):
+    """
+    The JobRepository class handles interactions with the database for background jobs.
+    Status changes are guarded by the current status in the WHERE clause, so that two processes
+    sharing the jobs table can never both claim, finish or retry the same job.
+    """
+
+    # A separate autocommit connection, so that job updates never commit (or wait for) the
+    # transaction of the work the job is doing
+    connection_name = 'jobs'
+    connection_options = {'autocommit': True}
+
+    def create_job(self, job_id, job_type, user_id, params):
+        """Insert a new queued job into the database."""
+        self.cursor.execute(
+            "INSERT INTO jobs (id, type, status, user_id, params) VALUES (%s, %s, 'queued', %s, %s)",
+            (job_id, job_type, user_id, json.dumps(params))  # Parameterized query
+        )
+
+    def get_job_by_id(self, job_id):
+        """Fetch a job from the database using the job ID."""
+        self.cursor.execute(
+            f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s",
+            (job_id,)  # Parameterized query to prevent SQL injection
+        )
+        result = self.cursor.fetchone()  # Fetch one result from the executed query
+        if result:
+            return self._to_job(result)  # Convert the row into a Job
+        return None  # Return None if no job found
+
+    def get_job_ids_by_status(self, status):
+        """Fetch the IDs of the jobs with the given status, oldest first."""
+        self.cursor.execute(
+            "SELECT id FROM jobs WHERE status = %s ORDER BY created_at",
+            (status,)  # Parameterized query to prevent SQL injection
+        )
+        return [job_id for job_id, in self.cursor.fetchall()]
+
+    def claim_job(self, job_id):
+        """Move a queued job to 'running'. Returns False if it is no longer queued (e.g. claimed elsewhere)."""
+        self.cursor.execute(
+            """
+            UPDATE jobs SET status = 'running', attempts = attempts + 1, progress = 0, total = NULL,
+                            started_at = NOW(), error = NULL
+            WHERE id = %s AND status = 'queued'
+            """,
+            (job_id,)  # Parameterized query to prevent SQL injection
+        )
+        return self.cursor.rowcount == 1
+
+    def update_progress(self, job_id, progress, total):
+        """Record the progress of a running job and return whether its cancellation was requested."""
+        self.cursor.execute(
+            "UPDATE jobs SET progress = %s, total = %s, updated_at = NOW() WHERE id = %s",
+            (progress, total, job_id)  # Parameterized query to prevent SQL injection
+        )
+        self.cursor.execute("SELECT cancel_requested FROM jobs WHERE id = %s", (job_id,))
+        result = self.cursor.fetchone()
+        return bool(result and result[0])
+
+    def finish_job(self, job_id, status, result=None, error=None):
+        """Record the outcome of a running job."""
+        self.cursor.execute(
+            """
+            UPDATE jobs SET status = %s, result = %s, error = %s, finished_at = NOW()
+            WHERE id = %s AND status = 'running'
+            """,
+            (status, None if result is None else json.dumps(result), error, job_id)  # Parameterized query
+        )
+
+    def release_job(self, job_id):
+        """Put a running job back in the queue, e.g. because its process is shutting down."""
+        self.cursor.execute(
+            "UPDATE jobs SET status = 'queued' WHERE id = %s AND status = 'running'",
+            (job_id,)  # Parameterized query to prevent SQL injection
+        )
+
+    def request_cancel(self, job_id):
+        """
+        Cancel a queued job immediately, or flag a running job for cancellation.
+        Returns False if the job has already finished.
+        """
+        self.cursor.execute(
+            """
+            UPDATE jobs SET status = 'cancelled', cancel_requested = TRUE, finished_at = NOW()
+            WHERE id = %s AND status = 'queued'
+            """,
+            (job_id,)  # Parameterized query to prevent SQL injection
+        )
+        if self.cursor.rowcount == 1:
+            return True
+        self.cursor.execute(
+            "UPDATE jobs SET cancel_requested = TRUE WHERE id = %s AND status = 'running'",
+            (job_id,)  # Parameterized query to prevent SQL injection
+        )
+        return self.cursor.rowcount == 1
+
+    def requeue_job(self, job_id, statuses=('failed', 'cancelled')):
+        """Queue a finished job again if it is in one of `statuses`. Returns False if it is not."""
+        placeholders = ', '.join(['%s'] * len(statuses))  # One placeholder per status
+        self.cursor.execute(
+            f"""
+            UPDATE jobs SET status = 'queued', cancel_requested = FALSE, result = NULL, error = NULL,
+                            finished_at = NULL
+            WHERE id = %s AND status IN ({placeholders})
+            """,
+            (job_id, *statuses)  # Parameterized query to prevent SQL injection
+        )
+        return self.cursor.rowcount == 1
+
+    def fail_stale_jobs(self, stale_seconds):
+        """Mark running jobs that stopped reporting progress (their process died) as failed."""
+        self.cursor.execute(
+            """
+            UPDATE jobs SET status = 'failed', error = 'Interrupted: the worker running the job stopped.',
+                            finished_at = NOW()
+            WHERE status = 'running' AND updated_at < NOW() - INTERVAL %s SECOND
+            """,
+            (stale_seconds,)  # Parameterized query to prevent SQL injection
+        )
+        return self.cursor.rowcount
+
+    def delete_finished_jobs(self, older_than_days):
+        """Delete finished jobs older than the retention period and return their (type, params)."""
+        self.cursor.execute(
+            """
+            SELECT id, type, params FROM jobs
+            WHERE status IN ('succeeded', 'failed', 'cancelled') AND finished_at < NOW() - INTERVAL %s DAY
+            """,
+            (older_than_days,)  # Parameterized query to prevent SQL injection
+        )
+        expired = self.cursor.fetchall()
+        if expired:
+            placeholders = ', '.join(['%s'] * len(expired))  # One placeholder per job ID
+            self.cursor.execute(f"DELETE FROM jobs WHERE id IN ({placeholders})", tuple(row[0] for row in expired))
+        return [(job_type, json.loads(params)) for _, job_type, params in expired]
+
+    @staticmethod
+    def _to_job(row):
+        """Convert a jobs row into a Job, decoding its JSON columns."""
+        job = Job(*row)
+        job.params = json.loads(job.params) if job.params else {}
+        job.result = json.loads(job.result) if job.result else None
+        return job
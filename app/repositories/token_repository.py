@@ -0,0 +1,68 @@
+from app.repositories.base_repository import BaseRepository  # Import the base class giving the thread's connection
+
+
+class TokenRepository(BaseRepository):
+    """
+    The TokenRepository class handles interactions with the database for issued and revoked JWTs.
+    Tokens are identified by their `jti` claim; `expires_at` is their `exp` claim.
+    """
+
+    # Revocations are single statements that must be visible to other processes right away
+    connection_name = 'tokens'
+    connection_options = {'autocommit': True}
+
+    def record_tokens(self, tokens):
+        """Record issued tokens, given as (jti, user_id, token_type, expires_at) tuples."""
+        self.cursor.executemany(
+            "INSERT INTO issued_tokens (jti, user_id, token_type, expires_at) VALUES (%s, %s, %s, %s)",
+            tokens  # Parameterized query
+        )
+
+    def revoke_token(self, jti, user_id, expires_at):
+        """Add a token to the revocation list (a no-op if it is already revoked)."""
+        self.cursor.execute(
+            "INSERT IGNORE INTO revoked_tokens (jti, user_id, expires_at) VALUES (%s, %s, %s)",
+            (jti, user_id, expires_at)  # Parameterized query to prevent SQL injection
+        )
+
+    def revoke_user_tokens(self, user_id, now):
+        """Revoke every unexpired token issued to a user and return their (jti, expires_at) pairs."""
+        self.cursor.execute(
+            """
+            INSERT IGNORE INTO revoked_tokens (jti, user_id, expires_at)
+            SELECT jti, user_id, expires_at FROM issued_tokens WHERE user_id = %s AND expires_at > %s
+            """,
+            (user_id, now)  # Parameterized query to prevent SQL injection
+        )
+        self.cursor.execute(
+            "SELECT jti, expires_at FROM issued_tokens WHERE user_id = %s AND expires_at > %s",
+            (user_id, now)  # Parameterized query to prevent SQL injection
+        )
+        return self.cursor.fetchall()
+
+    def get_revoked_tokens(self, revoked_since, now):
+        """
+        Fetch the unexpired revoked tokens revoked at or after `revoked_since` (None for all of them).
+
+        **Returns:**
+            - A tuple `(rows, database_time)` where rows are (jti, expires_at) pairs and `database_time`
+              is the database clock when the query ran, to pass as `revoked_since` next time.
+        """
+        self.cursor.execute("SELECT NOW(6)")
+        database_time = self.cursor.fetchone()[0]
+        if revoked_since is None:
+            self.cursor.execute("SELECT jti, expires_at FROM revoked_tokens WHERE expires_at > %s", (now,))
+        else:
+            self.cursor.execute(
+                "SELECT jti, expires_at FROM revoked_tokens WHERE revoked_at >= %s AND expires_at > %s",
+                (revoked_since, now)  # Parameterized query to prevent SQL injection
+            )
+        return self.cursor.fetchall(), database_time
+
+    def delete_expired_tokens(self, now, limit):
+        """Delete up to `limit` expired rows from each token table and return the number deleted."""
+        deleted = 0
+        for table in ('issued_tokens', 'revoked_tokens'):
+            self.cursor.execute(f"DELETE FROM {table} WHERE expires_at <= %s LIMIT %s", (now, limit))
+            deleted += self.cursor.rowcount
+        return deleted
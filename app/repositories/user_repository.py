@@ -1,10 +1,9 @@
-import mysql.connector  # Import the MySQL connector library to interact with the MySQL database
-
-from app.config import Config  # Import the configuration settings
 from app.models.user import User  # Import the User model to work with user data
+from app.repositories.base_repository import BaseRepository  # Import the base class giving the thread's connection
+from app.utils.deadlines import enforce  # Import the helper interrupting statements at the request's deadline
 
 
-class UserRepository:
+class UserRepository(BaseRepository):
     """
     The UserRepository class handles interactions with the database for user-related operations.
     It provides a clear separation between business logic and data access logic,
@@ -12,47 +11,57 @@ class UserRepository:
     in a central, structured manner.
     """
 
-    def __init__(self):
-        # Initialize the database connection using parameters from the Config class
-        self.connection = mysql.connector.connect(
-            host=Config.MYSQL_HOST,  # Database host
-            port=Config.MYSQL_PORT,  # Database port
-            user=Config.MYSQL_USER,  # Database user
-            password=Config.MYSQL_PASSWORD,  # Database password
-            database=Config.MYSQL_DATABASE  # Database name
-        )
-        self.cursor = self.connection.cursor()  # Create a cursor to execute database queries
+    def get_user_by_username(self, username, include_deleted=False):
+        """
+        Fetch a user from the database using the username.
 
-    def get_user_by_username(self, username):
-        """Fetch a user from the database using the username."""
-        self.cursor.execute(
-            "SELECT id, username, first_name, last_name, password_hash FROM users WHERE username = %s",
+        Users being deleted are not returned, unless `include_deleted` is set (their username stays
+        taken until their account is purged).
+        """
+        cursor = self.statements.execute(  # Run on every login, so kept prepared
+            "SELECT id, username, first_name, last_name, password_hash FROM users WHERE username = %s"
+            + ("" if include_deleted else " AND deleted_at IS NULL"),
             (username,)  # Parameterized query to prevent SQL injection
         )
-        result = self.cursor.fetchone()  # Fetch one result from the executed query
+        result = cursor.fetchone()  # Fetch one result from the executed query
         if result:
             return User(*result)  # Unpack result directly into User constructor
         return None  # Return None if no user found
 
-    def get_user_by_id(self, user_id):
-        """Fetch a user from the database using the user ID."""
-        self.cursor.execute(
-            "SELECT id, username, first_name, last_name, password_hash FROM users WHERE id = %s",
-            (user_id,)  # Parameterized query to prevent SQL injection
-        )
-        result = self.cursor.fetchone()  # Fetch one result from the executed query
+    def get_user_by_id(self, user_id, deadline=None):
+        """
+        Fetch a user from the database using the user ID (users being deleted are not returned), within
+        the request's `deadline` (if any).
+        """
+        with enforce(self.connection_name, self.connection_options, deadline):
+            cursor = self.statements.execute(  # Run on most authenticated requests, so kept prepared
+                "SELECT id, username, first_name, last_name, password_hash FROM users WHERE id = %s "
+                "AND deleted_at IS NULL",
+                (user_id,)  # Parameterized query to prevent SQL injection
+            )
+            result = cursor.fetchone()  # Fetch one result from the executed query
         if result:
             return User(*result)  # Unpack result directly into User constructor
         return None  # Return None if no user found
 
+    def get_user_ids(self):
+        """Fetch the IDs of every user (except the users being deleted)."""
+        self.cursor.execute("SELECT id FROM users WHERE deleted_at IS NULL")
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def get_deleted_user_ids(self):
+        """Fetch the IDs of the users marked deleted whose data has not been purged yet."""
+        self.cursor.execute("SELECT id FROM users WHERE deleted_at IS NOT NULL")
+        return [row[0] for row in self.cursor.fetchall()]
+
     def create_user(self, user):
         """Insert a new user into the database."""
-        self.cursor.execute(
+        cursor = self.statements.execute(
             "INSERT INTO users (username, first_name, last_name, password_hash) VALUES (%s, %s, %s, %s)",
             (user.username, user.first_name, user.last_name, user.password_hash)  # Parameterized query
         )
         self.connection.commit()  # Commit the transaction to save changes
-        user.id = self.cursor.lastrowid  # Set the user ID to the last inserted row ID
+        user.id = cursor.lastrowid  # Set the user ID to the last inserted row ID
         return user  # Return the newly created user
 
     def update_user(self, user):
@@ -64,8 +73,18 @@ class UserRepository:
         self.connection.commit()  # Commit the transaction to save changes
         return user  # Return the updated user
 
+    def mark_user_deleted(self, user_id):
+        """Mark a user as deleted, hiding the account; returns False if it was already marked (or does not exist)."""
+        self.cursor.execute(
+            "UPDATE users SET deleted_at = NOW() WHERE id = %s AND deleted_at IS NULL",
+            (user_id,)  # Parameterized query to prevent SQL injection
+        )
+        marked = self.cursor.rowcount == 1
+        self.connection.commit()  # Commit the transaction to save changes
+        return marked
+
     def delete_user(self, user_id):
-        """Delete a user from the database using the user ID."""
+        """Delete a user from the database using the user ID (once their articles have been purged)."""
         self.cursor.execute(
             "DELETE FROM users WHERE id = %s",
             (user_id,)  # Parameterized query to prevent SQL injection
@@ -1,9 +1,18 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, url_for
 from flask_jwt_extended import jwt_required
 
+from app.config import Config
 from app.services.article_service import ArticleService
-from app.utils.error_handling import handle_common_exceptions, validate_array_field
-from app.utils.validations import validate_json_and_required_fields
+from app.services.citation_service import citation_service
+from app.utils.article_query import ArticleQuery
+from app.utils.deadlines import current_deadline
+from app.utils.error_handling import handle_common_exceptions
+from app.utils.idempotency import idempotent
+from app.utils.importers import SUPPORTED_FORMATS, detect_format, iter_reference_entries, open_text_stream, \
+    spool_stream
+from app.utils.schema import validate_article, validate_article_patch, validate_article_update, \
+    validate_citations, validate_doi_lookup
+from app.utils.validations import validate_json
 
 article_bp = Blueprint('article', __name__)
 article_service = ArticleService()
@@ -11,6 +20,7 @@ article_service = ArticleService()
 
 @article_bp.route('/articles', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_article():
     """
     Create a new article.
@@ -18,6 +28,11 @@ def create_article():
     **Security:**
         - Requires a valid bearer token for authentication.
 
+    **Headers:**
+        - `Idempotency-Key`: str, optional - Makes retries safe: a request repeating the key gets the
+          first response back (with `Idempotent-Replayed: true`) instead of running again. Reusing a
+          key for a different request is rejected with `422 Unprocessable Entity`.
+
     **Request Body Parameters:**
         - `title`: str, required - Title of the article.
         - `authors`: array of str, required - List of authors.
@@ -30,20 +45,18 @@ def create_article():
         - `user_id`: int, required - ID of the user creating the article.
 
     **Response:**
-        - `201 Created`: On successful article creation with article data.
-        - `400 Bad Request`: If the input is invalid or JSON is not provided.
+        - `201 Created`: On successful article creation with article data, and the `duplicates`
+          warning: the articles of the library that are likely the same paper (estimated similarity
+          of title and abstract of at least `DUPLICATE_THRESHOLD`), most similar first.
+        - `400 Bad Request`: If the input is invalid or JSON is not provided, with an `errors` object
+          giving the problem of each invalid field.
         - `404 Not Found`: User not found.
+        - `409 Conflict`: An article with the same DOI already exists in the user's library.
         - `500 Internal Server Error`: For any server-related issues.
     """
     try:
         # Retrieve and validate the JSON data from the request body
-        data = validate_json_and_required_fields(
-            ['title', 'authors', 'publication_date', 'keywords', 'abstract', 'journal', 'doi', 'user_id']
-        )
-
-        # Validate authors and keywords fields to ensure they are arrays
-        data['authors'] = validate_array_field(data.get('authors', []), "authors")
-        data['keywords'] = validate_array_field(data.get('keywords', []), "keywords")
+        data = validate_json(validate_article)
 
         # Handle optional pages field
         data['pages'] = data.get('pages', None)  # Default to None if not provided
@@ -51,10 +64,15 @@ def create_article():
         # Create the article using the article service
         article = article_service.create_article(data)
 
+        # Warn about articles of the library that look like the same paper
+        duplicates = article_service.find_duplicates_of(article)
+
         # Prepare the response data
         response_data = {
             "data": {
-                "article": article.__dict__  # Convert the article object to a dictionary
+                "article": article.__dict__,  # Convert the article object to a dictionary
+                "duplicates": [{"id": duplicate.id, "title": duplicate.title, "doi": duplicate.doi,
+                                "similarity": similarity} for duplicate, similarity in duplicates]
             },
             "status": "success"
         }
@@ -66,6 +84,114 @@ def create_article():
         return handle_common_exceptions(e)  # Use the utility function for common exception handling
 
 
+@article_bp.route('/articles/import', methods=['POST'])
+@jwt_required()
+@idempotent
+def import_articles():
+    """
+    Import articles from a BibTeX or RIS file.
+
+    The file is parsed incrementally and the entries are inserted in batched transactions.
+    Entries whose DOI already exists in the user's library are skipped. Large files should be
+    imported with `async=true`: the file is stored and imported by a background job, whose
+    status and summary are available at `GET /api/jobs/<job_id>`.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Headers:**
+        - `Idempotency-Key`: str, optional - Makes retries safe: a request repeating the key gets the
+          first response back (with `Idempotent-Replayed: true`) instead of running again. Reusing a
+          key for a different request is rejected with `422 Unprocessable Entity`.
+
+    **Request Parameters:**
+        - `user_id`: int, required (form field or query parameter) - ID of the user importing the articles.
+        - `format`: str, optional (form field or query parameter) - 'bibtex' or 'ris'. Inferred from the
+          file name or content type when omitted.
+        - `file`: file, optional - The reference file as a multipart upload. When omitted, the raw
+          request body is used.
+        - `async`: bool, optional (query parameter) - Run the import as a background job.
+
+    **Response:**
+        - `200 OK`: Import summary with a result (created, skipped or error) for every entry.
+        - `202 Accepted`: With `async=true`, the queued job; its URL is in the `Location` header.
+        - `400 Bad Request`: If the user ID or format is missing or invalid.
+        - `404 Not Found`: User not found.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        # Retrieve the user ID and format from the form or the query string
+        user_id = request.form.get('user_id', request.args.get('user_id'), type=int)
+        if user_id is None:
+            raise ValueError("Missing required fields: user_id")
+
+        # Use the uploaded file if present, otherwise stream the raw request body
+        upload = request.files.get('file')
+        stream = upload.stream if upload else request.stream
+        file_format = (request.form.get('format') or request.args.get('format') or
+                       detect_format(upload.filename if upload else None,
+                                     upload.content_type if upload else request.content_type))
+
+        # Store the file and import it in the background if requested
+        if request.args.get('async', 'false').lower() == 'true':
+            if file_format not in SUPPORTED_FORMATS:
+                raise ValueError(f"Invalid import format. Use {' or '.join(repr(f) for f in SUPPORTED_FORMATS)}.")
+            path = spool_stream(stream, Config.JOB_SPOOL_DIR)
+            try:
+                job = article_service.submit_import(user_id, path, file_format)
+            except Exception:
+                article_service.discard_import_file({"path": path})  # The job was not created
+                raise
+            return job_accepted(job)
+
+        # Parse the entries lazily and import them through the article service
+        entries = iter_reference_entries(open_text_stream(stream), file_format)
+        summary = article_service.import_articles(user_id, entries)
+
+        # Return the import summary with status 200
+        return jsonify({"data": summary, "status": "success"}), 200
+
+    except Exception as e:
+        return handle_common_exceptions(e)  # Use the utility function for common exception handling
+
+
+@article_bp.route('/articles/doi-lookup', methods=['POST'])
+@jwt_required()
+def doi_lookup():
+    """
+    Resolve a list of DOIs to article IDs in a user's library with a single query.
+
+    DOIs are compared in their normalized form, so resolver URLs (`https://doi.org/...`),
+    `doi:` prefixes and letter case do not matter.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Request Body Parameters:**
+        - `user_id`: int, required - ID of the user whose library is searched.
+        - `dois`: array of str, required - The DOIs to resolve (at most `DOI_LOOKUP_MAX`).
+
+    **Response:**
+        - `200 OK`: A mapping of every DOI, as sent, to its article ID (or null if not found).
+        - `400 Bad Request`: If the input is invalid or JSON is not provided.
+        - `404 Not Found`: User not found.
+        - `500 Internal Server Error`: For any server-related issues.
+        - `504 Gateway Timeout`: If the query did not complete within the request's deadline.
+    """
+    try:
+        # Retrieve and validate the JSON data from the request body (at most DOI_LOOKUP_MAX DOIs)
+        data = validate_json(validate_doi_lookup)
+
+        # Resolve the DOIs using the article service
+        articles = article_service.resolve_dois(data['user_id'], data['dois'], current_deadline())
+
+        # Return the success response with status 200
+        return jsonify({"data": {"articles": articles}, "status": "success"}), 200
+
+    except Exception as e:
+        return handle_common_exceptions(e)  # Use the utility function for common exception handling
+
+
 @article_bp.route('/articles', methods=['GET'])
 @jwt_required()
 def get_articles():
@@ -75,13 +201,32 @@ def get_articles():
     **Security:**
         - Requires a valid bearer token for authentication.
 
+    **Query Parameters (optional):**
+        - `from`, `to`: str (YYYY-MM-DD) - Publication date range, inclusive.
+        - `journal`: str - Exact journal name.
+        - `min_pages`, `max_pages`: int - Page count range, inclusive.
+        - `sort`: str - `id` (default), `date` or `title`; prefix with `-` for descending order.
+        - `limit`: int - Articles per page (default `ARTICLE_PAGE_SIZE`, at most `ARTICLE_MAX_PAGE_SIZE`).
+        - `cursor`: str - The `next` cursor of the previous page.
+        With any of these parameters the list is paginated, and the response carries the `next`
+        cursor (null on the last page); without them every article is returned.
+
     **Response:**
         - `200 OK`: A list of articles retrieved successfully.
+        - `400 Bad Request`: If a query parameter is invalid.
         - `500 Internal Server Error`: For any server-related issues.
+        - `504 Gateway Timeout`: If the query did not complete within the request's deadline.
     """
     try:
+        # Filter, sort and paginate if any list parameter is given
+        query = ArticleQuery.from_args(request.args)
+        if query is not None:
+            articles, next_cursor = article_service.list_articles(query, deadline=current_deadline())
+            return jsonify({"data": [article.__dict__ for article in articles], "next": next_cursor,
+                            "status": "success"}), 200
+
         # Retrieve all articles using the article service
-        articles = article_service.get_all_articles()
+        articles = article_service.get_all_articles(current_deadline())
 
         # Convert articles to a list of dictionaries for JSON response
         response_data = {
@@ -113,10 +258,11 @@ def get_article(article_id):
         - `200 OK`: On successful retrieval of the article.
         - `404 Not Found`: If the article with the given ID does not exist.
         - `500 Internal Server Error`: For any server-related issues.
+        - `504 Gateway Timeout`: If the query did not complete within the request's deadline.
     """
     try:
         # Retrieve the article by its ID using the article service
-        article = article_service.get_article_by_id(article_id)
+        article = article_service.get_article_by_id(article_id, current_deadline())
 
         # Prepare the response data
         response_data = {
@@ -131,6 +277,320 @@ def get_article(article_id):
         return handle_common_exceptions(e)
 
 
+@article_bp.route('/articles/changes', methods=['GET'])
+@jwt_required()
+def get_changes():
+    """
+    Retrieve the changes to a user's library since a change token, for incremental sync.
+
+    Start with `since=0` to receive every article, then pass the returned `next` token on the
+    following call. Deleted articles are returned as tombstones.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Query Parameters:**
+        - `user_id`: int, required - ID of the user whose library is synced.
+        - `since`: str, optional - The `next` token of the previous call (default 0).
+        - `limit`: int, optional - Maximum number of changes per page.
+
+    **Response:**
+        - `200 OK`: The changes (`upsert` with the article, or `delete`), the `next` token and
+          whether more changes are waiting (`has_more`).
+        - `400 Bad Request`: If the query parameters are missing or invalid.
+        - `404 Not Found`: User not found.
+        - `500 Internal Server Error`: For any server-related issues.
+        - `504 Gateway Timeout`: If the query did not complete within the request's deadline.
+    """
+    try:
+        # Retrieve query parameters
+        user_id = request.args.get('user_id', type=int)
+        if user_id is None:
+            raise ValueError("Missing required parameter: user_id")
+        since = request.args.get('since', '0')
+        if not since.isdigit():
+            raise ValueError("Invalid change token.")
+
+        # Fetch the changes using the article service
+        changes = article_service.get_changes(user_id, int(since), request.args.get('limit', type=int),
+                                             current_deadline())
+
+        return jsonify({"data": changes, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@article_bp.route('/articles/suggest', methods=['GET'])
+@jwt_required()
+def suggest():
+    """
+    Suggest completions for a search box from a user's library.
+
+    Suggestions are served from an in-memory prefix index and ranked by how often each value
+    occurs in the user's articles. The prefix matches the start of any word of a value.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Query Parameters:**
+        - `user_id`: int, required - ID of the user whose library is used.
+        - `prefix`: str, required - The text typed so far.
+        - `field`: str, required - The field to complete ('title', 'keywords', 'authors', or 'journal').
+        - `limit`: int, optional - Maximum number of suggestions (default 10).
+
+    **Response:**
+        - `200 OK`: The suggestions, most frequent first.
+        - `400 Bad Request`: If the query parameters are missing or invalid.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        # Retrieve query parameters
+        user_id = request.args.get('user_id', type=int)
+        if user_id is None:
+            raise ValueError("Missing required parameter: user_id")
+
+        # Get the suggestions using the article service
+        suggestions = article_service.suggest(user_id, request.args.get('field'), request.args.get('prefix'),
+                                              request.args.get('limit', type=int))
+
+        return jsonify({"data": {"suggestions": suggestions}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@article_bp.route('/articles/<int:article_id>/related', methods=['GET'])
+@jwt_required()
+def get_related_articles(article_id):
+    """
+    Retrieve the articles most similar to an article ("more like this").
+
+    Similarity is the cosine similarity of the TF-IDF vectors of the articles' titles,
+    keywords and abstracts.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Path Parameters:**
+        - `article_id`: int, required - ID of the article.
+
+    **Query Parameters:**
+        - `k`: int, optional - Maximum number of related articles to return (default 10).
+
+    **Responses:**
+        - `200 OK`: The related articles, most similar first, each with its similarity `score`.
+        - `400 Bad Request`: If `k` is invalid.
+        - `404 Not Found`: If the article with the given ID does not exist.
+        - `500 Internal Server Error`: For any server-related issues.
+        - `504 Gateway Timeout`: If the query did not complete within the request's deadline.
+    """
+    try:
+        # Retrieve and validate the number of results
+        k = request.args.get('k', 10, type=int)
+        if k is None or not 1 <= k <= Config.RELATED_MAX_RESULTS:
+            raise ValueError(f"k must be an integer between 1 and {Config.RELATED_MAX_RESULTS}.")
+
+        # Find the related articles using the article service
+        related = article_service.get_related_articles(article_id, k, current_deadline())
+
+        # Prepare the response data
+        response_data = {
+            "data": {"articles": [dict(article.__dict__, score=round(score, 4)) for article, score in related]},
+            "status": "success"
+        }
+
+        return jsonify(response_data), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@article_bp.route('/articles/<int:article_id>/citations', methods=['POST'])
+@jwt_required()
+def add_citations(article_id):
+    """
+    Record that an article cites other articles.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Path Parameters:**
+        - `article_id`: int, required - ID of the citing article.
+
+    **Request Body Parameters:**
+        - `cited_ids`: array of int, required - IDs of the cited articles (at most `CITATION_BATCH_MAX`).
+
+    **Response:**
+        - `200 OK`: The number of citations `added` and of those that `existed` already.
+        - `400 Bad Request`: If the input is invalid, the article cites itself or a cited article does not exist.
+        - `404 Not Found`: If the article with the given ID does not exist.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        # Retrieve and validate the JSON data from the request body
+        data = validate_json(validate_citations)
+
+        # Record the citations using the citation service
+        counts = citation_service.add_citations(article_id, data['cited_ids'])
+        return jsonify({"data": counts, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@article_bp.route('/articles/<int:article_id>/citations', methods=['DELETE'])
+@jwt_required()
+def remove_citations(article_id):
+    """
+    Remove citations of an article.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Path Parameters:**
+        - `article_id`: int, required - ID of the citing article.
+
+    **Request Body Parameters:**
+        - `cited_ids`: array of int, required - IDs of the articles it no longer cites (at most `CITATION_BATCH_MAX`).
+
+    **Response:**
+        - `200 OK`: The number of citations `removed`.
+        - `400 Bad Request`: If the input is invalid or JSON is not provided.
+        - `404 Not Found`: If the article with the given ID does not exist.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        # Retrieve and validate the JSON data from the request body
+        data = validate_json(validate_citations)
+
+        # Remove the citations using the citation service
+        removed = citation_service.remove_citations(article_id, data['cited_ids'])
+        return jsonify({"data": {"removed": removed}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@article_bp.route('/articles/<int:article_id>/citations', methods=['GET'])
+@jwt_required()
+def get_citations(article_id):
+    """
+    Retrieve the citation neighborhood of an article: the articles citing it (`direction=in`) or
+    cited by it (`direction=out`), and those citing or cited by them up to `depth` levels.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Path Parameters:**
+        - `article_id`: int, required - ID of the article.
+
+    **Query Parameters:**
+        - `direction`: str, optional - `in` (default) or `out`.
+        - `depth`: int, optional - Number of levels to traverse (default 1, at most `CITATION_MAX_DEPTH`).
+
+    **Responses:**
+        - `200 OK`: The `articles` reached, nearest first, each with its `depth`; the `citations`
+          followed, as `citing_id`/`cited_id` pairs; and `truncated`, true if the traversal stopped
+          at `CITATION_MAX_NODES` articles.
+        - `400 Bad Request`: If `direction` or `depth` is invalid.
+        - `404 Not Found`: If the article with the given ID does not exist.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        # Retrieve and validate the traversal parameters
+        direction = request.args.get('direction', 'in')
+        if direction not in ('in', 'out'):
+            raise ValueError("Invalid direction. Use 'in' or 'out'.")
+        depth = request.args.get('depth', 1, type=int)
+        if depth is None or not 1 <= depth <= Config.CITATION_MAX_DEPTH:
+            raise ValueError(f"depth must be an integer between 1 and {Config.CITATION_MAX_DEPTH}.")
+
+        # Traverse the citation graph using the citation service
+        articles, edges, truncated = citation_service.get_citations(article_id, direction, depth)
+
+        # Prepare the response data
+        response_data = {
+            "data": {
+                "articles": [dict(article.__dict__, depth=level) for article, level in articles],
+                "citations": [{"citing_id": citing_id, "cited_id": cited_id} for citing_id, cited_id in edges],
+                "truncated": truncated
+            },
+            "status": "success"
+        }
+
+        return jsonify(response_data), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@article_bp.route('/articles/indexes/rebuild', methods=['POST'])
+@jwt_required()
+def rebuild_indexes():
+    """
+    Rebuild the in-memory article indexes (e.g. the related articles index) of every process: this
+    process rebuilds its indexes at once, and the other processes on their next index sync.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Request Parameters:**
+        - `async`: bool, optional (query parameter) - Rebuild in a background job instead of within the request.
+
+    **Responses:**
+        - `200 OK`: The indexes of this process were rebuilt; returns the size of each index.
+        - `202 Accepted`: With `async=true`, the queued job; its URL is in the `Location` header.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        if request.args.get('async', 'false').lower() == 'true':
+            return job_accepted(article_service.submit_rebuild_indexes())
+
+        stats = article_service.rebuild_indexes()
+        return jsonify({"data": {"indexes": stats}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@article_bp.route('/articles/snapshot', methods=['POST'])
+@jwt_required()
+def publish_snapshot():
+    """
+    Publish a new read-only snapshot of the articles, from which the processes running in snapshot
+    serving mode (`ARTICLE_SNAPSHOT_SERVING`) answer the article reads.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Request Parameters:**
+        - `async`: bool, optional (query parameter) - Publish in a background job instead of within the request.
+
+    **Responses:**
+        - `200 OK`: The snapshot was published; returns its size.
+        - `202 Accepted`: With `async=true`, the queued job; its URL is in the `Location` header.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        if request.args.get('async', 'false').lower() == 'true':
+            return job_accepted(article_service.submit_publish_snapshot())
+
+        snapshot = article_service.publish_snapshot()
+        return jsonify({"data": {"snapshot": snapshot}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
 @article_bp.route('/articles/user/<int:user_id>', methods=['GET'])
 @jwt_required()
 def get_articles_by_user(user_id):
@@ -143,14 +603,33 @@ def get_articles_by_user(user_id):
     **Parameters:**
         - `user_id`: int, required - ID of the user whose articles to retrieve.
 
+    **Query Parameters (optional):**
+        - `from`, `to`: str (YYYY-MM-DD) - Publication date range, inclusive.
+        - `journal`: str - Exact journal name.
+        - `min_pages`, `max_pages`: int - Page count range, inclusive.
+        - `sort`: str - `id` (default), `date` or `title`; prefix with `-` for descending order.
+        - `limit`: int - Articles per page (default `ARTICLE_PAGE_SIZE`, at most `ARTICLE_MAX_PAGE_SIZE`).
+        - `cursor`: str - The `next` cursor of the previous page.
+        With any of these parameters the list is paginated, and the response carries the `next`
+        cursor (null on the last page); without them every article is returned.
+
     **Responses:**
         - `200 OK`: A list of articles retrieved successfully.
+        - `400 Bad Request`: If a query parameter is invalid.
         - `404 Not Found`: User not found.
         - `500 Internal Server Error`: For any server-related issues.
+        - `504 Gateway Timeout`: If the query did not complete within the request's deadline.
     """
     try:
+        # Filter, sort and paginate if any list parameter is given
+        query = ArticleQuery.from_args(request.args)
+        if query is not None:
+            articles, next_cursor = article_service.list_articles(query, user_id, current_deadline())
+            return jsonify({"data": [article.__dict__ for article in articles], "next": next_cursor,
+                            "status": "success"}), 200
+
         # Retrieve all articles associated with the given user ID using the article service
-        articles = article_service.get_articles_by_user_id(user_id)
+        articles = article_service.get_articles_by_user_id(user_id, current_deadline())
 
         # Prepare the response data
         response_data = {
@@ -166,12 +645,64 @@ def get_articles_by_user(user_id):
         return handle_common_exceptions(e)
 
 
+@article_bp.route('/articles/user/<int:user_id>/duplicates', methods=['GET'])
+@jwt_required()
+def get_duplicate_articles(user_id):
+    """
+    Retrieve the pairs of near-duplicate articles in a user's library, e.g. the same paper imported
+    from different sources with a slightly different title or abstract, or without a DOI.
+
+    Similarity is the Jaccard similarity of the word shingles of the titles and abstracts, estimated
+    from MinHash signatures; candidate pairs are found through an LSH index instead of comparing
+    every pair of articles.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Path Parameters:**
+        - `user_id`: int, required - ID of the user.
+
+    **Query Parameters:**
+        - `threshold`: float, optional - Minimum similarity between 0 and 1 (default `DUPLICATE_THRESHOLD`).
+        - `limit`: int, optional - Maximum number of pairs (default `DUPLICATE_LIMIT`).
+
+    **Responses:**
+        - `200 OK`: The pairs, most similar first, each with both `articles` and their `similarity`.
+        - `400 Bad Request`: If `threshold` or `limit` is invalid.
+        - `404 Not Found`: If the user does not exist.
+        - `500 Internal Server Error`: For any server-related issues.
+        - `504 Gateway Timeout`: If the query did not complete within the request's deadline.
+    """
+    try:
+        threshold = request.args.get('threshold', type=float)  # Optional similarity threshold
+        limit = request.args.get('limit', type=int)  # Optional result limit
+
+        # Find the duplicate pairs using the article service
+        pairs = article_service.find_duplicates(user_id, threshold, limit, current_deadline())
+
+        # Prepare the response data
+        response_data = {
+            "data": [{"articles": [first.__dict__, second.__dict__], "similarity": similarity}
+                     for first, second, similarity in pairs],
+            "status": "success"
+        }
+
+        return jsonify(response_data), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
 @article_bp.route('/articles/search/<int:user_id>', methods=['GET'])
 @jwt_required()
 def search_articles(user_id):
     """
     Search for scientific articles by title, keywords, or DOI for a specific user.
 
+    The 'fuzzy' type matches titles and journal names by trigram similarity, tolerating typos
+    and different word order; its results are ordered from best to worst match.
+
     **Security:**
         - Requires a valid bearer token for authentication.
 
@@ -180,21 +711,27 @@ def search_articles(user_id):
 
     **Query Parameters:**
         - `query`: str, required - The term to search for in the specified field.
-        - `type`: str, required - The type of search ('title', 'keywords', or 'doi').
+        - `type`: str, required - The type of search ('title', 'keywords', 'doi', or 'fuzzy').
+        - `threshold`: float, optional - Fuzzy search only: minimum similarity between 0 and 1.
+        - `limit`: int, optional - Fuzzy search only: maximum number of results.
 
     **Response:**
         - `200 OK`: Articles retrieved successfully with the list of articles.
         - `400 Bad Request`: If the input is invalid or the query parameters are missing.
         - `404 Not Found`: User not found.
         - `500 Internal Server Error`: For any server-related issues.
+        - `504 Gateway Timeout`: If the query did not complete within the request's deadline.
     """
     try:
         # Retrieve query parameters
         search_term = request.args.get('query')  # Get the search term from query parameters
         search_type = request.args.get('type')  # Get the search type from query parameters
+        threshold = request.args.get('threshold', type=float)  # Optional fuzzy search similarity threshold
+        limit = request.args.get('limit', type=int)  # Optional fuzzy search result limit
 
         # Search for articles using the article service
-        articles = article_service.search_articles(user_id, search_term, search_type)
+        articles = article_service.search_articles(user_id, search_term, search_type, threshold, limit,
+                                                   current_deadline())
 
         # Prepare the response data
         response_data = {
@@ -213,6 +750,7 @@ def search_articles(user_id):
 
 @article_bp.route('/articles/<int:article_id>', methods=['PUT'])
 @jwt_required()
+@idempotent
 def update_article(article_id):
     """
     Update an article by ID.
@@ -220,6 +758,11 @@ def update_article(article_id):
     **Security:**
         - Requires a valid bearer token for authentication.
 
+    **Headers:**
+        - `Idempotency-Key`: str, optional - Makes retries safe: a request repeating the key gets the
+          first response back (with `Idempotent-Replayed: true`) instead of running again. Reusing a
+          key for a different request is rejected with `422 Unprocessable Entity`.
+
     **Path Parameters:**
         - `article_id`: int, required - ID of the article to be updated.
 
@@ -231,23 +774,19 @@ def update_article(article_id):
         - `abstract`: str - Summary of the article.
         - `journal`: str - Name of the journal.
         - `doi`: str - DOI of the article.
-        - `pages`: str - Page numbers of the article.
+        - `pages`: int - Number of pages in the article.
 
     **Response:**
         - `200 OK`: Article updated successfully with a success message.
-        - `400 Bad Request`: If the input is invalid or the request body is not JSON.
+        - `400 Bad Request`: If the input is invalid or the request body is not JSON, with an `errors`
+          object giving the problem of each invalid field.
         - `404 Not Found`: If the article to be updated is not found.
+        - `409 Conflict`: Another article of the user already has the new DOI.
         - `500 Internal Server Error`: For any server-related issues.
     """
     try:
         # Retrieve and validate the JSON data from the request body
-        data = validate_json_and_required_fields(
-            ['title', 'authors', 'publication_date', 'keywords', 'abstract', 'journal', 'doi']
-        )
-
-        # Validate authors and keywords fields to ensure they are arrays
-        data['authors'] = validate_array_field(data.get('authors', []), "authors")
-        data['keywords'] = validate_array_field(data.get('keywords', []), "keywords")
+        data = validate_json(validate_article_update)
 
         # Update the article using the article service
         article_service.update_article(article_id, data)
@@ -266,8 +805,53 @@ def update_article(article_id):
         return handle_common_exceptions(e)
 
 
+@article_bp.route('/articles/<int:article_id>', methods=['PATCH'])
+@jwt_required()
+@idempotent
+def patch_article(article_id):
+    """
+    Update some fields of an article by ID.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Headers:**
+        - `Idempotency-Key`: str, optional - Makes retries safe: a request repeating the key gets the
+          first response back (with `Idempotent-Replayed: true`) instead of running again. Reusing a
+          key for a different request is rejected with `422 Unprocessable Entity`.
+
+    **Path Parameters:**
+        - `article_id`: int, required - ID of the article to be updated.
+
+    **Request Body Parameters:**
+        - Any of the fields of the PUT endpoint; the fields left out keep their value.
+
+    **Response:**
+        - `200 OK`: Article updated successfully, with the updated article.
+        - `400 Bad Request`: If the input is invalid or the request body is not JSON, with an `errors`
+          object giving the problem of each invalid field.
+        - `404 Not Found`: If the article to be updated is not found.
+        - `409 Conflict`: Another article of the user already has the new DOI.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        # Retrieve and validate the fields sent in the request body
+        data = validate_json(validate_article_patch)
+
+        # Update the given fields using the article service
+        article = article_service.update_article(article_id, data)
+
+        # Return the updated article with status 200
+        return jsonify({"data": {"article": article.__dict__}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
 @article_bp.route('/articles/<int:article_id>', methods=['DELETE'])
 @jwt_required()
+@idempotent
 def delete_article(article_id):
     """
     Delete an article by ID.
@@ -275,6 +859,11 @@ def delete_article(article_id):
     **Security:**
         - Requires a valid bearer token for authentication.
 
+    **Headers:**
+        - `Idempotency-Key`: str, optional - Makes retries safe: a request repeating the key gets the
+          first response back (with `Idempotent-Replayed: true`) instead of running again. Reusing a
+          key for a different request is rejected with `422 Unprocessable Entity`.
+
     **Path Parameters:**
         - `article_id`: int, required - ID of the article to be deleted.
 
@@ -290,3 +879,10 @@ def delete_article(article_id):
     except Exception as e:
         # Handle any exceptions using the common exception handler
         return handle_common_exceptions(e)
+
+
+def job_accepted(job):
+    """Build the 202 Accepted response of a queued background job."""
+    response = jsonify({"data": {"job": job.to_dict()}, "status": "success"})
+    response.headers['Location'] = url_for('job.get_job', job_id=job.id)  # Where to poll the job
+    return response, 202
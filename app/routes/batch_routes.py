@@ -0,0 +1,48 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+
+from app.utils.batch import run_batch, validate_batch
+from app.utils.error_handling import handle_common_exceptions
+from app.utils.validations import validate_json
+
+batch_bp = Blueprint('batch', __name__)
+
+
+@batch_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def batch():
+    """
+    Run several article and user API calls in one HTTP round trip.
+
+    Sub-requests run in order, except that consecutive `GET` sub-requests run concurrently; a write
+    runs after the sub-requests before it and before those after it. The token is verified once
+    for the whole batch, and each sub-request counts against the rate limit of its route. A
+    failing sub-request does not affect the others.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Request Body Parameters:**
+        - `requests`: array, required - The sub-requests (at most `BATCH_MAX_REQUESTS`), each an
+          object with `method` (GET by default), `path` (e.g. `/api/articles/5?k=3`), an
+          optional JSON `body` and optional `headers` (only `Idempotency-Key`, which makes a
+          write idempotent as it would be on its own). Login, registration, token and logout
+          calls and file imports cannot be batched.
+
+    **Response:**
+        - `200 OK`: The `results` of the sub-requests, in order, each with its HTTP `status` and
+          JSON `body` (and `headers`, for Location, Retry-After and Idempotent-Replayed).
+        - `400 Bad Request`: If the input is invalid or JSON is not provided.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        # Retrieve and validate the sub-requests from the request body
+        sub_requests = validate_json(validate_batch)
+
+        # Run the sub-requests, sharing the verified token and the request's connection
+        results = run_batch(sub_requests)
+        return jsonify({"data": {"results": results}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
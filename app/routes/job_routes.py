@@ -0,0 +1,94 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+
+from app.services.job_service import job_service
+from app.utils.error_handling import handle_common_exceptions
+
+job_bp = Blueprint('job', __name__)
+
+
+@job_bp.route('/jobs/<string:job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """
+    Retrieve the status, progress and result of a background job.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Path Parameters:**
+        - `job_id`: str, required - ID of the job, as returned when it was submitted.
+
+    **Response:**
+        - `200 OK`: The job. `status` is one of 'queued', 'running', 'succeeded', 'failed' or
+          'cancelled'; `progress` counts the work items processed out of `total` (null if unknown);
+          `result` is set once the job succeeded and `error` once it failed.
+        - `404 Not Found`: If the job does not exist.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        job = job_service.get_job(job_id)
+        return jsonify({"data": {"job": job.to_dict()}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@job_bp.route('/jobs/<string:job_id>/cancel', methods=['POST'])
+@jwt_required()
+def cancel_job(job_id):
+    """
+    Cancel a background job.
+
+    A queued job is cancelled immediately; a running job stops at its next progress report, keeping
+    the work it has already committed (e.g. the batches of an import).
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Path Parameters:**
+        - `job_id`: str, required - ID of the job to cancel.
+
+    **Response:**
+        - `200 OK`: The job, with its cancellation recorded.
+        - `404 Not Found`: If the job does not exist.
+        - `409 Conflict`: If the job has already finished.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        job = job_service.cancel_job(job_id)
+        return jsonify({"data": {"job": job.to_dict()}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@job_bp.route('/jobs/<string:job_id>/retry', methods=['POST'])
+@jwt_required()
+def retry_job(job_id):
+    """
+    Run a failed background job again, from the start.
+
+    Cancelled jobs can be retried too, except imports, whose uploaded file is deleted on cancellation.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Path Parameters:**
+        - `job_id`: str, required - ID of the job to retry.
+
+    **Response:**
+        - `202 Accepted`: The job, queued again.
+        - `404 Not Found`: If the job does not exist.
+        - `409 Conflict`: If the job is queued, running or has succeeded, or is a cancelled import.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        job = job_service.retry_job(job_id)
+        return jsonify({"data": {"job": job.to_dict()}, "status": "success"}), 202
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
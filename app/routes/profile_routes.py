@@ -0,0 +1,93 @@
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from werkzeug.exceptions import Forbidden, NotFound
+
+from app.utils.error_handling import handle_common_exceptions
+from app.utils.profiling import TOKEN_HEADER, is_authorized
+
+profile_bp = Blueprint('profile', __name__)
+
+
+def get_profile_store():
+    """Return the profile store, checking that profiling is enabled and the request carries the profiling token."""
+    store = current_app.extensions.get('profile_store')
+    if store is None:
+        raise NotFound("Profiling is not enabled.")
+    if not is_authorized(current_app):
+        raise Forbidden(f"A valid {TOKEN_HEADER} header is required.")
+    return store
+
+
+@profile_bp.route('/profiles', methods=['GET'])
+@jwt_required()
+def list_profiles():
+    """
+    List the stored request profiles, newest first.
+
+    **Security:**
+        - Requires a valid bearer token for authentication, and the profiling token in the
+          `X-Profile-Token` header.
+
+    **Query Parameters:**
+        - `path`: str, optional - Only profiles of requests whose path starts with this prefix
+          (e.g. `/api/articles/search`).
+        - `min_duration_ms`: float, optional - Only profiles of requests at least this slow.
+        - `limit`: int, optional - Maximum number of profiles returned (default 100).
+
+    **Response:**
+        - `200 OK`: The `profiles`, each with its `id`, `method`, `path`, `endpoint`, `status`,
+          `duration_ms`, number of `samples`, sampling `interval_ms`, `trigger` (requested or
+          sampled) and `created_at`.
+        - `400 Bad Request`: If a query parameter is invalid.
+        - `403 Forbidden`: If the profiling token is missing or invalid.
+        - `404 Not Found`: If profiling is not enabled.
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        store = get_profile_store()
+
+        # Retrieve the filters from the query string
+        min_duration_ms = request.args.get('min_duration_ms', 0, type=float)
+        limit = request.args.get('limit', 100, type=int)
+        if limit < 1:
+            raise ValueError("limit must be a positive integer.")
+
+        profiles = store.list(request.args.get('path'), min_duration_ms, limit)
+        return jsonify({"data": {"profiles": profiles}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
+
+
+@profile_bp.route('/profiles/<profile_id>', methods=['GET'])
+@jwt_required()
+def get_profile(profile_id):
+    """
+    Download a stored request profile in collapsed-stack format.
+
+    Each line is a stack (function labels from the root, separated by `;`) followed by the number
+    of samples in which the request was running it, the input format of flamegraph.pl and speedscope.
+
+    **Security:**
+        - Requires a valid bearer token for authentication, and the profiling token in the
+          `X-Profile-Token` header.
+
+    **Path Parameters:**
+        - `profile_id`: str, required - ID of the profile (from the `X-Profile-Id` header or the list).
+
+    **Response:**
+        - `200 OK`: The profile, as `text/plain`.
+        - `403 Forbidden`: If the profiling token is missing or invalid.
+        - `404 Not Found`: If profiling is not enabled or the profile does not exist (or was pruned).
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        profile = get_profile_store().get(profile_id)
+        if profile is None:
+            raise NotFound("Profile not found.")
+        return current_app.response_class(profile, mimetype='text/plain'), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
@@ -0,0 +1,30 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+
+from app.utils.error_handling import handle_common_exceptions
+from app.utils.statement_cache import statement_stats
+
+stats_bp = Blueprint('stats', __name__)
+
+
+@stats_bp.route('/stats/database', methods=['GET'])
+@jwt_required()
+def get_database_stats():
+    """
+    Retrieve the prepared statement statistics of the database connections of this process.
+
+    **Security:**
+        - Requires a valid bearer token for authentication.
+
+    **Response:**
+        - `200 OK`: The `statements` statistics: open `connections`, prepared `statements` currently
+          cached, `hits` (executions reusing a prepared statement), `prepares`, `evictions` and
+          `hit_rate` (null before any execution).
+        - `500 Internal Server Error`: For any server-related issues.
+    """
+    try:
+        return jsonify({"data": {"statements": statement_stats()}, "status": "success"}), 200
+
+    except Exception as e:
+        # Handle any exceptions using the common exception handler
+        return handle_common_exceptions(e)
@@ -1,12 +1,14 @@
-from flask import Blueprint, jsonify
-from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
+from flask import Blueprint, jsonify, request, url_for
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 from werkzeug.exceptions import Unauthorized
 from werkzeug.security import check_password_hash
 
+from app.services.token_service import token_service
 from app.services.user_service import UserService
 from app.utils.error_handling import handle_common_exceptions
-from app.utils.tokens import generate_tokens
-from app.utils.validations import validate_json_and_required_fields, validate_username_and_password
+from app.utils.schema import validate_login, validate_password_change, validate_registration, \
+    validate_user_update
+from app.utils.validations import validate_json
 
 user_bp = Blueprint('user', __name__)
 user_service = UserService()
@@ -30,11 +32,8 @@ def register():
         - `500 Internal Server Error`: For any server-related issues.
     """
     try:
-        # Validate that the request is JSON and contains the required fields
-        data = validate_json_and_required_fields(['username', 'password', 'first_name', 'last_name'])
-
-        # Validate the username and password format
-        validate_username_and_password(data['username'], data['password'])
+        # Validate that the request is JSON and that the username and password have the required format
+        data = validate_json(validate_registration)
 
         # Register a new user with the provided details
         user = user_service.register_user(
@@ -44,8 +43,8 @@ def register():
             data['last_name']
         )
 
-        # Generate JWT tokens for the new user
-        tokens = generate_tokens(user.id)
+        # Generate (and record) JWT tokens for the new user
+        tokens = token_service.issue_tokens(user.id)
 
         # Return success response with user data and tokens
         return jsonify({
@@ -81,19 +80,16 @@ def login():
         - `500 Internal Server Error`: For any server-related issues.
     """
     try:
-        # Validate that the request is JSON and contains the required fields
-        data = validate_json_and_required_fields(['username', 'password'])
-
-        # Validate the username and password format
-        validate_username_and_password(data['username'], data['password'])
+        # Validate that the request is JSON and that the username and password have the required format
+        data = validate_json(validate_login)
 
         # Authenticate the user with the provided credentials
         user = user_service.authenticate_user(data['username'], data['password'])
 
         # Check if user is authenticated successfully
         if user:
-            # Generate JWT tokens for the authenticated user
-            tokens = generate_tokens(user.id)
+            # Generate (and record) JWT tokens for the authenticated user
+            tokens = token_service.issue_tokens(user.id)
 
             # Return success response with user data and tokens
             return jsonify({
@@ -137,8 +133,8 @@ def refresh():
     current_user = get_jwt_identity()
 
     try:
-        # Create a new access token for the current user
-        new_access_token = create_access_token(identity=current_user)
+        # Create (and record) a new access token for the current user
+        new_access_token = token_service.issue_access_token(current_user)
 
         # Return a JSON response indicating success, along with the new access token
         return jsonify({
@@ -155,6 +151,41 @@ def refresh():
         return handle_common_exceptions(e)  # Use the utility function for common exception handling
 
 
+@user_bp.route('/users/logout', methods=['POST'])
+@jwt_required()
+def logout():
+    """
+    Log out by revoking the access token used for the request and, optionally, a refresh token.
+
+    **Security:**
+        - Requires a valid bearer access token.
+
+    **Parameters:**
+        - `Authorization` (header): Bearer access token to revoke.
+        - `body` (JSON, optional): Parameters of the logout, including:
+            - `refresh_token`: A refresh token of the same user to revoke as well (string).
+
+    **Responses:**
+        - `200 OK`: The tokens were revoked; using them again returns `401 Unauthorized`.
+        - `401 Unauthorized`: Missing or invalid token, or a refresh token of another user.
+        - `500 Internal Server Error`: For server-related issues.
+    """
+    try:
+        # Revoke the refresh token first, so that a failure leaves the access token usable for a retry
+        data = request.get_json(silent=True) or {}
+        if data.get('refresh_token'):
+            token_service.revoke_refresh_token(get_jwt_identity(), data['refresh_token'])
+
+        # Revoke the access token used for this request
+        token_service.revoke_token(get_jwt())
+
+        return jsonify({"message": "Logged out successfully", "status": "success"}), 200
+
+    except Exception as e:
+        # Use the common exception handler for all exceptions
+        return handle_common_exceptions(e)
+
+
 @user_bp.route('/users/<int:user_id>', methods=['PUT'])
 @jwt_required()
 def update_user(user_id):
@@ -180,11 +211,8 @@ def update_user(user_id):
         - `500 Internal Server Error`: For server-related issues.
     """
     try:
-        # Validate that the required fields are present
-        data = validate_json_and_required_fields(['username', 'first_name', 'last_name'])
-
-        # Validate the username format
-        validate_username_and_password(username=data['username'])
+        # Validate that the required fields are present and that the username is an email
+        data = validate_json(validate_user_update)
 
         # Update the user information by passing the entire data to the user service
         user_service.update_user(user_id, data)  # Pass the entire data for update
@@ -214,18 +242,15 @@ def update_password(user_id):
             - `new_password`: The new password for the user (string).
 
     **Responses:**
-        - `200 OK`: Password updated successfully.
+        - `200 OK`: Password updated successfully. Every token issued to the user before is revoked.
         - `400 Bad Request`: Validation error or request body issue.
         - `401 Unauthorized`: Old password is incorrect.
         - `404 Not Found`: User not found.
         - `500 Internal Server Error`: For server-related issues.
     """
     try:
-        # Validate that the request is JSON and contains the required fields
-        data = validate_json_and_required_fields(['old_password', 'new_password'])
-
-        # Validate the new password to ensure it meets the security requirements
-        validate_username_and_password(username=None, password=data['new_password'])
+        # Validate that the request is JSON and that the new password meets the security requirements
+        data = validate_json(validate_password_change)
 
         # Fetch the user by ID
         user = user_service.get_user_by_id(user_id)
@@ -250,6 +275,11 @@ def delete(user_id):
     """
     Delete a user by ID.
 
+    The account is deleted right away: every token issued to the user is revoked, the user can no
+    longer log in and their articles are no longer served. The articles themselves are deleted in
+    the background, in small batches, by a `purge_user` job whose progress (articles deleted) is
+    available at `GET /api/jobs/<job_id>`; the user's row is removed once they are all gone.
+
     **Security:**
         - Requires a valid bearer token for authentication.
 
@@ -258,17 +288,20 @@ def delete(user_id):
         - `Authorization` (header): Bearer token required to authorize the request.
 
     **Responses:**
-        - `200 OK`: User deleted successfully.
+        - `202 Accepted`: User deleted, with the queued purge job; its URL is in the `Location` header.
         - `400 Bad Request`: Validation error or request issue.
-        - `404 Not Found`: User not found.
+        - `404 Not Found`: User not found (or already deleted).
         - `500 Internal Server Error`: For server-related issues.
     """
     try:
-        # Attempt to delete the user by calling the user service's delete method
-        user_service.delete_user(user_id)
-
-        # Return a success response if the user is deleted successfully
-        return jsonify({"status": "success", "message": "User deleted successfully."}), 200
+        # Mark the user as deleted and queue the purge of their articles
+        job = user_service.delete_user(user_id)
+
+        # Return the purge job with status 202
+        response = jsonify({"status": "success", "message": "User deleted successfully.",
+                            "data": {"job": job.to_dict()}})
+        response.headers['Location'] = url_for('job.get_job', job_id=job.id)  # Where to follow the purge
+        return response, 202
 
     except Exception as e:
         # Use the common exception handler for all exceptions
@@ -1,9 +1,29 @@
-from werkzeug.exceptions import NotFound  # Import exceptions for error handling
+import os  # Import os to delete spooled import files
+import threading  # Import threading to load the in-memory indexes once
+import time  # Import time to pause between the batches of a purge and to pace the index syncs
 
+from mysql.connector import Error as MySQLError  # Import MySQLError to isolate failing rows in a batch
+from werkzeug.exceptions import Conflict, NotFound  # Import exceptions for error handling
+
+from app.config import Config  # Import the configuration settings
 from app.models.article import Article  # Import the Article model to work with article data
 from app.repositories.article_repository import \
     ArticleRepository  # Import the ArticleRepository for database operations
 from app.repositories.user_repository import UserRepository  # Import the UserRepository for user interactions
+from app.services.citation_service import citation_service  # Import the citation service to clean up deletions
+from app.services.job_service import job_service  # Import the job service that runs heavy operations
+from app.services.user_service import deleted_users  # Import the users being deleted, whose articles are hidden
+from app.utils.article_snapshot import SnapshotStore  # Import the memory-mapped snapshot of the articles
+from app.utils.autocomplete_index import SUGGEST_FIELDS, AutocompleteIndex  # Import the autocomplete index
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+from app.utils.error_handling import is_duplicate_entry  # Import the check for rows rejected by a unique index
+from app.utils.importers import iter_reference_entries, open_text_stream  # Import the parser for import jobs
+from app.utils.minhash_index import MinHashIndex  # Import the MinHash index used for near-duplicates
+from app.utils.schema import ValidationError, validate_import_entry  # Import the validator of imported entries
+from app.utils.single_flight import SingleFlight  # Import SingleFlight to coalesce identical concurrent reads
+from app.utils.tfidf_index import TfidfIndex  # Import the TF-IDF index used for related articles
+from app.utils.trigram_index import TrigramIndex  # Import the trigram index used for fuzzy search
+from app.utils.validations import as_list, normalize_doi  # Import the DOI and list field helpers
 
 
 class ArticleService:
@@ -17,6 +37,36 @@ class ArticleService:
         # Initialize repositories to handle database interactions
         self.article_repository = ArticleRepository()
         self.user_repository = UserRepository()  # Initialize UserRepository
+        # Share one in-flight query between concurrent identical read calls
+        self.single_flight = SingleFlight(Config.SINGLE_FLIGHT_TIMEOUT)
+
+        # Read-only snapshot of the articles, serving the article reads when enabled
+        self.snapshots = SnapshotStore(Config.ARTICLE_SNAPSHOT_PATH, Config.ARTICLE_SNAPSHOT_CHECK_INTERVAL)
+        register_after_fork(self.snapshots.reset_lock)  # The mapping itself is shared with the parent
+
+        # In-memory indexes, built from the article table on first use and kept in sync with its change log
+        self._create_indexes()
+        register_after_fork(self._create_indexes)  # Each worker process builds its own indexes
+
+        # Heavy operations can run as background jobs
+        self.job_service = job_service
+        self.job_service.register('import_articles', self._run_import_job, cleanup=self.discard_import_file)
+        self.job_service.register('rebuild_indexes', self._run_rebuild_job)
+        self.job_service.register('publish_snapshot', self._run_snapshot_job)
+        self.job_service.register('purge_user', self._run_purge_user_job)
+
+    def _create_indexes(self):
+        """Create the (empty) in-memory indexes; they are built from the article table on first use."""
+        self.related_index = TfidfIndex(Config.RELATED_MEMORY_BUDGET, Config.RELATED_REBUILD_INTERVAL)
+        self.trigram_index = TrigramIndex()
+        self.autocomplete_index = AutocompleteIndex()
+        self.duplicate_index = MinHashIndex(Config.DUPLICATE_PERMUTATIONS, Config.DUPLICATE_BANDS)
+        self.indexes = [self.related_index, self.trigram_index, self.autocomplete_index, self.duplicate_index]
+        self.indexes_loaded = False
+        self.indexes_lock = threading.Lock()
+        self.index_generation = None  # Rebuild generation (see `rebuild_indexes`) the indexes were built for
+        self.index_positions = {}  # shard -> sequence number of the last change applied to the indexes
+        self.indexes_synced_at = 0.0  # time.monotonic() of the last read of the change log
 
     def create_article(self, article_data):
         """Create a new article using provided article data."""
@@ -29,49 +79,366 @@ class ArticleService:
         if not user:
             raise NotFound("User not found.")  # Raise NotFound if the user does not exist
 
+        # Normalize the DOI and reject duplicates within the user's library
+        article_data['doi'] = normalize_doi(article_data.get('doi'))
+        if self.article_repository.get_article_by_doi(user_id, article_data['doi']):
+            raise Conflict("An article with this DOI already exists.")
+
         # Create an Article object from the provided data
         article = Article(None, **article_data)
-        return self.article_repository.create_article(article)  # Persist the article in the database
+        try:
+            article = self.article_repository.create_article(article)  # Persist the article in the database
+        except MySQLError as e:
+            if is_duplicate_entry(e):  # Created concurrently since the check: the unique index rejected it
+                raise Conflict("An article with this DOI already exists.") from e
+            raise
+        self._index_articles([article])  # Keep the in-memory indexes up to date
+        return article
+
+    def import_articles(self, user_id, entries, batch_size=None):
+        """
+        Import a stream of parsed reference entries into a user's library.
+
+        Entries are validated with the same rules as the create endpoint and inserted in batched
+        transactions. Entries whose DOI already exists in the library (or earlier in the same file)
+        are skipped. Returns a summary with a result for every entry.
+        """
+
+        # Check if the user exists
+        user = self.user_repository.get_user_by_id(user_id)  # Fetch user by ID
+        if not user:
+            raise NotFound("User not found.")  # Raise NotFound if the user does not exist
+
+        return self._import_entries(user_id, entries, batch_size)
+
+    def submit_import(self, user_id, spool_path, file_format):
+        """
+        Queue a background job importing a spooled reference file into a user's library.
+
+        The job owns the file and deletes it once it has succeeded or was cancelled; a failed job
+        keeps it so that it can be retried. Returns the queued Job.
+        """
+
+        # Check if the user exists
+        user = self.user_repository.get_user_by_id(user_id)  # Fetch user by ID
+        if not user:
+            raise NotFound("User not found.")  # Raise NotFound if the user does not exist
+
+        return self.job_service.submit('import_articles', {"user_id": user_id, "path": spool_path,
+                                                           "format": file_format}, user_id=user_id)
+
+    def _run_import_job(self, context):
+        """Run an import job, reporting the number of entries processed as its progress."""
+        params = context.params
+        with open(params['path'], 'rb') as stream:
+            entries = iter_reference_entries(open_text_stream(stream), params['format'])
+            # Articles already imported by a previous attempt are skipped as duplicate DOIs
+            return self._import_entries(params['user_id'], entries, progress=context.progress)
+
+    @staticmethod
+    def discard_import_file(params):
+        """Delete the spooled file of an import job that will not run again."""
+        try:
+            os.remove(params['path'])
+        except FileNotFoundError:
+            pass
+
+    def _import_entries(self, user_id, entries, batch_size=None, progress=None):
+        """Validate and insert parsed entries in batches; `progress` is called with the entries processed."""
+        batch_size = batch_size or Config.IMPORT_BATCH_SIZE
+        results = []  # One result per entry, in file order
+        seen_dois = set()  # DOIs already queued from this file
+        batch = []  # (index, article) pairs waiting to be inserted
+
+        for index, data, error in entries:
+            if error:
+                results.append({"index": index, "status": "error", "message": error})
+                continue
+
+            try:
+                data = validate_import_entry(data)  # Rejected before any database work
+            except ValidationError as e:
+                results.append({"index": index, "status": "error", "message": str(e), "errors": e.errors,
+                                "doi": data.get('doi')})
+                continue
 
-    def get_all_articles(self):
-        """Retrieve all articles from the repository."""
-        return self.article_repository.get_all_articles()  # Fetch all articles
+            data['doi'] = normalize_doi(data['doi'])
+            if data['doi'] in seen_dois:
+                results.append({"index": index, "status": "skipped", "message": "Duplicate DOI in file.",
+                                "doi": data['doi']})
+                continue
+            seen_dois.add(data['doi'])
 
-    def get_article_by_id(self, article_id):
-        """Fetch an article from the repository using the article ID."""
-        article = self.article_repository.get_article_by_id(article_id)  # Fetch the article by ID
+            article = Article(None, data['title'], data['authors'], data['publication_date'], data['keywords'],
+                              data['abstract'], data['journal'], data['doi'], data.get('pages'), user_id)
+            batch.append((index, article))
+
+            if len(batch) >= batch_size:
+                results.extend(self._import_batch(user_id, batch))
+                batch = []
+                if progress:
+                    progress(len(results))  # Report the entries processed after each committed batch
+
+        if batch:
+            results.extend(self._import_batch(user_id, batch))
+        if progress:
+            progress(len(results), len(results))
+
+        results.sort(key=lambda result: result["index"])
+        return {
+            "created": sum(1 for result in results if result["status"] == "created"),
+            "skipped": sum(1 for result in results if result["status"] == "skipped"),
+            "failed": sum(1 for result in results if result["status"] == "error"),
+            "results": results
+        }
+
+    def _import_batch(self, user_id, batch):
+        """Insert one batch of imported articles, skipping DOIs that already exist."""
+        existing = self.article_repository.get_article_ids_by_dois(user_id, [article.doi for _, article in batch])
+        results = [{"index": index, "status": "skipped", "message": "Article with this DOI already exists.",
+                    "doi": article.doi} for index, article in batch if article.doi in existing]
+        pending = [(index, article) for index, article in batch if article.doi not in existing]
+
+        try:
+            self.article_repository.create_articles([article for _, article in pending])
+            created = pending
+        except MySQLError:
+            # Retry the entries one by one so a single bad row only fails itself
+            created = []
+            for index, article in pending:
+                try:
+                    self.article_repository.create_articles([article])
+                    created.append((index, article))
+                except MySQLError as e:
+                    if is_duplicate_entry(e):  # Imported concurrently since the lookup
+                        results.append({"index": index, "status": "skipped",
+                                        "message": "Article with this DOI already exists.", "doi": article.doi})
+                    else:
+                        results.append({"index": index, "status": "error", "message": e.msg, "doi": article.doi})
+
+        results.extend({"index": index, "status": "created", "id": article.id, "doi": article.doi}
+                       for index, article in created)
+        self._index_articles([article for _, article in created])  # Keep the in-memory indexes up to date
+        return results
+
+    def get_all_articles(self, deadline=None):
+        """
+        Retrieve all articles from the repository (or from the snapshot in snapshot serving mode), within
+        the request's `deadline` (if any).
+        """
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            return self._visible(snapshot.get_all_articles())
+
+        # Fetch all articles, sharing the query with concurrent identical calls
+        return self._visible(self.single_flight.do(('all_articles',), self.article_repository.get_all_articles,
+                                                   deadline, deadline=deadline))
+
+    @staticmethod
+    def _visible(articles):
+        """Drop the articles of the users being deleted, which stay in the database until they are purged."""
+        hidden = deleted_users.ids()
+        return [article for article in articles if article.user_id not in hidden] if hidden else articles
+
+    def list_articles(self, query, user_id=None, deadline=None):
+        """
+        Fetch a page of articles (of a user, or of every user) matching an ArticleQuery, within the
+        request's `deadline` (if any).
+
+        Returns the articles and the cursor of the next page, or None if this is the last one.
+        """
+        if user_id is not None:
+            # Check if the user exists
+            user = self.user_repository.get_user_by_id(user_id, deadline)  # Fetch user by ID
+            if not user:
+                raise NotFound("User not found.")  # Raise NotFound if the user does not exist
+
+        # Fetch one extra article to know whether another page follows
+        articles = self._visible(self.article_repository.find_articles(query, user_id, deadline))
+        if len(articles) <= query.limit:
+            return articles, None
+        articles = articles[:query.limit]
+        return articles, query.encode_cursor(articles[-1])
+
+    def get_article_by_id(self, article_id, deadline=None):
+        """
+        Fetch an article from the repository (or from the snapshot in snapshot serving mode) using the
+        article ID, within the request's `deadline` (if any).
+        """
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            article = snapshot.get_article(article_id)
+        else:
+            article = self.single_flight.do(('article', article_id), self._get_article_by_id, article_id, deadline,
+                                            deadline=deadline)
+        if not article or article.user_id in deleted_users.ids():  # The articles of deleted users are hidden
+            raise NotFound("Article not found.")  # Raise NotFound if the article does not exist
+        return article
+
+    def _get_article_by_id(self, article_id, deadline):
+        """Fetch an article by ID, raising NotFound if it does not exist."""
+        article = self.article_repository.get_article_by_id(article_id, deadline)  # Fetch the article by ID
         if not article:
             raise NotFound("Article not found.")  # Raise NotFound if the article does not exist
         return article  # Return the found article
 
-    def get_articles_by_user_id(self, user_id):
-        """Fetch all articles associated with a specific user ID."""
+    def get_articles_by_user_id(self, user_id, deadline=None):
+        """
+        Fetch all articles associated with a specific user ID (from the snapshot in snapshot serving
+        mode), within the request's `deadline` (if any).
+        """
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            if not snapshot.has_user(user_id) or user_id in deleted_users.ids():
+                raise NotFound("User not found.")  # Raise NotFound if the user does not exist
+            return snapshot.get_articles_by_user_id(user_id)
+        return self.single_flight.do(('articles_by_user', user_id), self._get_articles_by_user_id, user_id, deadline,
+                                     deadline=deadline)
+
+    def _get_articles_by_user_id(self, user_id, deadline):
+        """Fetch a user's articles, raising NotFound if the user does not exist."""
 
         # Check if the user exists
-        user = self.user_repository.get_user_by_id(user_id)  # Fetch user by ID
+        user = self.user_repository.get_user_by_id(user_id, deadline)  # Fetch user by ID
         if not user:
             raise NotFound("User not found.")  # Raise NotFound if the user does not exist
 
-        return self.article_repository.get_articles_by_user_id(user_id)  # Fetch articles by user ID
+        return self.article_repository.get_articles_by_user_id(user_id, deadline)  # Fetch articles by user ID
 
-    def search_articles(self, user_id, search_term, search_type):
-        """Search for articles based on a given search term, type, and user ID."""
+    def search_articles(self, user_id, search_term, search_type, threshold=None, limit=None, deadline=None):
+        """
+        Search for articles based on a given search term, type, and user ID.
+
+        The 'fuzzy' type matches titles and journal names by trigram similarity; `threshold`
+        (0-1) and `limit` override the configured defaults for it. Database searches are
+        interrupted at the request's `deadline` (if any); concurrent identical searches share the
+        query of the first one, but wait for it only until their own deadline.
+        """
+        return self.single_flight.do(('search', user_id, search_term, search_type, threshold, limit),
+                                     self._search_articles, user_id, search_term, search_type, threshold, limit,
+                                     deadline, deadline=deadline)
+
+    def _search_articles(self, user_id, search_term, search_type, threshold, limit, deadline):
+        """Validate the search parameters and run the search."""
 
         # Check if the user exists
-        user = self.user_repository.get_user_by_id(user_id)  # Fetch user by ID
+        user = self.user_repository.get_user_by_id(user_id, deadline)  # Fetch user by ID
         if not user:
             raise NotFound("User not found.")  # Raise NotFound if the user does not exist
 
         # Validate search type
-        if search_type not in ['title', 'keywords', 'doi']:
-            raise ValueError("Invalid search type. Allowed values are 'title', 'keywords', or 'doi'.")
+        if search_type not in ['title', 'keywords', 'doi', 'fuzzy']:
+            raise ValueError("Invalid search type. Allowed values are 'title', 'keywords', 'doi', or 'fuzzy'.")
 
         # Validate search term
         if not search_term:
             raise ValueError("Search term is required.")
 
+        # Fuzzy searches are answered from the in-memory trigram index
+        if search_type == 'fuzzy':
+            threshold = Config.FUZZY_SEARCH_THRESHOLD if threshold is None else threshold
+            limit = Config.FUZZY_SEARCH_LIMIT if limit is None else limit
+            if not 0 < threshold <= 1:
+                raise ValueError("Threshold must be greater than 0 and at most 1.")
+            if limit < 1:
+                raise ValueError("Limit must be a positive integer.")
+
+            self._ensure_indexes()
+            matches = self.trigram_index.search(user_id, search_term, threshold, limit)
+            matched_ids = [article_id for article_id, _ in matches]
+            articles = {article.id: article for article in
+                        self.article_repository.get_articles_by_ids(matched_ids, deadline)}
+            return [articles[article_id] for article_id, _ in matches if article_id in articles]  # Best match first
+
+        # DOIs are stored normalized, so normalize the term as well
+        if search_type == 'doi':
+            search_term = normalize_doi(search_term)
+
         # Call the repository's search function
-        return self.article_repository.search_articles(user_id, search_term, search_type)
+        return self.article_repository.search_articles(user_id, search_term, search_type, deadline)
+
+    def suggest(self, user_id, field, prefix, limit=None):
+        """
+        Suggest completions for a prefix from a user's titles, keywords, authors or journals.
+
+        Suggestions are served from the in-memory autocomplete index and ranked by frequency in the
+        user's library. The index follows the writes made through every process within
+        `INDEX_SYNC_INTERVAL` seconds (see `_ensure_indexes`), so the values of deleted articles are
+        dropped and those of new articles added; a user being deleted gets no suggestions.
+        """
+        if field not in SUGGEST_FIELDS:
+            raise ValueError(f"Invalid field. Allowed values are {', '.join(repr(f) for f in SUGGEST_FIELDS)}.")
+        if prefix is None:
+            raise ValueError("Prefix is required.")
+        limit = Config.SUGGEST_LIMIT if limit is None else limit
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer.")
+
+        if user_id in deleted_users.ids():
+            return []  # The library is being purged and its values are no longer served
+        self._ensure_indexes()
+        return self.autocomplete_index.suggest(user_id, field, prefix, limit)
+
+    def get_changes(self, user_id, since, limit=None, deadline=None):
+        """
+        Fetch the changes to a user's library after the `since` sequence number.
+
+        Several changes to the same article within a page are collapsed into the latest one. Upserts
+        carry the current article; deletes are tombstones with only the article ID. Returns the
+        changes, the token to pass as `since` for the next page and whether more changes are waiting.
+        Queries are interrupted at the request's `deadline` (if any).
+        """
+
+        # Check if the user exists
+        user = self.user_repository.get_user_by_id(user_id, deadline)  # Fetch user by ID
+        if not user:
+            raise NotFound("User not found.")  # Raise NotFound if the user does not exist
+
+        limit = Config.CHANGE_FEED_PAGE_SIZE if limit is None else limit
+        if not 1 <= limit <= Config.CHANGE_FEED_MAX_PAGE_SIZE:
+            raise ValueError(f"Limit must be an integer between 1 and {Config.CHANGE_FEED_MAX_PAGE_SIZE}.")
+        if since < 0:
+            raise ValueError("Since must be a non-negative change token.")
+
+        # Fetch one extra row to know whether another page follows
+        rows = self.article_repository.get_changes(user_id, since, limit + 1, deadline)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        latest = {}  # article_id -> (seq, operation) of its latest change in the page
+        for seq, article_id, operation in rows:
+            latest[article_id] = (seq, operation)
+
+        upserted = [article_id for article_id, (_, operation) in latest.items() if operation == 'upsert']
+        articles = {article.id: article for article in
+                    self.article_repository.get_articles_by_ids(upserted, deadline)}
+
+        changes = []
+        for article_id, (seq, operation) in sorted(latest.items(), key=lambda item: item[1][0]):
+            if operation == 'delete':
+                changes.append({"seq": seq, "operation": "delete", "article_id": article_id})
+            elif article_id in articles:  # Otherwise it was deleted since, and a tombstone follows
+                changes.append({"seq": seq, "operation": "upsert", "article_id": article_id,
+                                "article": articles[article_id].__dict__})
+
+        return {"changes": changes, "next": str(rows[-1][0] if rows else since), "has_more": has_more}
+
+    def resolve_dois(self, user_id, dois, deadline=None):
+        """
+        Resolve a list of DOIs to the IDs of the matching articles in a user's library, within the
+        request's `deadline` (if any).
+
+        Returns a dictionary mapping each DOI, as given, to its article ID or None.
+        """
+
+        # Check if the user exists
+        user = self.user_repository.get_user_by_id(user_id, deadline)  # Fetch user by ID
+        if not user:
+            raise NotFound("User not found.")  # Raise NotFound if the user does not exist
+
+        normalized = {doi: normalize_doi(doi) for doi in dois}  # Keep track of the DOIs as sent by the client
+        found = self.article_repository.get_article_ids_by_dois(user_id, sorted(set(normalized.values())), deadline)
+        return {doi: found.get(normalized_doi) for doi, normalized_doi in normalized.items()}
 
     def update_article(self, article_id, article_data):
         """Update an existing article's details based on provided article_data."""
@@ -80,13 +447,30 @@ class ArticleService:
         if not article:
             raise NotFound("Article not found.")  # Raise NotFound if the article does not exist
 
+        # Normalize the DOI and make sure it does not belong to another article of the user
+        if article_data.get('doi') is not None:
+            article_data['doi'] = normalize_doi(article_data['doi'])
+            duplicate = self.article_repository.get_article_by_doi(article.user_id, article_data['doi'])
+            if duplicate and duplicate.id != article.id:
+                raise Conflict("An article with this DOI already exists.")
+
         # Update article attributes directly from article_data if provided
         for key, value in article_data.items():
             if hasattr(article,
                        key) and value is not None:  # Check if the article object has the attribute and value is not None
                 setattr(article, key, value)  # Set the new value
 
-        return self.article_repository.update_article(article_id, article)
+        # List fields left out of a partial update are still the JSON text read from the database
+        article.authors, article.keywords = as_list(article.authors), as_list(article.keywords)
+
+        try:
+            article = self.article_repository.update_article(article_id, article)
+        except MySQLError as e:
+            if is_duplicate_entry(e):  # The DOI was taken concurrently since the check
+                raise Conflict("An article with this DOI already exists.") from e
+            raise
+        self._index_articles([article])  # Keep the in-memory indexes up to date
+        return article
 
     def delete_article(self, article_id):
         """Delete an article from the database."""
@@ -95,3 +479,228 @@ class ArticleService:
         if not article:
             raise NotFound("Article not found.")  # Raise NotFound if the article does not exist
         self.article_repository.delete_article(article_id)  # Persist the deletion in the database
+        self._unindex_article(article_id)  # Keep the in-memory indexes up to date
+        citation_service.remove_article(article_id)  # Its citations would point to nothing
+
+    def get_related_articles(self, article_id, k, deadline=None):
+        """
+        Find the articles most similar to the given article (by title, keywords and abstract), loading
+        them within the request's `deadline` (if any).
+
+        Returns a list of `(article, score)` tuples, most similar first.
+        """
+        self._ensure_indexes()
+        related = self.related_index.related(article_id, k)
+
+        if related is None:
+            # The article may have been created by another process since the index was built
+            article = self.get_article_by_id(article_id, deadline)  # Raises NotFound if the article does not exist
+            self.related_index.add(article)
+            related = self.related_index.related(article_id, k)
+
+        articles = {article.id: article for article in
+                    self._visible(self.article_repository.get_articles_by_ids([related_id for related_id, _ in related],
+                                                                              deadline))}
+        return [(articles[related_id], score) for related_id, score in related if related_id in articles]
+
+    def find_duplicates_of(self, article, limit=None, deadline=None):
+        """
+        Find the near-duplicates of an article in its user's library (e.g. the same paper imported
+        from another source, with a slightly different title or abstract), loading them within the
+        request's `deadline` (if any).
+
+        Returns a list of `(article, similarity)` tuples, most similar first.
+        """
+        self._ensure_indexes()
+        matches = self.duplicate_index.similar(article.id, Config.DUPLICATE_THRESHOLD, limit or Config.DUPLICATE_LIMIT)
+        articles = {found.id: found for found in
+                    self.article_repository.get_articles_by_ids([article_id for article_id, _ in matches], deadline)}
+        return [(articles[article_id], similarity) for article_id, similarity in matches if article_id in articles]
+
+    def find_duplicates(self, user_id, threshold=None, limit=None, deadline=None):
+        """
+        Find the pairs of near-duplicate articles in a user's library, loading them within the
+        request's `deadline` (if any).
+
+        The MinHash index follows the writes made through every process within `INDEX_SYNC_INTERVAL`
+        seconds (see `_ensure_indexes`), so the pairs include articles created or updated through
+        another process, and leave out the ones deleted.
+
+        Returns a list of `(article, article, similarity)` tuples, most similar first.
+        """
+        # Check if the user exists
+        user = self.user_repository.get_user_by_id(user_id, deadline)  # Fetch user by ID
+        if not user:
+            raise NotFound("User not found.")  # Raise NotFound if the user does not exist
+
+        threshold = Config.DUPLICATE_THRESHOLD if threshold is None else threshold
+        limit = Config.DUPLICATE_LIMIT if limit is None else limit
+        if not 0 < threshold <= 1:
+            raise ValueError("Threshold must be greater than 0 and at most 1.")
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer.")
+
+        self._ensure_indexes()
+        pairs = self.duplicate_index.duplicates(user_id, threshold, limit)
+        articles = {article.id: article for article in self.article_repository.get_articles_by_ids(
+            list({article_id for pair in pairs for article_id in pair[:2]}), deadline)}
+        return [(articles[first], articles[second], similarity) for first, second, similarity in pairs
+                if first in articles and second in articles]  # Articles deleted since the last sync are left out
+
+    def _snapshot(self):
+        """Return the published snapshot if reads are served from it, else None (reads go to the database)."""
+        if not Config.ARTICLE_SNAPSHOT_SERVING:
+            return None
+        return self.snapshots.current()  # None until a snapshot has been published
+
+    def publish_snapshot(self):
+        """Write a snapshot of every article from the database, publish it and return its size."""
+        articles = self._visible(self.article_repository.get_all_articles())
+        self.snapshots.publish(articles, self.user_repository.get_user_ids())
+        return self.snapshots.stats()
+
+    def submit_publish_snapshot(self):
+        """Queue a background job publishing a new snapshot and return it."""
+        return self.job_service.submit('publish_snapshot', {})
+
+    def _run_snapshot_job(self, context):
+        """Run a snapshot publishing job."""
+        return self.publish_snapshot()
+
+    def rebuild_indexes(self):
+        """
+        Rebuild the in-memory indexes of every process from the article table and return the sizes of
+        this process's indexes.
+
+        The index generation stored in the database is incremented first: this process rebuilds its
+        indexes at once, and every other process rebuilds its own on its next sync (see `_sync_indexes`).
+        """
+        self.article_repository.increment_index_generation()
+        with self.indexes_lock:
+            self._build_indexes()
+        return {type(index).__name__: index.stats() for index in self.indexes}
+
+    def submit_rebuild_indexes(self):
+        """Queue a background job rebuilding the in-memory indexes of every process and return it."""
+        return self.job_service.submit('rebuild_indexes', {})
+
+    def _run_rebuild_job(self, context):
+        """Run an index rebuild job (see `rebuild_indexes`), reporting the number of indexes built as its progress."""
+        self.article_repository.increment_index_generation()
+        with self.indexes_lock:
+            self._build_indexes(progress=context.progress)
+        return {type(index).__name__: index.stats() for index in self.indexes}
+
+    def _run_purge_user_job(self, context):
+        """
+        Run a user purge job: delete the articles of a user marked deleted, then the user.
+
+        The articles are deleted `USER_PURGE_BATCH_SIZE` at a time, each batch in its own short
+        transaction (rather than one huge cascade), with a pause of `USER_PURGE_PAUSE_MS` between
+        batches so other writes are not starved. Each batch is also removed from the citation graph
+        (and its cache) and from the in-memory indexes of this process; other processes remove the
+        articles from theirs on their next sync, and hide the articles of deleted users until then.
+        The progress is the number of articles deleted. A retried job resumes with the articles left.
+        """
+        user_id = context.params['user_id']
+        total = self.article_repository.count_articles_by_user_id(user_id)
+        deleted = 0
+        context.progress(deleted, total)
+        while True:
+            article_ids = self.article_repository.get_article_ids_by_user_id(user_id, Config.USER_PURGE_BATCH_SIZE)
+            if not article_ids:
+                break
+            citation_service.remove_articles(article_ids)  # First, so a retry still finds the articles
+            deleted += self.article_repository.delete_user_articles(user_id, article_ids)
+            for article_id in article_ids:
+                self._unindex_article(article_id)  # Keep the in-memory indexes up to date
+            context.progress(deleted, total)  # Raises JobCancelled if the purge was cancelled
+            time.sleep(Config.USER_PURGE_PAUSE_MS / 1000)
+        self.user_repository.delete_user(user_id)  # Last: the account hides the articles until they are gone
+        return {"user_id": user_id, "deleted_articles": deleted}
+
+    def _ensure_indexes(self):
+        """
+        Build the in-memory indexes from the article table on first use, and bring them up to date
+        with the changes made through every process at most every `INDEX_SYNC_INTERVAL` seconds.
+        """
+        if self.indexes_loaded and time.monotonic() - self.indexes_synced_at < Config.INDEX_SYNC_INTERVAL:
+            return
+        with self.indexes_lock:
+            if not self.indexes_loaded:
+                self._build_indexes()
+            elif time.monotonic() - self.indexes_synced_at >= Config.INDEX_SYNC_INTERVAL:  # Unless another thread did
+                self._sync_indexes()
+
+    def _build_indexes(self, progress=None):
+        """
+        Load every article and build the in-memory indexes (the caller holds the indexes lock).
+
+        The position of the sync in each shard's change log is taken before the articles are loaded,
+        `INDEX_SYNC_REPLAY` seconds back, so the changes of transactions still running during the
+        load are applied by the sync that follows it (applying a change again is harmless).
+        """
+        generation = self.article_repository.get_index_generation()
+        positions = self.article_repository.get_change_positions(Config.INDEX_SYNC_REPLAY)
+        articles = self._visible(self.article_repository.get_all_articles())
+        for number, index in enumerate(self.indexes):
+            if progress:
+                progress(number, len(self.indexes))  # Raises JobCancelled before touching the next index
+            index.build(articles)
+        self.index_generation, self.index_positions = generation, positions
+        self.indexes_loaded = True
+        self._apply_changes()
+
+    def _sync_indexes(self):
+        """
+        Apply the changes logged since the last sync to the in-memory indexes, or rebuild them if a
+        rebuild was requested through any process since they were built (the caller holds the
+        indexes lock).
+        """
+        if self.article_repository.get_index_generation() != self.index_generation:
+            self._build_indexes()
+        else:
+            self._apply_changes()
+
+    def _apply_changes(self):
+        """
+        Apply the changes of each shard's change log after the sync's position to the in-memory
+        indexes, `INDEX_SYNC_BATCH_SIZE` at a time (the caller holds the indexes lock).
+
+        Upserted articles are read again, so each index gets their current version, and the ones
+        deleted since (or hidden, see `_visible`) are removed like the deleted ones.
+        """
+        for shard in sorted(self.index_positions):
+            while True:
+                rows = self.article_repository.get_shard_changes(shard, self.index_positions[shard],
+                                                                 Config.INDEX_SYNC_BATCH_SIZE)
+                if not rows:
+                    break
+                latest = {article_id: operation for _, article_id, operation in rows}  # Last change of each article
+                articles = self._visible(self.article_repository.get_articles_by_ids(
+                    [article_id for article_id, operation in latest.items() if operation == 'upsert']))
+                found = {article.id for article in articles}
+                for index in self.indexes:
+                    for article in articles:
+                        index.add(article)
+                    for article_id in latest.keys() - found:
+                        index.remove(article_id)
+                self.index_positions[shard] = rows[-1][0]
+                if len(rows) < Config.INDEX_SYNC_BATCH_SIZE:
+                    break
+        self.indexes_synced_at = time.monotonic()
+
+    def _index_articles(self, articles):
+        """Add created or updated articles to the in-memory indexes (if they have been built)."""
+        with self.indexes_lock:  # Waits for an initial build in progress, which may have missed the articles
+            if self.indexes_loaded:
+                for index in self.indexes:
+                    for article in articles:
+                        index.add(article)
+
+    def _unindex_article(self, article_id):
+        """Remove a deleted article from the in-memory indexes."""
+        with self.indexes_lock:
+            if self.indexes_loaded:
+                for index in self.indexes:
+                    index.remove(article_id)
@@ -0,0 +1,152 @@
+from werkzeug.exceptions import NotFound  # Import NotFound for articles that do not exist
+
+from app.config import Config  # Import the configuration settings
+from app.repositories.article_repository import ArticleRepository  # Import the ArticleRepository to check articles
+from app.repositories.citation_repository import CitationRepository  # Import the CitationRepository for the graph
+from app.utils.citation_cache import CitationCache  # Import the cache of citation neighborhoods
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+
+
+class CitationService:
+    """
+    The CitationService class contains the business logic of the citation graph: recording which
+    articles cite which, and answering bounded traversals ("what cites this", "the citation
+    neighborhood to depth 2").
+
+    A traversal is a breadth-first search that reads the citations of a whole level with a single
+    query, so it costs one query per level rather than one per article, and stops once it has
+    reached `CITATION_MAX_NODES` articles. Neighborhoods are cached (see CitationCache) and
+    invalidated when the citations of an article they reached change.
+    """
+
+    def __init__(self):
+        # Initialize repositories to handle database interactions
+        self.citation_repository = CitationRepository()
+        self.article_repository = ArticleRepository()
+        self.cache = CitationCache(Config.CITATION_CACHE_SIZE, Config.CITATION_CACHE_TTL)
+        register_after_fork(self.cache.reset)  # The lock may be held by a thread that does not exist in a child
+
+    def add_citations(self, article_id, cited_ids):
+        """
+        Record that an article cites the given articles.
+
+        **Returns:**
+            - A dictionary with the number of citations `added` and of those that `existed` already.
+
+        **Raises:**
+            - `NotFound`: If the citing article does not exist.
+            - `ValueError`: If the article cites itself or a cited article does not exist.
+        """
+        cited_ids = list(dict.fromkeys(cited_ids))  # Drop duplicates, keeping the order
+        if article_id in cited_ids:
+            raise ValueError("An article cannot cite itself.")
+
+        # Check that every article exists, with one query per shard
+        found = {article.id for article in self.article_repository.get_articles_by_ids([article_id, *cited_ids])}
+        if article_id not in found:
+            raise NotFound("Article not found.")
+        missing = [cited_id for cited_id in cited_ids if cited_id not in found]
+        if missing:
+            raise ValueError(f"Cited articles not found: {', '.join(map(str, missing))}.")
+
+        added = self.citation_repository.add_citations(article_id, cited_ids)
+        self.cache.invalidate([article_id, *cited_ids])
+        return {"added": added, "existed": len(cited_ids) - added}
+
+    def remove_citations(self, article_id, cited_ids):
+        """
+        Remove citations of an article and return the number removed.
+
+        **Raises:**
+            - `NotFound`: If the citing article does not exist.
+        """
+        if not self.article_repository.get_article_by_id(article_id):
+            raise NotFound("Article not found.")
+        cited_ids = list(dict.fromkeys(cited_ids))
+        removed = self.citation_repository.remove_citations(article_id, cited_ids)
+        self.cache.invalidate([article_id, *cited_ids])
+        return removed
+
+    def remove_article(self, article_id):
+        """Remove every citation from or to a deleted article."""
+        neighbors = self.citation_repository.remove_article_citations(article_id)
+        self.cache.invalidate([article_id, *neighbors])
+
+    def remove_articles(self, article_ids):
+        """Remove every citation from or to a batch of deleted articles, with one query for the batch."""
+        if article_ids:
+            neighbors = self.citation_repository.remove_articles_citations(article_ids)
+            self.cache.invalidate([*article_ids, *neighbors])
+
+    def get_citations(self, article_id, direction, depth):
+        """
+        Traverse the citation graph from an article.
+
+        **Parameters:**
+            - `article_id`: ID of the article to start from.
+            - `direction`: 'out' for the articles it cites (and that they cite, and so on), 'in' for
+              the articles citing it.
+            - `depth`: Number of levels to traverse.
+
+        **Returns:**
+            - A tuple `(articles, edges, truncated)`: the `(article, depth)` pairs reached, nearest
+              first; the `(citing_id, cited_id)` citations followed; and whether the traversal stopped
+              at `CITATION_MAX_NODES` articles or `CITATION_MAX_EDGES` citations per level.
+
+        **Raises:**
+            - `NotFound`: If the article does not exist.
+        """
+        key = (article_id, direction, depth)
+        neighborhood = self.cache.get(key)
+        if neighborhood is None:
+            version = self.cache.version  # Read before the traversal, so concurrent changes are not cached over
+            neighborhood = self._traverse(article_id, direction, depth)
+            self.cache.put(key, tuple(neighborhood[0]), neighborhood, version)
+        depths, edges, truncated = neighborhood
+
+        # Load the articles reached (and the start article, to check it exists) with one query per shard
+        articles = {article.id: article for article in self.article_repository.get_articles_by_ids(list(depths))}
+        if article_id not in articles:
+            raise NotFound("Article not found.")
+        reached = [(articles[reached_id], level) for reached_id, level in depths.items()
+                   if level and reached_id in articles]  # Articles deleted meanwhile are left out
+        edges = [edge for edge in edges if edge[0] in articles and edge[1] in articles]
+        return reached, edges, truncated
+
+    def _traverse(self, article_id, direction, depth):
+        """
+        Breadth-first search from an article, reading each level's citations with a single query.
+
+        **Returns:**
+            - A tuple `(depths, edges, truncated)` where `depths` maps each article ID reached
+              (including the start, at depth 0) to its depth, in the order reached.
+        """
+        depths = {article_id: 0}
+        edges = []
+        truncated = False
+        frontier = [article_id]
+
+        for level in range(1, depth + 1):
+            if not frontier:
+                break
+            rows = self.citation_repository.get_citation_edges(frontier, direction, Config.CITATION_MAX_EDGES + 1)
+            if len(rows) > Config.CITATION_MAX_EDGES:
+                rows = rows[:Config.CITATION_MAX_EDGES]  # The citations of the last articles of the level are cut
+                truncated = True
+
+            frontier = []
+            for citing_id, cited_id in rows:
+                neighbor = cited_id if direction == 'out' else citing_id
+                if neighbor not in depths:
+                    if len(depths) > Config.CITATION_MAX_NODES:  # The start article is not counted
+                        truncated = True
+                        continue
+                    depths[neighbor] = level
+                    frontier.append(neighbor)
+                edges.append((citing_id, cited_id))
+
+        return depths, edges, truncated
+
+
+# The citation service shared by the routes and by the article service (which removes deleted articles)
+citation_service = CitationService()
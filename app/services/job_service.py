@@ -0,0 +1,253 @@
+import logging  # Import logging to report jobs that crash
+import queue  # Import queue to hand job IDs to the worker threads
+import threading  # Import threading to run the worker pool
+import time  # Import time to throttle progress updates
+import uuid  # Import uuid to generate job IDs
+
+from werkzeug.exceptions import Conflict, NotFound  # Import exceptions for error handling
+
+from app.config import Config  # Import the configuration settings
+from app.repositories.job_repository import JobRepository  # Import the JobRepository for database operations
+from app.utils.database import register_after_fork, release_connections  # Import the connection pool helpers
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job handler when the job was cancelled, to stop it at the next progress report."""
+
+
+class JobInterrupted(Exception):
+    """Raised inside a job handler when the process is shutting down; the job is queued again."""
+
+
+class JobContext:
+    """
+    The handle given to a job handler to report progress and notice cancellation.
+
+    Progress is written to the jobs table at most every `JOB_PROGRESS_INTERVAL` seconds; the same
+    write reads back the cancellation flag, so a job cancelled from another process stops too.
+    """
+
+    def __init__(self, service, repository, job):
+        self.service = service
+        self.repository = repository
+        self.job = job
+        self.progress_value = 0
+        self.total = None
+        self.reported_at = 0.0  # time.monotonic() of the last progress write
+
+    @property
+    def params(self):
+        """The parameters the job was submitted with."""
+        return self.job.params
+
+    def progress(self, done, total=None):
+        """
+        Report that `done` of `total` work items (None if unknown) have been processed.
+
+        **Raises:**
+            - `JobCancelled`: If the job was cancelled; the handler should let it propagate.
+        """
+        self.progress_value, self.total = done, total if total is not None else self.total
+        now = time.monotonic()
+        if now - self.reported_at >= Config.JOB_PROGRESS_INTERVAL:
+            self.reported_at = now
+            if self.repository.update_progress(self.job.id, self.progress_value, self.total):
+                self.service.cancelled.add(self.job.id)
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        """Raise JobCancelled if the job was cancelled, or JobInterrupted if the process is stopping."""
+        if self.job.id in self.service.cancelled:
+            raise JobCancelled()
+        if self.service.stopping.is_set():
+            raise JobInterrupted()
+
+
+class JobService:
+    """
+    The JobService class runs heavy operations (bulk imports, index rebuilds, ...) in the background.
+
+    Services register a handler per job type and submit jobs; each job is stored in the jobs table
+    and run by a pool of `JOB_WORKERS` threads of this process. Clients poll the job for its status,
+    progress and result, and can cancel a job or retry a failed one (or a cancelled one, unless its
+    type has a cleanup, which has discarded its input). Handlers receive a JobContext
+    and must be safe to run again from the start, since a retried job starts over.
+    """
+
+    def __init__(self):
+        self.handlers = {}  # job type -> (handler, cleanup)
+        self.repository = JobRepository()
+        self._reset()
+        register_after_fork(self._reset)  # Worker threads do not survive a fork; start new ones on first use
+
+    def _reset(self):
+        """Forget the worker pool; it is started again on first use."""
+        self.queue = queue.Queue()  # IDs of the jobs waiting for a worker of this process
+        self.cancelled = set()  # IDs of the running jobs of this process that were cancelled
+        self.workers = []
+        self.started = False
+        self.stopping = threading.Event()  # Set when the process shuts down
+        self.polled_at = 0.0  # time.monotonic() of the last look for jobs queued by other processes
+        self.lock = threading.Lock()  # Guards the start of the pool and the polling
+
+    def register(self, job_type, handler, cleanup=None):
+        """
+        Register the handler of a job type.
+
+        **Parameters:**
+            - `job_type`: str - Name of the job type.
+            - `handler`: callable - Called as `handler(context)` in a worker thread; its return value
+              (JSON-serializable) becomes the job's result.
+            - `cleanup`: callable, optional - Called with the job's parameters once the job will not run
+              again (it succeeded, was cancelled or expired), e.g. to delete an uploaded file. Cancelled
+              jobs of a type with a cleanup cannot be retried.
+        """
+        self.handlers[job_type] = (handler, cleanup)
+
+    def submit(self, job_type, params, user_id=None):
+        """
+        Store a new job and queue it for the worker pool.
+
+        **Returns:**
+            - The queued Job.
+        """
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job_id = uuid.uuid4().hex
+        self._start()
+        self.repository.create_job(job_id, job_type, user_id, params)
+        self.queue.put(job_id)
+        return self.repository.get_job_by_id(job_id)
+
+    def get_job(self, job_id):
+        """Fetch a job by ID, raising NotFound if it does not exist."""
+        self._start()
+        job = self.repository.get_job_by_id(job_id)
+        if not job:
+            raise NotFound("Job not found.")
+        return job
+
+    def cancel_job(self, job_id):
+        """Cancel a queued or running job and return it; a running job stops at its next progress report."""
+        job = self.get_job(job_id)
+        if not self.repository.request_cancel(job_id):
+            raise Conflict(f"The job has already {job.status}.")
+        job = self.repository.get_job_by_id(job_id)
+        if job.status == 'running':
+            self.cancelled.add(job_id)
+        else:
+            self._cleanup(job.type, job.params)
+        return job
+
+    def retry_job(self, job_id):
+        """
+        Queue a failed job again and return it.
+
+        Cancelled jobs can be retried too, unless their type has a cleanup: it ran when the job
+        was cancelled (e.g. deleting the uploaded file of an import), so the job cannot run again.
+        """
+        job_type = self.get_job(job_id).type  # Raises NotFound if the job does not exist
+        _, cleanup = self.handlers.get(job_type, (None, None))
+        statuses = ('failed',) if cleanup is not None else ('failed', 'cancelled')
+        if not self.repository.requeue_job(job_id, statuses):
+            raise Conflict("Only failed jobs can be retried." if cleanup is not None
+                           else "Only failed or cancelled jobs can be retried.")
+        self.queue.put(job_id)
+        return self.repository.get_job_by_id(job_id)
+
+    def shutdown(self, timeout):
+        """
+        Stop the worker pool, e.g. when a server worker process exits during a graceful reload.
+
+        Running jobs stop at their next progress report and are queued again, so that another
+        process picks them up. Waits at most `timeout` seconds for them.
+        """
+        self.stopping.set()
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+
+    def _start(self):
+        """Start the worker pool on first use."""
+        if self.started:
+            return
+        with self.lock:
+            if self.started:  # Another thread started it while we waited
+                return
+
+            # Jobs whose worker died stop reporting progress; fail them so they can be retried
+            self.repository.fail_stale_jobs(Config.JOB_STALE_SECONDS)
+            for job_type, params in self.repository.delete_finished_jobs(Config.JOB_RETENTION_DAYS):
+                self._cleanup(job_type, params)
+            self._poll()
+
+            for number in range(Config.JOB_WORKERS):
+                worker = threading.Thread(target=self._work, name=f"job-worker-{number}", daemon=True)
+                worker.start()
+                self.workers.append(worker)
+            self.started = True
+
+    def _poll(self):
+        """Queue the jobs waiting in the jobs table, e.g. submitted by a process that has since exited."""
+        self.polled_at = time.monotonic()
+        for job_id in self.repository.get_job_ids_by_status('queued'):
+            self.queue.put(job_id)  # Claiming is atomic, so a job queued twice still runs once
+
+    def _work(self):
+        """Run queued jobs, one at a time."""
+        while not self.stopping.is_set():
+            try:
+                job_id = self.queue.get(timeout=Config.JOB_POLL_INTERVAL)
+            except queue.Empty:
+                with self.lock:
+                    if time.monotonic() - self.polled_at >= Config.JOB_POLL_INTERVAL:
+                        self._poll()
+                release_connections()
+                continue
+
+            try:
+                if not self.stopping.is_set() and self.repository.claim_job(job_id):  # Skip cancelled jobs
+                    self._run(self.repository.get_job_by_id(job_id))
+            except Exception:
+                logger.exception("Job %s could not be run", job_id)
+            finally:
+                self.cancelled.discard(job_id)
+                release_connections()  # Return the connections the job used to the pool
+
+    def _run(self, job):
+        """Run a claimed job and record its outcome."""
+        handler, _ = self.handlers.get(job.type, (None, None))
+        if handler is None:
+            self.repository.finish_job(job.id, 'failed', error=f"Unknown job type: {job.type}")
+            return
+
+        context = JobContext(self, self.repository, job)
+        try:
+            result = handler(context)
+        except JobCancelled:
+            self.repository.finish_job(job.id, 'cancelled')
+            self._cleanup(job.type, job.params)
+        except JobInterrupted:
+            self.repository.release_job(job.id)  # Another process will run it again
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            self.repository.finish_job(job.id, 'failed', error=str(e) or type(e).__name__)
+        else:
+            self.repository.update_progress(job.id, context.progress_value, context.total)
+            self.repository.finish_job(job.id, 'succeeded', result=result)
+            self._cleanup(job.type, job.params)
+
+    def _cleanup(self, job_type, params):
+        """Release the resources of a job that will not run again."""
+        _, cleanup = self.handlers.get(job_type, (None, None))
+        if cleanup is not None:
+            try:
+                cleanup(params)
+            except Exception:
+                logger.exception("Cleanup of a %s job failed", job_type)
+
+
+# The job service shared by the routes and by the services that submit jobs
+job_service = JobService()
@@ -0,0 +1,123 @@
+import logging  # Import logging to report failed synchronizations
+import threading  # Import threading to synchronize the blocklist in the background
+import time  # Import time to compare token expiry times
+from datetime import timedelta  # Import timedelta to look back when polling revocations
+
+from flask_jwt_extended import create_access_token, decode_token  # Import JWT helpers to issue and read tokens
+from jwt import PyJWTError  # Import PyJWTError to reject malformed tokens
+from werkzeug.exceptions import Unauthorized  # Import Unauthorized for tokens that do not belong to the caller
+
+from app.config import Config  # Import the configuration settings
+from app.repositories.token_repository import TokenRepository  # Import the TokenRepository for database operations
+from app.utils.database import register_after_fork, release_connections  # Import the connection pool helpers
+from app.utils.token_blocklist import TokenBlocklist  # Import the in-memory revocation list
+from app.utils.tokens import generate_tokens  # Import the token generation helper
+
+logger = logging.getLogger(__name__)
+
+
+class TokenService:
+    """
+    The TokenService class issues and revokes JWTs.
+
+    Every issued token is recorded by its `jti`, so that all the tokens of a user can be revoked.
+    Checking whether a token is revoked is answered from an in-memory TokenBlocklist, without a
+    database query: the blocklist is loaded once per process and then kept up to date by a
+    background thread that polls the revocations made by other processes every
+    `TOKEN_BLOCKLIST_SYNC_INTERVAL` seconds. Revocations made by this process apply immediately.
+    """
+
+    def __init__(self):
+        self.token_repository = TokenRepository()
+        self.blocklist = TokenBlocklist(Config.TOKEN_BLOCKLIST_CAPACITY, Config.TOKEN_BLOCKLIST_FALSE_POSITIVE_RATE)
+        self._reset()
+        register_after_fork(self._reset)  # The sync thread does not survive a fork
+
+    def _reset(self):
+        """Forget the sync thread; it is started again on first use."""
+        self.blocklist.reset_lock()
+        self.loaded = False
+        self.synced_at = None  # Database time of the last synchronization
+        self.lock = threading.Lock()
+
+    def issue_tokens(self, user_id):
+        """Create and record an access token and a refresh token for a user."""
+        tokens = generate_tokens(user_id)
+        self._record(user_id, tokens.values())
+        return tokens
+
+    def issue_access_token(self, user_id):
+        """Create and record a new access token for a user."""
+        access_token = create_access_token(identity=user_id)
+        self._record(user_id, [access_token])
+        return access_token
+
+    def _record(self, user_id, encoded_tokens):
+        """Record issued tokens by their jti."""
+        claims = [decode_token(token) for token in encoded_tokens]
+        self.token_repository.record_tokens([(claim['jti'], user_id, claim['type'], claim['exp'])
+                                             for claim in claims])
+
+    def revoke_token(self, claims):
+        """Revoke a single token, given its decoded claims."""
+        self.token_repository.revoke_token(claims['jti'], claims['sub'], claims['exp'])
+        self.blocklist.add(claims['jti'], claims['exp'])
+
+    def revoke_refresh_token(self, user_id, refresh_token):
+        """Revoke an encoded refresh token, which must belong to the user."""
+        try:
+            claims = decode_token(refresh_token, allow_expired=True)
+        except PyJWTError:
+            raise Unauthorized("Invalid refresh token.")
+        if claims.get('type') != 'refresh' or str(claims['sub']) != str(user_id):
+            raise Unauthorized("The refresh token does not belong to the current user.")
+        self.revoke_token(claims)
+
+    def revoke_user_tokens(self, user_id):
+        """Revoke every unexpired token of a user, e.g. after a password change or account deletion."""
+        for jti, expires_at in self.token_repository.revoke_user_tokens(user_id, int(time.time())):
+            self.blocklist.add(jti, expires_at)
+
+    def is_revoked(self, jti):
+        """Return whether a token is revoked, without querying the database (after the first call)."""
+        if not self.loaded:
+            self._start()
+        return self.blocklist.is_revoked(jti)
+
+    def _start(self):
+        """Load the blocklist and start the background synchronization."""
+        with self.lock:
+            if self.loaded:  # Another thread loaded it while we waited
+                return
+            self._sync()
+            self.loaded = True
+            threading.Thread(target=self._sync_forever, name="token-blocklist-sync", daemon=True).start()
+
+    def _sync(self):
+        """Add the tokens revoked since the last synchronization to the blocklist."""
+        # Look back a little to catch revocations whose transaction committed after the last poll
+        since = None if self.synced_at is None else self.synced_at - timedelta(
+            seconds=Config.TOKEN_BLOCKLIST_SYNC_MARGIN)
+        rows, self.synced_at = self.token_repository.get_revoked_tokens(since, int(time.time()))
+        for jti, expires_at in rows:
+            self.blocklist.add(jti, expires_at)
+
+    def _sync_forever(self):
+        """Poll the revocation list and prune expired tokens, until the process exits."""
+        pruned_at = time.monotonic()
+        while True:
+            time.sleep(Config.TOKEN_BLOCKLIST_SYNC_INTERVAL)
+            try:
+                self._sync()
+                if time.monotonic() - pruned_at >= Config.TOKEN_BLOCKLIST_PRUNE_INTERVAL:
+                    pruned_at = time.monotonic()
+                    self.blocklist.prune()
+                    self.token_repository.delete_expired_tokens(int(time.time()), 10000)
+            except Exception:
+                logger.exception("Could not synchronize the token blocklist")
+            finally:
+                release_connections()
+
+
+# The token service shared by the routes, the user service and the JWT manager
+token_service = TokenService()
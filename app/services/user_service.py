@@ -1,8 +1,13 @@
 from werkzeug.exceptions import NotFound, Conflict, Unauthorized
 from werkzeug.security import generate_password_hash, check_password_hash  # Import functions for password hashing
 
+from app.config import Config  # Import the configuration settings
 from app.models.user import User  # Import the User model to work with user data
 from app.repositories.user_repository import UserRepository  # Import the UserRepository for database operations
+from app.services.job_service import job_service  # Import the job service that purges deleted users
+from app.services.token_service import token_service  # Import the token service to revoke a user's tokens
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+from app.utils.deleted_users import DeletedUsers  # Import the set of users being deleted
 
 
 class UserService:
@@ -18,7 +23,7 @@ class UserService:
 
     def register_user(self, username, password, first_name='', last_name=''):
         """Register a new user with the given username and password."""
-        if self.user_repository.get_user_by_username(username):
+        if self.user_repository.get_user_by_username(username, include_deleted=True):
             raise Conflict("User already exists.")  # Raise an error if the user already exists
 
         password_hash = generate_password_hash(password)  # Hash the user's password
@@ -41,7 +46,8 @@ class UserService:
         # Check if the username is being updated and if it is already taken by another user
         new_username = user_data.get("username")
         if new_username and new_username != user.username:
-            existing_user = self.user_repository.get_user_by_username(new_username)
+            # Usernames of users being deleted stay taken until their account is purged
+            existing_user = self.user_repository.get_user_by_username(new_username, include_deleted=True)
             if existing_user:
                 raise Conflict("Username is already taken by another user.")
 
@@ -61,6 +67,7 @@ class UserService:
 
         user.password_hash = generate_password_hash(new_password)  # Hash the new password
         self.user_repository.update_user(user)  # Persist the user with the updated password
+        token_service.revoke_user_tokens(user_id)  # Tokens obtained with the old password stop working
 
     def get_user_by_id(self, user_id):
         """Fetch a user from the database using the user ID."""
@@ -70,8 +77,23 @@ class UserService:
         return user  # Return the found user
 
     def delete_user(self, user_id):
-        """Delete a user from the database."""
-        user = self.user_repository.get_user_by_id(user_id)  # Fetch the user by ID
-        if not user:
+        """
+        Delete a user.
+
+        The account is marked deleted right away: it can no longer log in, its tokens are revoked
+        and its articles are hidden. The articles are then deleted in small batches by a
+        `purge_user` background job (see ArticleService), which deletes the account last.
+
+        **Returns:**
+            - The queued purge Job.
+        """
+        if not self.user_repository.mark_user_deleted(user_id):  # Also rejects a second deletion
             raise NotFound("User not found.")  # Raise an error if the user does not exist
-        self.user_repository.delete_user(user_id)  # Persist the deletion in the database
+        deleted_users.add(user_id)  # Hide the user's articles in this process right away
+        token_service.revoke_user_tokens(user_id)  # The user's tokens must not outlive the account
+        return job_service.submit('purge_user', {"user_id": user_id}, user_id=user_id)
+
+
+# The users being deleted, whose articles the article service hides until they are purged
+deleted_users = DeletedUsers(UserRepository().get_deleted_user_ids, Config.USER_PURGE_REFRESH_INTERVAL)
+register_after_fork(deleted_users.reset_lock)
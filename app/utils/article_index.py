@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod  # Import ABC to declare the methods every index implements
+
+
+class ArticleIndex(ABC):
+    """
+    Base class for the in-memory indexes kept by the ArticleService.
+
+    The service builds every index from the full article table on first use and then keeps it
+    up to date by calling `add` when an article is created or updated and `remove` when it is
+    deleted. Indexes live in the memory of each process.
+    """
+
+    @abstractmethod
+    def build(self, articles):
+        """Replace the contents of the index with the given articles."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, article):
+        """Add an article to the index, replacing any previous version of it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove(self, article_id):
+        """Remove an article from the index (a no-op if it is not indexed)."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return a dictionary describing the size of the index."""
+        return {}
@@ -0,0 +1,127 @@
+import base64  # Import base64 to make page cursors URL-safe
+import binascii  # Import binascii to reject malformed cursors
+import json  # Import the JSON library to encode page cursors
+import re  # Import the re module to check dates
+from datetime import date  # Import date to check calendar dates
+
+from app.config import Config  # Import the configuration settings
+
+# Sort keys accepted by the list endpoints (prefix with '-' for descending order) and their columns
+SORT_COLUMNS = {'id': 'id', 'date': 'publication_date', 'title': 'title'}
+
+# Query parameters of the list endpoints; a request with none of them gets the full, unpaginated list
+LIST_PARAMETERS = ('from', 'to', 'journal', 'min_pages', 'max_pages', 'sort', 'limit', 'cursor')
+
+
+class ArticleQuery:
+    """
+    The filters, sort order and page of an article list request.
+
+    Results are ordered by the sort column and then by article ID, which makes the order total:
+    a page is fetched with a keyset condition (`(column, id) > (last value, last id)`) instead of
+    an offset, so every page is a single range scan of a composite index however deep it is.
+    """
+
+    def __init__(self, date_from=None, date_to=None, journal=None, min_pages=None, max_pages=None,
+                 sort='id', limit=None, after=None):
+        self.date_from = date_from  # Earliest publication date (YYYY-MM-DD), inclusive
+        self.date_to = date_to  # Latest publication date (YYYY-MM-DD), inclusive
+        self.journal = journal  # Exact journal name
+        self.min_pages = min_pages
+        self.max_pages = max_pages
+        self.descending = sort.startswith('-')
+        self.sort = sort.lstrip('-')  # Key of SORT_COLUMNS
+        self.limit = limit or Config.ARTICLE_PAGE_SIZE  # Articles per page
+        self.after = after  # (sort value, article ID) of the last article of the previous page
+
+    @property
+    def column(self):
+        """The column sorted on."""
+        return SORT_COLUMNS[self.sort]
+
+    @property
+    def sort_spec(self):
+        """The sort as given in the query string, e.g. '-date'."""
+        return ('-' if self.descending else '') + self.sort
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        Parse and validate the query parameters of a list request.
+
+        **Parameters:**
+            - `args`: The request's query parameters.
+
+        **Returns:**
+            - An ArticleQuery, or None if the request uses none of the list parameters.
+
+        **Raises:**
+            - `ValueError`: If a parameter is invalid.
+        """
+        if not any(name in args for name in LIST_PARAMETERS):
+            return None
+
+        sort = args.get('sort', 'id')
+        if sort.lstrip('-') not in SORT_COLUMNS or sort.startswith('--'):
+            raise ValueError(f"Invalid sort. Use one of: {', '.join(SORT_COLUMNS)} (prefix with '-' for descending).")
+
+        limit = _parse_int(args, 'limit')
+        if limit is not None and not 1 <= limit <= Config.ARTICLE_MAX_PAGE_SIZE:
+            raise ValueError(f"Limit must be an integer between 1 and {Config.ARTICLE_MAX_PAGE_SIZE}.")
+
+        query = cls(date_from=_parse_date(args, 'from'), date_to=_parse_date(args, 'to'),
+                    journal=args.get('journal') or None, min_pages=_parse_int(args, 'min_pages'),
+                    max_pages=_parse_int(args, 'max_pages'), sort=sort, limit=limit)
+        if 'cursor' in args:
+            query.after = query.decode_cursor(args['cursor'])
+        return query
+
+    def encode_cursor(self, article):
+        """Return the cursor of the page following the given (last) article."""
+        value = getattr(article, self.column)
+        if isinstance(value, date):
+            value = value.isoformat()
+        payload = json.dumps([self.sort_spec, value, article.id], separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return the (sort value, article ID) of a cursor, which must come from a query with the same sort."""
+        try:
+            sort, value, article_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError("Invalid cursor.")
+        if sort != self.sort_spec or not isinstance(article_id, int):
+            raise ValueError("Invalid cursor: it belongs to a different sort order.")
+        return value, article_id
+
+    def sort_key(self, article):
+        """Sort key of an article in Python, matching the database order (used to merge shards)."""
+        value = getattr(article, self.column)
+        if self.sort == 'date':
+            value = str(value)  # Dates and YYYY-MM-DD strings sort alike
+        elif self.sort == 'title':
+            value = value.casefold()  # The column's collation is case-insensitive
+        return value, article.id
+
+
+def _parse_int(args, name):
+    """Parse an optional non-negative integer query parameter."""
+    value = args.get(name)
+    if value is None:
+        return None
+    if not value.isdigit():
+        raise ValueError(f"{name} must be a non-negative integer.")
+    return int(value)
+
+
+def _parse_date(args, name):
+    """Parse an optional YYYY-MM-DD query parameter."""
+    value = args.get(name)
+    if value is None:
+        return None
+    try:
+        if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+            raise ValueError()
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(f"{name} must be a valid date (YYYY-MM-DD).")
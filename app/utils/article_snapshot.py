@@ -0,0 +1,231 @@
+import json  # Import the JSON library to store list fields as JSON text
+import mmap  # Import mmap to map snapshot files into memory
+import os  # Import os to publish snapshot files atomically
+import struct  # Import struct to read and write the file header
+import tempfile  # Import tempfile to write new snapshots next to the published one
+import threading  # Import threading to swap snapshots safely
+import time  # Import time to throttle checks for new snapshots
+from datetime import date  # Import date to store publication dates as day numbers
+
+import numpy as np  # Import NumPy to view the columns of the mapped file without copying them
+
+from app.models.article import Article  # Import the Article model returned by snapshot reads
+
+MAGIC = b'ARTSNAP1'  # File signature and format version
+STRING_COLUMNS = ('title', 'authors', 'keywords', 'abstract', 'journal', 'doi')
+# Sections of the file, in order; each one starts on an 8-byte boundary
+SECTIONS = ('ids', 'user_ids', 'pages', 'dates', 'nulls',
+            *(f"{column}_{part}" for column in STRING_COLUMNS for part in ('offsets', 'data')),
+            'users', 'user_starts', 'user_rows')
+HEADER = struct.Struct(f"<8sQQ{2 * len(SECTIONS)}Q")  # Magic, articles, users, (offset, length) of each section
+
+
+def _text(value):
+    """Return the text stored for a string column (list fields as JSON, like the database holds them)."""
+    if isinstance(value, (list, tuple)):
+        return json.dumps(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8')
+    return str(value)
+
+
+def _day(value):
+    """Return the day number (proleptic ordinal) of a publication date, or 0 if there is none."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+def write_snapshot(path, articles, user_ids):
+    """
+    Write a snapshot of the articles (and of the IDs of every user) and publish it at `path`.
+
+    The file is columnar: fixed-size columns (IDs, user IDs, pages, dates) are arrays of the rows
+    ordered by article ID, which is the index by ID; each string column is an array of offsets into
+    a block of UTF-8 text. The index by user is the sorted user IDs with, for each, the range of
+    its rows in `user_rows` (row numbers ordered by user and article ID).
+
+    The snapshot is written to a temporary file in the same directory and renamed over `path`, so
+    readers see either the previous snapshot or the new one, never a partial file.
+
+    **Returns:**
+        - The number of articles written.
+    """
+    articles = sorted(articles, key=lambda article: article.id)
+    users = np.array(sorted(set(user_ids) | {article.user_id for article in articles}), dtype='<i8')
+
+    sections = {
+        'ids': np.array([article.id for article in articles], dtype='<i8'),
+        'user_ids': np.array([article.user_id for article in articles], dtype='<i8'),
+        'pages': np.array([-1 if article.pages is None else article.pages for article in articles], dtype='<i8'),
+        'dates': np.array([_day(article.publication_date) for article in articles], dtype='<i4'),
+        'nulls': np.zeros(len(articles), dtype='u1'),  # Bit k is set when string column k is NULL
+    }
+    for bit, column in enumerate(STRING_COLUMNS):
+        values = [getattr(article, column) for article in articles]
+        encoded = [b'' if value is None else _text(value).encode('utf-8') for value in values]
+        sections['nulls'] |= np.array([value is None for value in values], dtype='u1') << bit
+        sections[f"{column}_offsets"] = np.concatenate(([0], np.cumsum([len(text) for text in encoded]))).astype('<u8')
+        sections[f"{column}_data"] = b''.join(encoded)
+    user_rows = np.lexsort((sections['ids'], sections['user_ids'])).astype('<u4')
+    sections['users'] = users
+    sections['user_starts'] = np.searchsorted(sections['user_ids'][user_rows], users).astype('<u8')
+    sections['user_starts'] = np.append(sections['user_starts'], np.uint64(len(articles)))
+    sections['user_rows'] = user_rows
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile('wb', dir=directory, prefix='.snapshot-', delete=False) as file:
+        try:
+            file.seek(HEADER.size)
+            layout = []
+            for name in SECTIONS:
+                data = sections[name]
+                data = data.tobytes() if isinstance(data, np.ndarray) else data
+                file.write(b'\0' * (-file.tell() % 8))  # Align the section for the array views
+                layout.extend((file.tell(), len(data)))
+                file.write(data)
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, len(articles), len(users), *layout))
+            file.flush()
+            os.fsync(file.fileno())  # The data must be on disk before the rename makes it visible
+            os.chmod(file.name, 0o644)  # Temporary files are private, but every worker process reads the snapshot
+        except BaseException:
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, path)  # Atomic: readers open either the old or the new file
+    return len(articles)
+
+
+class ArticleSnapshot:
+    """
+    A published snapshot file, mapped read-only into memory.
+
+    Every column is a NumPy view or memoryview of the mapping, so opening a snapshot reads only its
+    header, and lookups touch only the pages they need: the binary search over the IDs, then the
+    row's values. The pages are those of the operating system's page cache, shared by every
+    process that maps the same file. Only the returned Article objects are built in Python.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            self.version = (stat.st_ino, stat.st_mtime_ns)  # Identifies the published file
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # Stays valid after close
+        header = HEADER.unpack_from(self.buffer)
+        if header[0] != MAGIC:
+            raise ValueError(f"{path} is not an article snapshot.")
+        self.count, self.user_count = header[1], header[2]
+        view = memoryview(self.buffer)
+        self.sections = {name: view[header[3 + 2 * index]:header[3 + 2 * index] + header[4 + 2 * index]]
+                         for index, name in enumerate(SECTIONS)}
+
+        self.ids = np.frombuffer(self.sections['ids'], dtype='<i8')
+        self.user_ids = np.frombuffer(self.sections['user_ids'], dtype='<i8')
+        self.pages = np.frombuffer(self.sections['pages'], dtype='<i8')
+        self.dates = np.frombuffer(self.sections['dates'], dtype='<i4')
+        self.nulls = np.frombuffer(self.sections['nulls'], dtype='u1')
+        self.offsets = {column: np.frombuffer(self.sections[f"{column}_offsets"], dtype='<u8')
+                        for column in STRING_COLUMNS}
+        self.users = np.frombuffer(self.sections['users'], dtype='<i8')
+        self.user_starts = np.frombuffer(self.sections['user_starts'], dtype='<u8')
+        self.user_rows = np.frombuffer(self.sections['user_rows'], dtype='<u4')
+
+    def _article(self, row):
+        """Build the Article of a row."""
+        nulls = int(self.nulls[row])
+        values = {}
+        for bit, column in enumerate(STRING_COLUMNS):
+            if nulls >> bit & 1:
+                values[column] = None
+            else:
+                offsets = self.offsets[column]
+                values[column] = str(self.sections[f"{column}_data"][offsets[row]:offsets[row + 1]], 'utf-8')
+        pages, day = int(self.pages[row]), int(self.dates[row])
+        return Article(int(self.ids[row]), values['title'], values['authors'], date.fromordinal(day) if day else None,
+                       values['keywords'], values['abstract'], values['journal'], values['doi'],
+                       None if pages < 0 else pages, int(self.user_ids[row]))
+
+    def get_article(self, article_id):
+        """Return the article with the given ID, or None."""
+        row = int(np.searchsorted(self.ids, article_id))
+        if row < self.count and self.ids[row] == article_id:
+            return self._article(row)
+        return None
+
+    def has_user(self, user_id):
+        """Return whether the user existed when the snapshot was written."""
+        index = int(np.searchsorted(self.users, user_id))
+        return index < self.user_count and self.users[index] == user_id
+
+    def get_articles_by_user_id(self, user_id):
+        """Return the articles of a user, by ID."""
+        index = int(np.searchsorted(self.users, user_id))
+        if index == self.user_count or self.users[index] != user_id:
+            return []
+        rows = self.user_rows[int(self.user_starts[index]):int(self.user_starts[index + 1])]
+        return [self._article(int(row)) for row in rows]
+
+    def get_all_articles(self):
+        """Return every article, by ID."""
+        return [self._article(row) for row in range(self.count)]
+
+
+class SnapshotStore:
+    """
+    The snapshot published at a path, as seen by this process.
+
+    The mapped snapshot is replaced when a new file is published at the path, which is checked
+    (with a `stat`) at most every `check_interval` seconds. Reads that already hold the previous
+    snapshot finish on it: its mapping is released once nothing references it.
+    """
+
+    def __init__(self, path, check_interval):
+        self.path = path
+        self.check_interval = check_interval
+        self.snapshot = None
+        self.checked_at = None
+        self.lock = threading.Lock()
+
+    def current(self):
+        """Return the latest published ArticleSnapshot, or None if there is none."""
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < self.check_interval:
+            return self.snapshot
+        with self.lock:
+            if self.checked_at is None or now - self.checked_at >= self.check_interval:
+                self._refresh()
+                self.checked_at = now
+            return self.snapshot
+
+    def _refresh(self):
+        """Map the published file if it is not the one already mapped."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.snapshot = None
+            return
+        if self.snapshot is None or self.snapshot.version != (stat.st_ino, stat.st_mtime_ns):
+            self.snapshot = ArticleSnapshot(self.path)
+
+    def publish(self, articles, user_ids):
+        """Write and publish a new snapshot, and serve it from this process right away."""
+        count = write_snapshot(self.path, articles, user_ids)
+        with self.lock:
+            self._refresh()
+            self.checked_at = time.monotonic()
+        return count
+
+    def reset_lock(self):
+        """Replace the lock, which may be held by a thread that does not exist in a forked child."""
+        self.lock = threading.Lock()
+
+    def stats(self):
+        """Return the size of the snapshot served, if any."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return {"published": False}
+        return {"published": True, "path": self.path, "articles": snapshot.count, "users": snapshot.user_count,
+                "bytes": len(snapshot.buffer)}
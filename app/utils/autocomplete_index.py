@@ -0,0 +1,193 @@
+import bisect  # Import bisect for binary search over the sorted words
+import heapq  # Import heapq to rank the matching values
+import itertools  # Import itertools to number the distinct values
+import threading  # Import threading to guard the index
+
+from app.utils.article_index import ArticleIndex  # Import the base class of the article indexes
+from app.utils.validations import as_list  # Import the helper reading list fields as lists
+
+# Article fields offered for autocompletion
+SUGGEST_FIELDS = ('title', 'keywords', 'authors', 'journal')
+
+
+def normalize(text):
+    """Lower-case text and collapse whitespace."""
+    return ' '.join(str(text).lower().split())
+
+
+class _FieldIndex:
+    """
+    The suggestions of one field of one user's library.
+
+    Every distinct value is stored once with its frequency, under a small integer ID. Each distinct
+    word is stored once too, with the IDs of the values containing it, and the words are kept in a
+    sorted list so that a prefix finds its words by binary search and matches the start of any word
+    of a value. Words added since the last query are sorted in bulk by the next one, so building
+    the index sorts the words once.
+    """
+
+    __slots__ = ('ids', 'values', 'postings', 'words', 'unsorted', 'stale', 'counter')
+
+    def __init__(self):
+        self.ids = {}  # normalized value -> value ID
+        self.values = {}  # value ID -> [count, display value, normalized value]
+        self.postings = {}  # word -> set of the IDs of the values containing it
+        self.words = []  # Sorted words (may include removed words, skipped until the next compaction)
+        self.unsorted = []  # Words added since the last sort
+        self.stale = 0  # Number of removed words still in `words`
+        self.counter = itertools.count()
+
+    def add(self, value):
+        """Count one more occurrence of a value."""
+        normalized = normalize(value)
+        value_id = self.ids.get(normalized)
+        if value_id is not None:
+            self.values[value_id][0] += 1
+            return
+        value_id = self.ids[normalized] = next(self.counter)
+        self.values[value_id] = [1, value, normalized]
+        for word in set(normalized.split(' ')):
+            posting = self.postings.get(word)
+            if posting is None:
+                posting = self.postings[word] = set()
+                self.unsorted.append(word)
+            posting.add(value_id)
+
+    def discard(self, value):
+        """Count one less occurrence of a value, removing it when it no longer occurs."""
+        normalized = normalize(value)
+        value_id = self.ids.get(normalized)
+        if value_id is None:
+            return
+        entry = self.values[value_id]
+        entry[0] -= 1
+        if entry[0] > 0:
+            return
+        del self.ids[normalized], self.values[value_id]
+        for word in set(normalized.split(' ')):
+            posting = self.postings[word]
+            posting.discard(value_id)
+            if not posting:
+                del self.postings[word]
+                self.stale += 1
+
+    def _sort(self):
+        """Merge the words added since the last query, dropping removed words once they are numerous."""
+        if self.stale > len(self.postings):
+            self.words = sorted(self.postings)
+            self.unsorted, self.stale = [], 0
+        elif self.unsorted:
+            self.words.extend(self.unsorted)
+            self.words.sort()  # Two sorted runs: merged in linear time
+            self.unsorted = []
+            self.stale = len(self.words) - len(self.postings)  # Removed words that were re-added are listed twice
+
+    def suggest(self, prefix, limit):
+        """Return the most frequent values with a word sequence starting with the prefix."""
+        self._sort()
+        words = prefix.split(' ')
+        if len(words) == 1:
+            # Every value with a word starting with the prefix
+            matches = set()
+            position = bisect.bisect_left(self.words, prefix)
+            while position < len(self.words) and self.words[position].startswith(prefix):
+                matches.update(self.postings.get(self.words[position], ()))
+                position += 1
+        else:
+            # The words before the last one are complete: check the values containing the first one
+            needle = ' ' + prefix
+            matches = [value_id for value_id in self.postings.get(words[0], ())
+                       if needle in ' ' + self.values[value_id][2]]
+
+        ranked = heapq.nsmallest(limit, matches, key=lambda value_id: (-self.values[value_id][0],
+                                                                       self.values[value_id][2]))
+        return [{"value": self.values[value_id][1], "count": self.values[value_id][0]} for value_id in ranked]
+
+
+class AutocompleteIndex(ArticleIndex):
+    """
+    An in-memory prefix index of titles, keywords, authors and journals, scoped per user and ranked
+    by how often each value occurs in the user's library.
+    """
+
+    def __init__(self):
+        self.fields = {}  # (user_id, field) -> _FieldIndex
+        self.documents = {}  # article_id -> (user_id, {field: [values]})
+        self.lock = threading.Lock()
+
+    def build(self, articles):
+        """Replace the indexed articles."""
+        with self.lock:
+            self.fields.clear()
+            self.documents.clear()
+            for article in articles:
+                self._add(article)
+
+    def add(self, article):
+        """Index a created or updated article."""
+        with self.lock:
+            self._remove(article.id)
+            self._add(article)
+
+    def remove(self, article_id):
+        """Remove a deleted article."""
+        with self.lock:
+            self._remove(article_id)
+
+    def _add(self, article):
+        """Count the article's values in its user's field indexes."""
+        values = {
+            'title': [article.title] if article.title else [],
+            'keywords': [keyword for keyword in as_list(article.keywords) if keyword],
+            'authors': [author for author in as_list(article.authors) if author],
+            'journal': [article.journal] if article.journal else []
+        }
+        self.documents[article.id] = (article.user_id, values)
+        for field, field_values in values.items():
+            field_index = self.fields.get((article.user_id, field))
+            if field_index is None:
+                field_index = self.fields[(article.user_id, field)] = _FieldIndex()
+            for value in field_values:
+                field_index.add(str(value))
+
+    def _remove(self, article_id):
+        """Uncount a previously indexed article's values."""
+        document = self.documents.pop(article_id, None)
+        if document is None:
+            return
+        user_id, values = document
+        for field, field_values in values.items():
+            field_index = self.fields[(user_id, field)]
+            for value in field_values:
+                field_index.discard(str(value))
+            if not field_index.values:
+                del self.fields[(user_id, field)]
+
+    def suggest(self, user_id, field, prefix, limit):
+        """
+        Suggest values of a field from a user's library.
+
+        **Parameters:**
+            - `user_id`: int - The user whose library is used.
+            - `field`: str - One of `SUGGEST_FIELDS`.
+            - `prefix`: str - The text typed so far; matches the start of any word of a value.
+            - `limit`: int - Maximum number of suggestions.
+
+        **Returns:**
+            - A list of `{"value", "count"}` dictionaries, most frequent first.
+        """
+        prefix = normalize(prefix)
+        with self.lock:
+            field_index = self.fields.get((user_id, field))
+            if field_index is None or not prefix:
+                return []
+            return field_index.suggest(prefix, limit)
+
+    def stats(self):
+        """Return the size of the index."""
+        with self.lock:
+            return {
+                "articles": len(self.documents),
+                "values": sum(len(field_index.values) for field_index in self.fields.values()),
+                "words": sum(len(field_index.postings) for field_index in self.fields.values())
+            }
@@ -0,0 +1,186 @@
+import inspect  # Import inspect to reach the views behind their JWT decorator
+import threading  # Import threading to create the worker pool once
+from concurrent.futures import ThreadPoolExecutor  # Import ThreadPoolExecutor to run reads concurrently
+
+from flask import current_app, g, request  # Import Flask helpers to dispatch sub-requests
+from flask_jwt_extended import get_jwt_identity, jwt_required  # Import the JWT helpers to skip the token check
+from werkzeug.exceptions import HTTPException  # Import HTTPException for routing errors
+from werkzeug.test import EnvironBuilder  # Import EnvironBuilder to build the environment of a sub-request
+
+from app.config import Config  # Import the configuration settings
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+from app.utils.rate_limiting import check_rate_limit  # Import the rate limit check of dispatched requests
+from app.utils.schema import ValidationError  # Import ValidationError to report invalid sub-requests
+
+BATCH_BLUEPRINTS = ('article', 'user')  # Blueprints whose routes can be called in a batch
+# Session endpoints (which check their own credentials or token type) and file uploads are not batched
+EXCLUDED_ENDPOINTS = ('user.register', 'user.login', 'user.refresh', 'user.logout', 'article.import_articles')
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+SUB_REQUEST_HEADERS = ('Idempotency-Key',)  # Headers a sub-request may set for its view
+RESULT_HEADERS = ('Location', 'Retry-After', 'Idempotent-Replayed')  # Response headers kept in the results
+# The code of every `jwt_required` wrapper (they are closures of the same function), to recognize that layer
+JWT_WRAPPER_CODE = jwt_required()(lambda: None).__code__
+JWT_ATTRIBUTES = ('_jwt_extended_jwt', '_jwt_extended_jwt_header', '_jwt_extended_jwt_location',
+                  '_jwt_extended_jwt_user')  # Where flask_jwt_extended keeps the verified token
+
+_executor = None  # Worker threads running concurrent reads, created on first use
+_executor_lock = threading.Lock()
+
+
+def _reset_executor():
+    """Forget the worker threads, which do not survive a fork."""
+    global _executor, _executor_lock
+    _executor, _executor_lock = None, threading.Lock()
+
+
+register_after_fork(_reset_executor)
+
+
+def _get_executor():
+    """Return the worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Config.BATCH_WORKERS, thread_name_prefix='batch')
+    return _executor
+
+
+def validate_batch(data):
+    """
+    Validate the body of a batch request (a validator for `validate_json`).
+
+    **Returns:**
+        - The list of sub-requests, as `(method, path, body)` tuples.
+
+    **Raises:**
+        - `ValidationError`: If the body or a sub-request is invalid.
+    """
+    if not isinstance(data, dict) or 'requests' not in data:
+        raise ValidationError({"requests": "is required"})
+    sub_requests = data['requests']
+    if not isinstance(sub_requests, list):
+        raise ValidationError({"requests": "must be an array"})
+    if not 1 <= len(sub_requests) <= Config.BATCH_MAX_REQUESTS:
+        raise ValidationError({"requests": f"must have between 1 and {Config.BATCH_MAX_REQUESTS} items"})
+
+    errors = {}
+    for index, sub_request in enumerate(sub_requests):
+        field = f"requests[{index}]"
+        if not isinstance(sub_request, dict):
+            errors[field] = "must be an object"
+        elif sub_request.get('method', 'GET') not in METHODS:
+            errors[f"{field}.method"] = f"must be one of {', '.join(METHODS)}"
+        elif not isinstance(sub_request.get('path'), str) or not sub_request['path'].startswith('/api/'):
+            errors[f"{field}.path"] = "must be a path starting with /api/"
+        elif sub_request.get('body') is not None and not isinstance(sub_request['body'], (dict, list)):
+            errors[f"{field}.body"] = "must be an object or an array"
+        elif not isinstance(sub_request.get('headers', {}), dict) \
+                or not set(sub_request.get('headers', {})) <= set(SUB_REQUEST_HEADERS) \
+                or not all(isinstance(value, str) for value in sub_request.get('headers', {}).values()):
+            errors[f"{field}.headers"] = f"must be an object of strings with only {', '.join(SUB_REQUEST_HEADERS)}"
+    if errors:
+        raise ValidationError(errors)
+    return [(sub_request.get('method', 'GET'), sub_request['path'], sub_request.get('body'),
+             sub_request.get('headers', {})) for sub_request in sub_requests]
+
+
+def run_batch(sub_requests):
+    """
+    Run the sub-requests of a batch and return their results, in order.
+
+    Sub-requests run in order, except that consecutive reads (GET) run concurrently: the first one
+    in the current thread, with the connection already bound to the request, and the others on
+    worker threads. A write waits for the reads before it and runs before the requests after it,
+    so later sub-requests see its effects.
+
+    The JWT of the batch request has been verified once: the views are called without their
+    `jwt_required` decorator, with the verified token in `g`, so it is not decoded again. Their
+    other decorators still run (e.g. `idempotent`, for sub-requests with an `Idempotency-Key`).
+    The application's request hooks run for the batch request only: each sub-request is counted
+    against its route's rate limit here, and shares the batch request's deadline.
+
+    **Returns:**
+        - A list of `{"status": int, "body": ...}` results (with `headers` for Location, Retry-After
+          and Idempotent-Replayed).
+    """
+    app = current_app._get_current_object()
+    jwt_state = {name: g.get(name) for name in (*JWT_ATTRIBUTES, 'deadline')}  # Sub-requests share the deadline
+    context = {'base_url': request.host_url, 'headers': {'Authorization': request.headers.get('Authorization', '')}}
+    client_key = f"user:{get_jwt_identity()}"  # Sub-requests count against the caller's rate limits
+
+    results = [None] * len(sub_requests)
+    index = 0
+    while index < len(sub_requests):
+        end = index + 1
+        if sub_requests[index][0] == 'GET':
+            while end < len(sub_requests) and sub_requests[end][0] == 'GET':
+                end += 1  # Gather the consecutive reads
+        futures = [(position, _get_executor().submit(_run_in_worker, app, jwt_state, client_key,
+                                                             context, sub_requests[position]))
+                   for position in range(index + 1, end)]
+        results[index] = _dispatch(app, client_key, context, *sub_requests[index])
+        for position, future in futures:
+            results[position] = future.result()
+        index = end
+    return results
+
+
+def _run_in_worker(app, jwt_state, client_key, context, sub_request):
+    """Run a sub-request on a worker thread, in its own application context with the batch's token."""
+    with app.app_context():  # Its teardown returns the worker's connections to the pool
+        for name, value in jwt_state.items():
+            setattr(g, name, value)
+        return _dispatch(app, client_key, context, *sub_request)
+
+
+def _dispatch(app, client_key, context, method, path, body, headers):
+    """Route a sub-request to its view and run it in a request context of its own."""
+    path, _, query_string = path.partition('?')
+    builder = EnvironBuilder(path=path, query_string=query_string, method=method, json=body,
+                             base_url=context['base_url'], headers={**context['headers'], **headers})
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    try:
+        endpoint, view_args = app.url_map.bind_to_environ(environ).match()
+        if endpoint.split('.')[0] not in BATCH_BLUEPRINTS or endpoint in EXCLUDED_ENDPOINTS:
+            return _error(404, f"{method} {path} cannot be called in a batch.")
+        limited = check_rate_limit(endpoint, method, client_key)  # Each sub-request counts against its route class
+        if limited is not None:
+            return _result(limited)
+
+        view = _without_jwt(app.view_functions[endpoint])  # The token was verified by the batch request
+        # The request context shares the application context (`g`, the thread's connections) of the caller
+        with app.request_context(environ):
+            return _result(app.make_response(view(**view_args)))
+    except HTTPException as e:
+        return _error(e.code, e.description)
+    except Exception as e:  # Views handle their own errors; anything else is reported for this sub-request only
+        return _error(500, str(e))
+
+
+def _without_jwt(view):
+    """
+    Return a view without its outer `jwt_required` decorator, keeping the decorators below it.
+
+    Views decorated otherwise are returned as they are, and verify the token themselves. The views
+    requiring another kind of token (e.g. a refresh token) are among the excluded endpoints.
+    """
+    return inspect.unwrap(view, stop=lambda function: getattr(function, '__code__', None) is not JWT_WRAPPER_CODE)
+
+
+def _result(response):
+    """Convert the response of a sub-request into its batch result."""
+    result = {"status": response.status_code, "body": response.get_json(silent=True)}
+    headers = {name: response.headers[name] for name in RESULT_HEADERS if name in response.headers}
+    if headers:
+        result["headers"] = headers
+    return result
+
+
+def _error(status, message):
+    """Build the batch result of a sub-request that could not be run."""
+    return {"status": status, "body": {"status": "error", "message": message}}
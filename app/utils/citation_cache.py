@@ -0,0 +1,83 @@
+import threading  # Import threading to share the cache between request threads
+import time  # Import time to expire entries
+from collections import OrderedDict  # Import OrderedDict to keep the entries in LRU order
+
+
+class CitationCache:
+    """
+    A cache of citation neighborhoods (traversal results), least recently used first out.
+
+    Each entry remembers the articles its traversal reached. A change to the citations of an
+    article invalidates every entry that reached it, which covers every neighborhood the change
+    can alter: a new or removed edge only matters to traversals that expanded one of its ends.
+    Entries also expire after `ttl` seconds, which bounds how long a change made by another
+    process (whose invalidations this process does not see) can go unnoticed.
+    """
+
+    def __init__(self, capacity, ttl):
+        self.capacity = capacity  # Maximum number of entries (0 disables the cache)
+        self.ttl = ttl  # Seconds an entry is served for
+        self.hits = 0
+        self.misses = 0
+        self.reset()
+
+    def reset(self):
+        """Forget every entry."""
+        self.entries = OrderedDict()  # key -> (expires_at, article IDs reached, value)
+        self.keys_by_article = {}  # article ID -> keys of the entries that reached it
+        self.version = 0  # Incremented by every invalidation
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value of a key, or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, article_ids, value, version):
+        """
+        Cache a value computed from the given articles' citations.
+
+        `version` is the cache version read before computing the value: if an invalidation happened
+        since, the value may predate it and is not cached.
+        """
+        if not self.capacity:
+            return
+        with self.lock:
+            if version != self.version:
+                return
+            self._discard(key)
+            self.entries[key] = (time.monotonic() + self.ttl, article_ids, value)
+            for article_id in article_ids:
+                self.keys_by_article.setdefault(article_id, set()).add(key)
+            while len(self.entries) > self.capacity:
+                self._discard(next(iter(self.entries)))
+
+    def invalidate(self, article_ids):
+        """Drop the entries that reached any of the given articles, whose citations have changed."""
+        with self.lock:
+            self.version += 1
+            for article_id in article_ids:
+                for key in list(self.keys_by_article.get(article_id, ())):
+                    self._discard(key)
+
+    def _discard(self, key):
+        """Remove an entry and its article references (the caller holds the lock)."""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for article_id in entry[1]:
+            keys = self.keys_by_article.get(article_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.keys_by_article[article_id]
+
+    def stats(self):
+        """Return the number of entries, hits and misses of the cache."""
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,161 @@
+import gzip  # Import gzip for the universally supported content encoding
+import hashlib  # Import hashlib to key the compressed response cache by content digest
+import threading  # Import threading to guard the shared cache
+from collections import OrderedDict  # Import OrderedDict to implement the LRU cache
+
+from flask import request  # Import the request object to negotiate the encoding
+
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+
+try:
+    import zstandard  # Optional faster encoding, used when the package is installed
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Content types worth compressing (JSON, text and other textual formats)
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/javascript', 'application/xml', 'text/')
+
+
+class CompressedResponseCache:
+    """
+    A thread-safe LRU cache of compressed response bodies, bounded by total size in bytes.
+
+    Entries are keyed by a digest of the uncompressed body and the encoding, so identical hot
+    responses (e.g. the same list requested repeatedly) are only compressed once.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes  # Maximum total size of the cached compressed bodies
+        self.size = 0  # Current total size of the cached compressed bodies
+        self.entries = OrderedDict()  # (digest, encoding) -> compressed bytes, in LRU order
+        self.lock = threading.Lock()
+        register_after_fork(self._reset)  # Each worker process warms its own cache
+
+    def _reset(self):
+        """Empty the cache and replace its lock, which may have been held when the process forked."""
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def get(self, key):
+        """Return the cached compressed body for the key, or None."""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)  # Mark as most recently used
+            return value
+
+    def put(self, key, value):
+        """Store a compressed body, evicting the least recently used entries when over budget."""
+        if len(value) > self.max_bytes:
+            return  # Never cache a body larger than the whole budget
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)  # Evict the least recently used entry
+                self.size -= len(evicted)
+
+    def clear(self):
+        """Remove every cached body."""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+def init_compression(app):
+    """
+    Register response compression on the Flask application.
+
+    Responses are compressed with zstd (when the `zstandard` package is installed and the client
+    accepts it) or gzip, negotiated via the `Accept-Encoding` header. Responses smaller than
+    `COMPRESSION_MIN_SIZE` are sent as-is.
+
+    **Parameters:**
+        - `app`: The Flask application.
+    """
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+
+    cache = CompressedResponseCache(app.config.get('COMPRESSION_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    app.extensions['compression_cache'] = cache
+
+    @app.after_request
+    def compress_response(response):
+        """Compress the response body if the client accepts a supported encoding."""
+        return compress(response, app.config, cache)
+
+
+def choose_encoding(accept_encodings):
+    """
+    Choose the content encoding to use for a response.
+
+    **Parameters:**
+        - `accept_encodings`: The parsed `Accept-Encoding` header (`request.accept_encodings`).
+
+    **Returns:**
+        - `'zstd'`, `'gzip'` or None when no supported encoding is accepted.
+    """
+    if zstandard is not None and accept_encodings.quality('zstd') > 0:
+        return 'zstd'  # Prefer zstd: it compresses faster than gzip at a similar ratio
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress(response, config, cache):
+    """
+    Compress a response in place when it is eligible.
+
+    **Parameters:**
+        - `response`: The Flask response object.
+        - `config`: The application configuration.
+        - `cache`: The `CompressedResponseCache` holding previously compressed bodies.
+
+    **Returns:**
+        - The (possibly compressed) response.
+    """
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+            or response.status_code in (204, 206, 304) or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(COMPRESSIBLE_MIMETYPES)):
+        return response
+
+    response.vary.add('Accept-Encoding')  # Caches must key on the negotiated encoding
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < config.get('COMPRESSION_MIN_SIZE', 1024):
+        return response  # Small bodies are not worth the CPU or the framing overhead
+
+    key = (hashlib.blake2b(data, digest_size=16).digest(), encoding)
+    compressed = cache.get(key)
+    if compressed is None:
+        level = config.get('COMPRESSION_ZSTD_LEVEL' if encoding == 'zstd' else 'COMPRESSION_LEVEL')
+        compressed = compress_bytes(data, encoding, level)
+        cache.put(key, compressed)
+
+    response.set_data(compressed)  # Also updates the Content-Length header
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def compress_bytes(data, encoding, level):
+    """
+    Compress bytes with the given encoding.
+
+    **Parameters:**
+        - `data`: bytes - The uncompressed body.
+        - `encoding`: str - `'zstd'` or `'gzip'`.
+        - `level`: int - The compression level (1-9 for gzip, 1-22 for zstd).
+
+    **Returns:**
+        - The compressed bytes.
+    """
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level, mtime=0)  # A fixed mtime keeps the output deterministic
@@ -0,0 +1,174 @@
+import os  # Import os to hook process forks
+import threading  # Import threading to bind connections to threads
+import time  # Import time to decide when an idle connection needs a ping
+import weakref  # Import weakref so that fork callbacks do not keep objects alive
+
+import mysql.connector  # Import the MySQL connector library to interact with the MySQL database
+from mysql.connector import Error as MySQLError  # Import MySQLError to discard broken connections
+
+from app.config import Config  # Import the configuration settings
+from app.utils.statement_cache import StatementCache  # Import the per-connection prepared statement cache
+
+_local = threading.local()  # name -> (connection, cursor, statements) bound to the current thread
+_idle = {}  # name -> list of (connection, cursor, statements, released_at) ready to be reused
+_lock = threading.Lock()  # Guards the idle lists
+_inherited = []  # State inherited from the parent process, kept referenced so it is never closed
+_after_fork_callbacks = []  # Callables (or weak methods) run in a child process after a fork
+
+
+def connect(**options):
+    """
+    Open a new MySQL connection using the parameters from the Config class.
+
+    **Parameters:**
+        - `options`: Extra `mysql.connector.connect` arguments (e.g. `autocommit=True`), which may
+          also override the configured ones (e.g. `database` for a shard).
+
+    **Returns:**
+        - A new MySQL connection.
+    """
+    return mysql.connector.connect(**{
+        'host': Config.MYSQL_HOST,  # Database host
+        'port': Config.MYSQL_PORT,  # Database port
+        'user': Config.MYSQL_USER,  # Database user
+        'password': Config.MYSQL_PASSWORD,  # Database password
+        'database': Config.MYSQL_DATABASE,  # Database name
+        **options
+    })
+
+
+def get_connection(name='default', **options):
+    """
+    Return the connection of the current thread, taking one from the pool on first use.
+
+    Connections are bound to a thread until `release_connections` is called (at the end of each
+    request and background job), so a connection is never used by two threads at once. Separate
+    names give a thread separate connections, e.g. one in autocommit mode.
+    """
+    return _bind(name, options)[0]
+
+
+def get_cursor(name='default', **options):
+    """Return the cursor of the current thread's connection; see `get_connection`."""
+    return _bind(name, options)[1]
+
+
+def get_statements(name='default', **options):
+    """Return the prepared statement cache (StatementCache) of the current thread's connection."""
+    return _bind(name, options)[2]
+
+
+def _bind(name, options):
+    """Bind a pooled or new connection to the current thread."""
+    bound = getattr(_local, name, None)
+    if bound is not None:
+        return bound
+
+    bound = None
+    with _lock:
+        idle = _idle.get(name)
+        if idle:
+            connection, cursor, statements, released_at = idle.pop()  # Most recently used, likely still alive
+            bound = (connection, cursor, statements)
+    if bound is not None and time.monotonic() - released_at > Config.DB_POOL_PING_AFTER:
+        try:
+            bound[0].ping(reconnect=True, attempts=1)  # The server may have closed an idle connection
+            statements = bound[2]
+            statements.cursor = bound[0].cursor()  # A reconnected session needs a new cursor
+            bound = (bound[0], statements.cursor, statements)  # Its statements are prepared again on use
+        except MySQLError:
+            _close(bound[0])
+            bound = None
+    if bound is None:
+        connection = connect(**options)
+        cursor = connection.cursor()
+        bound = (connection, cursor, StatementCache(connection, cursor, Config.DB_STATEMENT_CACHE_SIZE))
+    setattr(_local, name, bound)
+    return bound
+
+
+def release_connections():
+    """
+    Return the connections bound to the current thread to the pool.
+
+    Any transaction left open is rolled back, which also ends the read snapshot of the connection
+    so the next user sees fresh data. At most `DB_POOL_MAX_IDLE` connections per name are kept.
+    """
+    for name, (connection, cursor, statements) in list(vars(_local).items()):
+        delattr(_local, name)
+        try:
+            connection.rollback()
+        except MySQLError:
+            _close(connection)  # E.g. unread results or a lost connection; do not reuse it
+            continue
+        with _lock:
+            idle = _idle.setdefault(name, [])
+            if len(idle) < Config.DB_POOL_MAX_IDLE:
+                idle.append((connection, cursor, statements, time.monotonic()))
+                continue
+        _close(connection)
+
+
+def close_connections():
+    """Close the idle connections of this process and the ones bound to the current thread."""
+    release_connections()
+    with _lock:
+        idle = [entry for entries in _idle.values() for entry in entries]
+        _idle.clear()
+    for connection, _, _, _ in idle:
+        _close(connection)
+
+
+def _close(connection):
+    """Close a connection, ignoring errors."""
+    try:
+        connection.close()
+    except MySQLError:
+        pass
+
+
+def register_after_fork(callback):
+    """
+    Run `callback()` in child processes after a fork, e.g. to recreate locks and drop caches.
+
+    Bound methods are held weakly, so registering does not keep their object alive.
+    """
+    if hasattr(callback, '__self__'):
+        callback = weakref.WeakMethod(callback)
+    _after_fork_callbacks.append(callback)
+
+
+def _after_fork_in_child():
+    """Forget the connections and locks inherited from the parent process."""
+    global _local, _idle, _lock
+
+    # The parent keeps using these sockets. Closing them here would send a quit command on the
+    # parent's sessions, so the child only drops them (and keeps them referenced, so they are not
+    # closed on garbage collection either).
+    _inherited.append((_local, _idle))
+    _local, _idle, _lock = threading.local(), {}, threading.Lock()
+
+    for callback in list(_after_fork_callbacks):
+        if isinstance(callback, weakref.WeakMethod):
+            callback = callback()
+            if callback is None:
+                continue
+        callback()
+
+
+if hasattr(os, 'register_at_fork'):  # Not available on Windows, which cannot fork
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def init_database(app):
+    """
+    Return the connections used by each request to the pool when the request ends.
+
+    **Parameters:**
+        - `app`: The Flask application.
+    """
+
+    @app.teardown_appcontext
+    def release_request_connections(exception=None):
+        """Release the connections bound to the request's thread."""
+        release_connections()
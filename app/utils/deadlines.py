@@ -0,0 +1,243 @@
+import heapq  # Import heapq to order the watched statements by deadline
+import itertools  # Import itertools to break ties between equal deadlines
+import logging  # Import logging to report statements that could not be interrupted
+import math  # Import math to round time limits up
+import re  # Import re to add the execution time hint to SELECT statements
+import threading  # Import threading to run the watchdog
+import time  # Import time to measure deadlines
+from contextlib import contextmanager  # Import contextmanager to guard blocks of statements
+
+from flask import g, jsonify, request  # Import Flask helpers to set the deadline of each request
+from mysql.connector import Error as MySQLError  # Import MySQLError to recognize interrupted statements
+from werkzeug.exceptions import GatewayTimeout  # Import GatewayTimeout for requests past their deadline
+
+from app.utils.database import connect, get_connection, get_cursor, register_after_fork
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'X-Request-Timeout'
+SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+# MySQL errors of a statement stopped by MAX_EXECUTION_TIME (3024) or by KILL QUERY (1317)
+INTERRUPTED_ERRORS = (3024, 1317)
+
+
+class DeadlineExceeded(GatewayTimeout):
+    """Raised when a request runs past its deadline; answered with `504 Gateway Timeout`."""
+
+    description = "The request did not complete within its deadline."
+
+
+class Deadline:
+    """The point in time by which a request must be answered."""
+
+    def __init__(self, timeout):
+        self.timeout = timeout  # Seconds the request was given
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self):
+        """Return the seconds left (negative once the deadline has passed)."""
+        return self.expires_at - time.monotonic()
+
+    def check(self):
+        """
+        Check that the deadline has not passed.
+
+        **Raises:**
+            - `DeadlineExceeded`: If it has.
+        """
+        if self.remaining() <= 0:
+            raise DeadlineExceeded()
+
+
+class QueryWatchdog:
+    """
+    Interrupts statements still running at their deadline.
+
+    A single background thread sleeps until the earliest deadline of the watched statements, and
+    runs `KILL QUERY` for a statement that has not finished by then, from a separate connection.
+    This bounds the wait on the client side too, whatever the statement (the server-side hint only
+    applies to SELECTs), and the interrupted connection stays usable and goes back to the pool.
+    """
+
+    def __init__(self):
+        self.counter = itertools.count()
+        self._reset()
+        register_after_fork(self._reset)
+
+    def _reset(self):
+        """Forget the watched statements and the thread, which do not exist in a forked child."""
+        self.heap = []  # [expires_at, sequence, connection_id, options, state] entries
+        self.thread = None
+        self.condition = threading.Condition()
+
+    def watch(self, expires_at, connection_id, options):
+        """Watch a statement running on a connection; returns the entry to pass to `finish`."""
+        entry = [expires_at, next(self.counter), connection_id, options, 'running']
+        with self.condition:
+            heapq.heappush(self.heap, entry)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='query-watchdog', daemon=True)
+                self.thread.start()
+            self.condition.notify()  # The new entry may be the earliest
+        return entry
+
+    def finish(self, entry):
+        """
+        Stop watching a statement that returned.
+
+        If it is being interrupted, wait for the `KILL QUERY` to complete, so it cannot reach the
+        next statement of the connection.
+        """
+        with self.condition:
+            while entry[4] == 'killing':
+                self.condition.wait()
+            entry[4] = 'finished'
+
+    def _run(self):
+        """Interrupt the statements whose deadline passes, forever."""
+        while True:
+            with self.condition:
+                while not self.heap or self.heap[0][4] == 'finished':
+                    if self.heap:
+                        heapq.heappop(self.heap)  # Returned in time
+                    else:
+                        self.condition.wait()
+                delay = self.heap[0][0] - time.monotonic()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                entry = heapq.heappop(self.heap)
+                entry[4] = 'killing'
+            try:
+                self._kill(entry[2], entry[3])
+            except MySQLError:
+                logger.exception("Could not interrupt statement of connection %s", entry[2])
+            finally:
+                with self.condition:
+                    entry[4] = 'killed'
+                    self.condition.notify_all()
+
+    @staticmethod
+    def _kill(connection_id, options):
+        """Interrupt the statement running on a connection, from a new connection to the same server."""
+        connection = connect(**options)
+        try:
+            cursor = connection.cursor()
+            cursor.execute("KILL QUERY %s", (connection_id,))
+            cursor.close()
+        finally:
+            connection.close()
+
+
+watchdog = QueryWatchdog()
+
+
+@contextmanager
+def enforce(name, options, deadline):
+    """
+    Interrupt the statements run in the block on the current thread's connection at a deadline.
+
+    The watchdog interrupts a statement still running (or whose rows are still being read) when the
+    deadline passes, whatever the statement, e.g. a prepared lookup.
+
+    **Parameters:**
+        - `name`, `options`: The connection of the current thread used in the block (see `get_connection`).
+        - `deadline`: The Deadline of the request, or None for no limit.
+
+    **Raises:**
+        - `DeadlineExceeded`: If the deadline passed before or while a statement of the block ran.
+    """
+    if deadline is None:
+        yield
+        return
+    deadline.check()
+    entry = watchdog.watch(deadline.expires_at, get_connection(name, **options).connection_id, options)
+    try:
+        yield
+    except MySQLError as e:
+        if e.errno in INTERRUPTED_ERRORS:
+            raise DeadlineExceeded() from e
+        raise
+    finally:
+        watchdog.finish(entry)
+
+
+def fetch_all(name, options, query, params, deadline=None):
+    """
+    Run a query on the current thread's connection and return all its rows, within a deadline.
+
+    With a deadline, the time left is enforced twice: on the server, with a `MAX_EXECUTION_TIME`
+    optimizer hint on SELECT statements, and on the client, by the watchdog (see `enforce`).
+
+    **Parameters:**
+        - `name`, `options`: The connection of the current thread to use (see `get_connection`).
+        - `query`, `params`: The statement and its parameters.
+        - `deadline`: The Deadline of the request, or None for no limit.
+
+    **Returns:**
+        - The rows of the result.
+
+    **Raises:**
+        - `DeadlineExceeded`: If the deadline passed before or while the statement ran.
+    """
+    cursor = get_cursor(name, **options)
+    if deadline is not None:
+        remaining = max(deadline.remaining(), 0.001)  # `enforce` raises if it has passed
+        query = SELECT.sub(f"SELECT /*+ MAX_EXECUTION_TIME({math.ceil(remaining * 1000)}) */", query, count=1)
+    with enforce(name, options, deadline):
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+
+def parse_timeouts(value):
+    """
+    Parse per-endpoint timeouts in the form `"article.search_articles=5,article.get_articles=10"`.
+
+    **Returns:**
+        - A dictionary mapping each endpoint to its timeout in seconds.
+
+    **Raises:**
+        - `ValueError`: If the value is malformed.
+    """
+    timeouts = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        endpoint, _, seconds = item.partition('=')
+        timeouts[endpoint.strip()] = float(seconds)
+    return timeouts
+
+
+def current_deadline():
+    """Return the Deadline of the current request, or None if it has none."""
+    return g.get('deadline')
+
+
+def init_deadlines(app):
+    """
+    Give each request a deadline.
+
+    The timeout is `REQUEST_TIMEOUT` seconds, or the one set for the endpoint in `REQUEST_TIMEOUTS`;
+    clients may ask for another one (up to `REQUEST_MAX_TIMEOUT`) in the `X-Request-Timeout` header.
+    Routes pass the deadline (`current_deadline()`) to the services, which pass it to the queries.
+
+    **Parameters:**
+        - `app`: The Flask application.
+    """
+    default = app.config.get('REQUEST_TIMEOUT', 0)
+    timeouts = parse_timeouts(app.config.get('REQUEST_TIMEOUTS', ''))
+    maximum = app.config.get('REQUEST_MAX_TIMEOUT', 0)
+
+    @app.before_request
+    def set_deadline():
+        """Start the request's deadline (before it waits for admission, which counts against it)."""
+        timeout = timeouts.get(request.endpoint, default)
+        requested = request.headers.get(HEADER)
+        if requested is not None:
+            try:
+                timeout = float(requested)
+            except ValueError:
+                timeout = -1
+            if not 0 < timeout <= maximum:
+                return jsonify({"status": "error",
+                                "message": f"{HEADER} must be a number of seconds between 0 and {maximum:g}."}), 400
+        if timeout > 0:
+            g.deadline = Deadline(timeout)
@@ -0,0 +1,40 @@
+import threading  # Import threading to refresh the set safely
+import time  # Import time to decide when the set needs a refresh
+
+
+class DeletedUsers:
+    """
+    The IDs of the users being deleted, as seen by this process.
+
+    A deleted user's articles stay in the database until the background purge removes them, and
+    must not be served meanwhile. The set is loaded with `loader()` (the users marked deleted) and
+    refreshed at most every `refresh_interval` seconds, so users deleted through another process
+    are hidden within that delay; users deleted through this process are added right away.
+    """
+
+    def __init__(self, loader, refresh_interval):
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.user_ids = frozenset()
+        self.loaded_at = None
+        self.lock = threading.Lock()
+
+    def ids(self):
+        """Return the IDs of the users being deleted."""
+        now = time.monotonic()
+        if self.loaded_at is not None and now - self.loaded_at < self.refresh_interval:
+            return self.user_ids
+        with self.lock:
+            if self.loaded_at is None or now - self.loaded_at >= self.refresh_interval:
+                self.user_ids = frozenset(self.loader())
+                self.loaded_at = now
+            return self.user_ids
+
+    def add(self, user_id):
+        """Hide a user deleted through this process right away."""
+        with self.lock:
+            self.user_ids = self.user_ids | {user_id}
+
+    def reset_lock(self):
+        """Replace the lock, which may be held by a thread that does not exist in a forked child."""
+        self.lock = threading.Lock()
@@ -3,9 +3,18 @@ import re  # Import the re module for regular expression operations
 
 from flask import jsonify  # Import jsonify to create JSON responses for Flask
 from mysql.connector import Error as MySQLError  # Import MySQLError to handle MySQL-specific errors
-from werkzeug.exceptions import BadRequest, Unauthorized, NotFound
+from werkzeug.exceptions import BadRequest, Unauthorized, NotFound, HTTPException
 from werkzeug.exceptions import Conflict  # Import Conflict to handle conflicts (like duplicates) in requests
 
+from app.utils.schema import ValidationError  # Import ValidationError to report invalid fields
+
+DUPLICATE_ENTRY = 1062  # MySQL error of an insert or update violating a unique index
+
+
+def is_duplicate_entry(e):
+    """Return whether an exception is a MySQL error raised by a row violating a unique index."""
+    return isinstance(e, MySQLError) and e.errno == DUPLICATE_ENTRY
+
 
 def handle_common_exceptions(e):
     """
@@ -18,16 +27,21 @@ def handle_common_exceptions(e):
         - Flask response object with a JSON error message and an appropriate HTTP status code.
 
     **Exceptions handled:**
+        - `ValidationError`: For payloads that do not match their schema, returns a 400 status with the
+          error of each field.
         - `ValueError`: For invalid input or missing fields, returns a 400 status.
         - `Conflict`: For conflicts like duplicate records, returns a 409 status.
         - `MySQLError`: For MySQL-related issues, calls a specific MySQL error handler.
         - `BadRequest`: For JSON decoding errors, returns a 400 status.
         - `Unauthorized`: For unauthorized access (e.g., incorrect password), returns a 401 status.
         - `NotFound`: For resources not found, returns a 404 status.
+        - `HTTPException`: For other HTTP errors (e.g. 503 Service Unavailable), returns their status code.
         - `Exception`: For other uncaught exceptions, returns a 500 status indicating a server error.
     """
     if isinstance(e, BadRequest):  # Catch BadRequest for JSON decoding errors
         return jsonify({"status": "error", "message": "Invalid JSON payload."}), 400
+    elif isinstance(e, ValidationError):  # Check if the payload did not match its schema
+        return jsonify({"status": "error", "message": str(e), "errors": e.errors}), 400  # List the invalid fields
     elif isinstance(e, ValueError):  # Check if the exception is a ValueError
         return jsonify({"status": "error", "message": str(e)}), 400  # Return a 400 response with the error message
     elif isinstance(e, Unauthorized):  # Check if the exception is Unauthorized
@@ -38,6 +52,8 @@ def handle_common_exceptions(e):
         return jsonify({"status": "error", "message": str(e)}), 409  # Return a 409 response with the conflict message
     elif isinstance(e, MySQLError):  # Check if the exception is a MySQL error
         return handle_mysql_error(e)  # Call a specific function to handle MySQL errors
+    elif isinstance(e, HTTPException):  # Check if the exception is any other HTTP error
+        return jsonify({"status": "error", "message": e.description}), e.code  # Return its own status code
     else:  # For all other exceptions
         return jsonify({"error": "Internal Server Error", "message": str(e)}), 500  # Return a 500 response
 
@@ -55,6 +71,7 @@ def handle_mysql_error(e):
     **Error handling:**
         - If the error is related to a missing table (errno 1146), and the environment is development,
           it attempts to extract the table name and provide a detailed error message.
+        - If a row violates a unique index (errno 1062), it returns a 409 Conflict response.
         - For other errors, it returns a generic 500 Internal Server Error response.
     """
     if e.errno == 1146:  # Check if the MySQL error code indicates a missing table
@@ -64,6 +81,8 @@ def handle_mysql_error(e):
                 "status": "error",  # Return an error status
                 "message": f"A database table '{table_name}' is missing. Please check your database setup."
             }), 500  # Return a 500 response with the error message
+    if e.errno == DUPLICATE_ENTRY:  # Check if a unique index rejected the row (e.g. a concurrent duplicate)
+        return jsonify({"status": "error", "message": "This record already exists."}), 409
     return jsonify({"status": "error", "message": "Internal Server Error"}), 500  # Return a generic 500 error response
 
 
@@ -80,22 +99,3 @@ def extract_table_name(error_message):
     match = re.search(r"Table '.*?\.(.*?)' doesn't exist", error_message)  # Use regex to find the table name
     return match.group(1) if match else "unknown_table"  # Return the table name if matched, else return "unknown_table"
 
-
-def validate_array_field(field, field_name):
-    """
-    Validate that a given field is an array.
-
-    **Parameters:**
-        - `field`: The field to be validated (expected to be a list).
-        - `field_name`: The name of the field, used in the error message.
-
-    **Returns:**
-        - The field if it is a list.
-
-    **Raises:**
-        - `ValueError`: If the field is not a list.
-    """
-    if isinstance(field, list):  # Check if the field is a list
-        return field  # Return the field if it is a list
-    else:  # If the field is not a list
-        raise ValueError(f"{field_name} must be an array.")  # Raise an error indicating the field must be an array
@@ -0,0 +1,113 @@
+import threading  # Import threading to gather concurrent writes
+
+from app.utils.database import register_after_fork  # Import the fork hook to recreate the lock
+
+
+class _Entry:
+    """One caller's write in a group, with its outcome."""
+
+    __slots__ = ('operation', 'result', 'error')
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.result = None
+        self.error = None
+
+
+class _Group:
+    """The writes gathered for one transaction."""
+
+    __slots__ = ('entries', 'full', 'done')
+
+    def __init__(self):
+        self.entries = []
+        self.full = threading.Event()  # Set when the group reaches the maximum size
+        self.done = threading.Event()  # Set when the group's transaction has ended
+
+
+class GroupCommit:
+    """
+    Commits concurrent writes together, so that many small transactions share one commit (and one
+    disk flush on the database server).
+
+    The first caller of a group becomes its leader: it waits up to `window` seconds (or until
+    `max_size` writes have joined), then runs every write of the group on its own connection in a
+    single transaction and commits it. Each write runs inside a savepoint, so a failing write is
+    rolled back alone and its error is raised to its own caller, while the others are committed.
+    Every caller blocks until the commit, so writes stay synchronous for the client.
+    """
+
+    def __init__(self, window, max_size):
+        self.window = window  # Seconds a leader waits for other writes to join
+        self.max_size = max_size  # Writes per transaction
+        self._reset()
+        register_after_fork(self._reset)
+
+    def _reset(self):
+        """Forget the groups being gathered, e.g. after a fork."""
+        self.groups = {}  # key -> _Group still accepting writes
+        self.lock = threading.Lock()
+
+    def run(self, key, operation, get_connection):
+        """
+        Run a write in the next transaction of a group and return its result once committed.
+
+        **Parameters:**
+            - `key`: Hashable - Writes with the same key share transactions (e.g. the database shard).
+            - `operation`: callable - Performs the write on the current thread's connection, without
+              committing; it may run in another caller's thread.
+            - `get_connection`: callable - Returns the current thread's connection for the key.
+
+        **Raises:**
+            - The exception raised by `operation`, or by the commit of its transaction.
+        """
+        entry = _Entry(operation)
+        with self.lock:
+            group = self.groups.get(key)
+            leader = group is None
+            if leader:
+                group = self.groups[key] = _Group()
+            group.entries.append(entry)
+            if len(group.entries) >= self.max_size:
+                del self.groups[key]  # Later writes start a new group
+                group.full.set()
+
+        if leader:
+            group.full.wait(self.window)
+            with self.lock:
+                if self.groups.get(key) is group:
+                    del self.groups[key]
+            self._commit(group, get_connection())
+        else:
+            group.done.wait()
+
+        if entry.error is not None:
+            raise entry.error
+        return entry.result
+
+    @staticmethod
+    def _commit(group, connection):
+        """Run the writes of a group in one transaction (the caller is the group's leader)."""
+        cursor = connection.cursor()
+        try:
+            for entry in group.entries:
+                cursor.execute("SAVEPOINT group_write")
+                try:
+                    entry.result = entry.operation()
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT group_write")  # Undo this write only
+                    entry.error = e
+                else:
+                    cursor.execute("RELEASE SAVEPOINT group_write")
+            connection.commit()  # One commit for the whole group
+        except Exception as e:
+            try:
+                connection.rollback()
+            except Exception:
+                pass  # The connection is discarded when released; report the original error
+            for entry in group.entries:
+                if entry.error is None:
+                    entry.error = e  # Nothing of the group was committed
+        finally:
+            cursor.close()
+            group.done.set()
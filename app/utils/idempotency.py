@@ -0,0 +1,274 @@
+import hashlib  # Import hashlib to fingerprint request payloads
+import json  # Import the JSON library to pack stored responses
+import secrets  # Import secrets to tell apart the claims of different requests
+import threading  # Import threading to coordinate concurrent duplicates
+import time  # Import time to expire stored responses
+import zlib  # Import zlib to keep stored responses compact
+from collections import OrderedDict  # Import OrderedDict to evict the least recently used responses
+from functools import wraps  # Import wraps to keep the metadata of decorated views
+
+from flask import current_app, jsonify, request  # Import Flask helpers to read requests and build responses
+from flask_jwt_extended import get_jwt_identity  # Import get_jwt_identity to scope keys to their user
+
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+
+try:
+    import redis  # Optional shared backend, used when IDEMPOTENCY_STORAGE_URL is set
+except ImportError:  # pragma: no cover - depends on the environment
+    redis = None
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+STORED_HEADERS = ('Content-Type', 'Location')  # Response headers replayed with the stored response
+PENDING = b'pending:'  # Prefix of the Redis value of a key whose first request is still running
+
+# Extend a claim, or delete it, only while it is still the caller's (it may have expired and been taken)
+REFRESH_CLAIM = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) end return 0"
+RELEASE_CLAIM = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+
+class DuplicateInProgress(Exception):
+    """Raised when the first request with a key is still running after a duplicate has waited for it."""
+
+
+class IdempotencyStore:
+    """
+    An in-process store of the responses of requests made with an Idempotency-Key, with a TTL and
+    least-recently-used eviction.
+
+    Each response is kept as a single compressed bytes object. While the first request with a key
+    is running, duplicates wait for it (on an event) and then get its response.
+    """
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl  # Seconds a response is replayed for
+        self.max_entries = max_entries  # Maximum number of responses kept in memory
+        self.responses = OrderedDict()  # scope -> (expires_at, packed response), in LRU order
+        self._reset()
+        register_after_fork(self._reset)
+
+    def _reset(self):
+        """Forget the requests in flight (they do not exist in a forked child) and replace the lock."""
+        self.running = {}  # scope -> threading.Event set when its first request finishes
+        self.lock = threading.Lock()
+
+    def acquire(self, scope, timeout):
+        """
+        Return the stored response of a key, or None if the caller is the first request with it
+        (and must call `complete` or `abandon`).
+
+        **Raises:**
+            - `DuplicateInProgress`: If the first request is still running after `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                entry = self.responses.get(scope)
+                if entry is not None and entry[0] > time.monotonic():
+                    self.responses.move_to_end(scope)
+                    return entry[1]
+                self.responses.pop(scope, None)  # Expired
+                done = self.running.get(scope)
+                if done is None:
+                    self.running[scope] = threading.Event()
+                    return None
+            if not done.wait(max(0, deadline - time.monotonic())):
+                raise DuplicateInProgress()
+            # The first request finished: replay its response, or run if it was abandoned
+
+    def complete(self, scope, packed):
+        """Store the response of the first request with a key and release its duplicates."""
+        with self.lock:
+            self.responses[scope] = (time.monotonic() + self.ttl, packed)
+            self.responses.move_to_end(scope)
+            while len(self.responses) > self.max_entries:
+                self.responses.popitem(last=False)  # Evict the least recently used response
+            self._release(scope)
+
+    def abandon(self, scope):
+        """Forget a first request that failed, letting a duplicate (or a retry) run instead."""
+        with self.lock:
+            self._release(scope)
+
+    def _release(self, scope):
+        """Wake the duplicates waiting for a key (the caller holds the lock)."""
+        done = self.running.pop(scope, None)
+        if done is not None:
+            done.set()
+
+
+class RedisIdempotencyStore:
+    """
+    A store of idempotent responses shared by every process through Redis.
+
+    The first request with a key claims it with `SET NX`; duplicates poll until the response
+    replaces the claim. The claim expires after `claim_ttl` seconds, so that a key is not blocked
+    forever if its process dies, and a background thread extends the claims of the requests still
+    running every third of that, however long they take (e.g. a large import).
+    """
+
+    def __init__(self, url, ttl, claim_ttl):
+        self.client = redis.Redis.from_url(url)
+        self.ttl_ms = int(ttl * 1000)
+        self.claim_ttl = claim_ttl
+        self.refresh_claim = self.client.register_script(REFRESH_CLAIM)
+        self.release_claim = self.client.register_script(RELEASE_CLAIM)
+        self._reset()
+        register_after_fork(self._reset)
+
+    def _reset(self):
+        """Forget the claims and the refreshing thread, which do not exist in a forked child."""
+        self.claims = {}  # scope -> value of the claim of a request running in this process
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def acquire(self, scope, timeout):
+        """Return the stored response of a key, or None if the caller is the first request; see `IdempotencyStore`."""
+        key = f"idempotency:{scope}"
+        claim = PENDING + secrets.token_hex(8).encode('ascii')
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.client.set(key, claim, nx=True, px=int(self.claim_ttl * 1000)):
+                self._hold(scope, claim)
+                return None
+            packed = self.client.get(key)
+            if packed is not None and not packed.startswith(PENDING):
+                return packed
+            if time.monotonic() >= deadline:
+                raise DuplicateInProgress()
+            time.sleep(0.05)
+
+    def complete(self, scope, packed):
+        """Store the response of the first request with a key."""
+        with self.lock:
+            self.claims.pop(scope, None)
+        self.client.set(f"idempotency:{scope}", packed, px=self.ttl_ms)
+
+    def abandon(self, scope):
+        """Remove the claim of a first request that failed."""
+        with self.lock:
+            claim = self.claims.pop(scope, None)
+        if claim is not None:
+            self.release_claim(keys=[f"idempotency:{scope}"], args=[claim])
+
+    def _hold(self, scope, claim):
+        """Keep extending a claim until the request completes or is abandoned."""
+        with self.lock:
+            self.claims[scope] = claim
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._refresh, name='idempotency-claims', daemon=True)
+                self.thread.start()
+
+    def _refresh(self):
+        """Extend the claims of the running requests, until there are none left."""
+        while True:
+            time.sleep(self.claim_ttl / 3)
+            with self.lock:
+                if not self.claims:
+                    self.thread = None
+                    return
+                claims = list(self.claims.items())
+            for scope, claim in claims:
+                try:
+                    self.refresh_claim(keys=[f"idempotency:{scope}"], args=[claim, int(self.claim_ttl * 1000)])
+                except redis.RedisError:
+                    pass  # Extended at the next round, unless the claim expires first
+
+
+def init_idempotency(app):
+    """
+    Create the store of idempotent responses used by the `idempotent` views.
+
+    **Parameters:**
+        - `app`: The Flask application.
+    """
+    storage_url = app.config.get('IDEMPOTENCY_STORAGE_URL')
+    if storage_url and redis is None:
+        raise RuntimeError("IDEMPOTENCY_STORAGE_URL requires the 'redis' package.")
+    app.extensions['idempotency_store'] = RedisIdempotencyStore(
+        storage_url, app.config['IDEMPOTENCY_TTL'], app.config['IDEMPOTENCY_CLAIM_TTL']
+    ) if storage_url else IdempotencyStore(app.config['IDEMPOTENCY_TTL'], app.config['IDEMPOTENCY_MAX_ENTRIES'])
+
+
+def idempotent(view):
+    """
+    Make a write view idempotent for requests carrying an `Idempotency-Key` header.
+
+    The first response for a key (per user, method and path) is stored for `IDEMPOTENCY_TTL`
+    seconds, and requests repeating the key get it back (with an `Idempotent-Replayed: true`
+    header) without running the view, so retries do no database work. A duplicate arriving while
+    the first request is running waits for it. Server errors (5xx) and rate limiting (429) responses
+    are not stored, so the request can be retried. Reusing a key with a different payload is
+    rejected with `422 Unprocessable Entity`.
+
+    Apply it below `jwt_required`, which identifies the user.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            return jsonify({"status": "error",
+                            "message": f"{HEADER} must have between 1 and {MAX_KEY_LENGTH} characters."}), 400
+
+        store = current_app.extensions['idempotency_store']
+        scope = f"{get_jwt_identity()}:{request.method}:{request.path}:{key}"
+        fingerprint = _fingerprint()
+        try:
+            packed = store.acquire(scope, current_app.config['IDEMPOTENCY_WAIT_TIMEOUT'])
+        except DuplicateInProgress:
+            return jsonify({"status": "error",
+                            "message": f"A request with this {HEADER} is still in progress."}), 409
+
+        if packed is not None:
+            stored_fingerprint, response = _unpack(packed)
+            if stored_fingerprint != fingerprint:
+                return jsonify({"status": "error",
+                                "message": f"This {HEADER} was used with a different request."}), 422
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except BaseException:
+            store.abandon(scope)
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            store.abandon(scope)  # Transient: a retry should run again
+        else:
+            store.complete(scope, _pack(fingerprint, response))
+        return response
+
+    return wrapper
+
+
+def _fingerprint():
+    """
+    Fingerprint the request's payload, to detect a key reused for a different request.
+
+    JSON bodies are hashed; uploads (which are streamed by the views) are identified by their type
+    and length instead, so that they are not read into memory here.
+    """
+    digest = hashlib.sha256(request.query_string)
+    if request.is_json:
+        digest.update(request.get_data(cache=True))  # Cached, so the view can still read it
+    else:
+        digest.update(f"{request.content_type}:{request.content_length}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _pack(fingerprint, response):
+    """Pack a response into compact bytes: a JSON header line followed by the compressed body."""
+    header = {"fingerprint": fingerprint, "status": response.status_code,
+              "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}}
+    return json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n' + zlib.compress(response.get_data())
+
+
+def _unpack(packed):
+    """Rebuild a stored response; returns its fingerprint and the response."""
+    header, _, body = packed.partition(b'\n')
+    header = json.loads(header)
+    response = current_app.response_class(zlib.decompress(body), status=header['status'], headers=header['headers'])
+    return header['fingerprint'], response
@@ -0,0 +1,420 @@
+import io  # Import io to wrap binary upload streams as text
+import os  # Import os to create the spool directory
+import re  # Import the re module for regular expression operations
+import shutil  # Import shutil to copy uploads to disk
+import tempfile  # Import tempfile to create uniquely named spool files
+
+# Reference file formats accepted by the importer
+SUPPORTED_FORMATS = ('bibtex', 'ris')
+
+# Month names and abbreviations used by reference managers, mapped to their month number
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# Maximum size (in characters) of a single entry, protecting the parser against unterminated entries
+MAX_ENTRY_SIZE = 256 * 1024
+
+# RIS tags mapped to the article field they feed
+RIS_TAGS = {
+    'TI': 'title', 'T1': 'title',
+    'AU': 'authors', 'A1': 'authors',
+    'KW': 'keywords',
+    'AB': 'abstract', 'N2': 'abstract',
+    'JO': 'journal', 'JF': 'journal', 'T2': 'journal', 'JA': 'journal',
+    'DO': 'doi',
+    'SP': 'start_page', 'EP': 'end_page',
+    'PY': 'date', 'Y1': 'date', 'DA': 'date'
+}
+
+RIS_LINE = re.compile(r"^([A-Z][A-Z0-9])  -(?: (.*))?$")  # Matches "TY  - JOUR" style RIS lines
+BIBTEX_ENTRY_START = re.compile(r"@\s*(\w+)\s*([{(])")  # Matches the start of an entry, e.g. "@article{" or "@article("
+BIBTEX_ENTRY_TYPE = re.compile(r"^\s*@\s*(\w+)")  # Matches a line starting an entry, whatever follows its type
+BIBTEX_CLOSERS = {'{': '}', '(': ')'}  # BibTeX entries are delimited by braces or by parentheses
+
+# Standard BibTeX month macros (e.g. "month = jan")
+MONTHS_MACROS = {name: str(number) for name, number in MONTHS.items()}
+
+
+class ImportEntryError(ValueError):
+    """Raised when a single reference entry cannot be parsed or mapped to an article."""
+
+
+def open_text_stream(stream):
+    """
+    Wrap a binary stream (an uploaded file or the raw request body) as a text stream.
+
+    **Parameters:**
+        - `stream`: A binary file-like object.
+
+    **Returns:**
+        - A text stream decoding UTF-8 (with a BOM if present), replacing undecodable bytes.
+    """
+    if not hasattr(stream, 'read1'):  # Raw streams (e.g. the request body) need a buffer for text decoding
+        stream = io.BufferedReader(stream)
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline=None)
+
+
+def detect_format(filename=None, content_type=None):
+    """
+    Detect the reference file format from the upload's filename or content type.
+
+    **Parameters:**
+        - `filename`: str, optional - Name of the uploaded file.
+        - `content_type`: str, optional - Content type of the upload.
+
+    **Returns:**
+        - `'bibtex'`, `'ris'` or None if the format cannot be inferred.
+    """
+    name = (filename or '').lower()
+    mimetype = (content_type or '').lower()
+    if name.endswith(('.bib', '.bibtex')) or 'bibtex' in mimetype:
+        return 'bibtex'
+    if name.endswith('.ris') or 'research-info-systems' in mimetype:
+        return 'ris'
+    return None
+
+
+def spool_stream(stream, directory):
+    """
+    Copy a binary stream (an uploaded file or the raw request body) to a new file, so that it can
+    be imported by a background job after the request has ended.
+
+    **Parameters:**
+        - `stream`: A binary file-like object.
+        - `directory`: str - Directory of the spool files; created if missing.
+
+    **Returns:**
+        - The path of the new file. The caller is responsible for deleting it.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile('wb', dir=directory, prefix='import-', delete=False) as spool:
+        try:
+            shutil.copyfileobj(stream, spool, 1024 * 1024)  # Copy in 1 MiB chunks
+        except BaseException:
+            spool.close()
+            os.remove(spool.name)  # Do not leave partial uploads behind
+            raise
+    return spool.name
+
+
+def iter_reference_entries(text_stream, file_format):
+    """
+    Lazily parse a BibTeX or RIS stream and yield article data dictionaries.
+
+    Entries are read one at a time, so memory usage is bounded by the size of the largest entry
+    rather than by the size of the file.
+
+    **Parameters:**
+        - `text_stream`: A text stream positioned at the beginning of the file.
+        - `file_format`: str - Either `'bibtex'` or `'ris'`.
+
+    **Yields:**
+        - `(index, data, error)` tuples, where `data` is a dictionary of article fields and `error`
+          is an error message when the entry could not be parsed (in which case `data` is None).
+
+    **Raises:**
+        - `ValueError`: If the format is not supported.
+    """
+    if file_format == 'bibtex':
+        raw_entries, mapper = iter_bibtex_entries(text_stream), map_bibtex_entry
+    elif file_format == 'ris':
+        raw_entries, mapper = iter_ris_entries(text_stream), map_ris_entry
+    else:
+        raise ValueError(f"Invalid import format. Use {' or '.join(repr(f) for f in SUPPORTED_FORMATS)}.")
+
+    for index, entry in enumerate(raw_entries):
+        try:
+            if isinstance(entry, ImportEntryError):  # The parser reports malformed entries in-band
+                raise entry
+            yield index, mapper(entry), None
+        except ImportEntryError as e:
+            yield index, None, str(e)
+
+
+def iter_bibtex_entries(text_stream):
+    """
+    Incrementally split a BibTeX stream into entries and parse their fields.
+
+    **Parameters:**
+        - `text_stream`: A text stream containing BibTeX data.
+
+    **Yields:**
+        - Dictionaries of lower-cased field names to values, or `ImportEntryError` instances for
+          entries that are malformed.
+    """
+    macros = dict(MONTHS_MACROS)  # @string macros defined so far, seeded with the standard month macros
+    buffer = []  # Lines of the entry currently being read
+    buffered_size = 0
+    closer = None  # Delimiter closing the entry currently being read
+    braces, parens = 0, 0  # Current brace and (outside of braces) parenthesis depths inside the entry
+
+    for line in text_stream:
+        if not buffer:
+            match = BIBTEX_ENTRY_START.search(line)
+            if not match:
+                unknown = BIBTEX_ENTRY_TYPE.match(line)
+                if unknown:  # An entry we cannot delimit: report it rather than silently dropping it
+                    yield ImportEntryError(f"Entry '@{unknown.group(1)}' does not start with '{{' or '('.")
+                continue  # Other text outside of entries is a comment in BibTeX
+            line = line[match.start():]
+            closer = BIBTEX_CLOSERS[match.group(2)]
+
+        buffer.append(line)
+        buffered_size += len(line)
+        braces, parens = _delimiter_depths(line, braces, parens)
+
+        if (braces if closer == '}' else parens) > 0 and buffered_size <= MAX_ENTRY_SIZE:
+            continue  # The entry is not finished yet
+
+        text, oversized = ''.join(buffer), buffered_size > MAX_ENTRY_SIZE
+        buffer, buffered_size, braces, parens = [], 0, 0, 0
+
+        if oversized:
+            yield ImportEntryError("Entry is too large or is not terminated.")
+            continue
+
+        try:
+            entry_type, fields = _parse_bibtex_entry(text, macros)
+        except ImportEntryError as e:
+            yield e
+            continue
+
+        if entry_type == 'string':
+            macros.update(fields)  # Remember macro definitions for later entries
+        elif entry_type not in ('comment', 'preamble'):
+            yield fields
+
+    if buffer:
+        yield ImportEntryError("Entry is not terminated.")
+
+
+def iter_ris_entries(text_stream):
+    """
+    Incrementally parse a RIS stream into entries.
+
+    **Parameters:**
+        - `text_stream`: A text stream containing RIS data.
+
+    **Yields:**
+        - Dictionaries mapping article fields to lists of raw values.
+    """
+    entry = None
+    last_field = None
+
+    for line in text_stream:
+        line = line.rstrip('\r\n')
+        match = RIS_LINE.match(line)
+
+        if not match:
+            if entry is not None and last_field and line.strip():
+                entry[last_field][-1] += ' ' + line.strip()  # Continuation of a wrapped value
+            continue
+
+        tag, value = match.group(1), (match.group(2) or '').strip()
+        if tag == 'TY':
+            entry, last_field = {}, None  # Start a new entry (a previous unterminated one is dropped)
+        elif tag == 'ER':
+            if entry is not None:
+                yield entry
+            entry, last_field = None, None
+        elif entry is not None:
+            last_field = RIS_TAGS.get(tag)
+            if last_field:
+                entry.setdefault(last_field, []).append(value)
+
+    if entry is not None:
+        yield ImportEntryError("Entry is not terminated with an 'ER' tag.")
+
+
+def map_bibtex_entry(fields):
+    """
+    Map parsed BibTeX fields to article data.
+
+    **Parameters:**
+        - `fields`: dict - Lower-cased BibTeX field names mapped to their values.
+
+    **Returns:**
+        - A dictionary of article fields; fields missing from the entry are left out.
+    """
+    data = {}
+    if fields.get('title'):
+        data['title'] = _clean(fields['title'])
+    if fields.get('author'):
+        data['authors'] = [_normalize_author(a) for a in _split_top_level(fields['author'], ' and ') if a.strip()]
+    if 'keywords' in fields:
+        data['keywords'] = _split_keywords(_clean(fields['keywords']))
+    if 'abstract' in fields:
+        data['abstract'] = _clean(fields['abstract'])
+    journal = fields.get('journal') or fields.get('journaltitle') or fields.get('booktitle')
+    if journal:
+        data['journal'] = _clean(journal)
+    if fields.get('doi'):
+        data['doi'] = _clean(fields['doi'])
+
+    date = _clean(fields.get('date', ''))
+    if date:
+        data['publication_date'] = _format_date(*re.split(r"[-/]", date)[:3])
+    elif fields.get('year'):
+        data['publication_date'] = _format_date(_clean(fields['year']), _clean(fields.get('month', '')),
+                                                _clean(fields.get('day', '')))
+
+    if fields.get('numpages'):
+        data['pages'] = _parse_int(_clean(fields['numpages']))
+    elif fields.get('pages'):
+        data['pages'] = _count_pages(*re.split(r"-+|–", _clean(fields['pages']))[:2])
+    return data
+
+
+def map_ris_entry(fields):
+    """
+    Map parsed RIS fields to article data.
+
+    **Parameters:**
+        - `fields`: dict - Article field names mapped to lists of raw RIS values.
+
+    **Returns:**
+        - A dictionary of article fields; fields missing from the entry are left out.
+    """
+    data = {}
+    if fields.get('title'):
+        data['title'] = fields['title'][0]
+    if fields.get('authors'):
+        data['authors'] = [_normalize_author(a) for a in fields['authors'] if a]
+    if 'keywords' in fields:
+        data['keywords'] = [k for value in fields['keywords'] for k in _split_keywords(value)]
+    if 'abstract' in fields:
+        data['abstract'] = ' '.join(fields['abstract'])
+    if fields.get('journal'):
+        data['journal'] = fields['journal'][0]
+    if fields.get('doi'):
+        data['doi'] = fields['doi'][0]
+    if fields.get('date'):
+        data['publication_date'] = _format_date(*fields['date'][0].split('/')[:3])
+    if fields.get('start_page'):
+        data['pages'] = _count_pages(fields['start_page'][0], (fields.get('end_page') or [None])[0])
+    return data
+
+
+def _delimiter_depths(text, braces, parens):
+    """
+    Return the brace and parenthesis depths after the text, starting from the given depths.
+
+    Escaped braces are ignored, and parentheses only count outside of braces (where they delimit
+    `@type(...)` entries), so a parenthesis inside a braced value does not end the entry.
+    """
+    text = text.replace('\\{', '').replace('\\}', '')
+    for char in text:
+        if char == '{':
+            braces += 1
+        elif char == '}':
+            braces -= 1
+        elif braces == 0 and char == '(':
+            parens += 1
+        elif braces == 0 and char == ')':
+            parens -= 1
+    return braces, parens
+
+
+def _parse_bibtex_entry(text, macros):
+    """Parse a single BibTeX entry into its type and a dictionary of fields."""
+    match = BIBTEX_ENTRY_START.match(text)
+    entry_type = match.group(1).lower()
+    body = text[match.end():].rstrip()
+    if body.endswith(BIBTEX_CLOSERS[match.group(2)]):
+        body = body[:-1]
+
+    if entry_type in ('comment', 'preamble'):
+        return entry_type, {}
+
+    if entry_type != 'string':
+        key, sep, body = body.partition(',')  # Drop the citation key
+        if not sep:
+            raise ImportEntryError(f"Entry '{key.strip()}' has no fields.")
+
+    fields = {}
+    for part in _split_top_level(body, ','):
+        name, sep, value = part.partition('=')
+        if not sep:
+            if part.strip():
+                raise ImportEntryError(f"Malformed field '{part.strip()[:40]}'.")
+            continue
+        fields[name.strip().lower()] = _parse_bibtex_value(value.strip(), macros)
+    return entry_type, fields
+
+
+def _parse_bibtex_value(value, macros):
+    """Resolve a BibTeX field value, handling braces, quotes, macros and '#' concatenation."""
+    pieces = []
+    for piece in _split_top_level(value, '#'):
+        piece = piece.strip()
+        if piece.startswith('{') and piece.endswith('}'):
+            pieces.append(piece[1:-1])
+        elif piece.startswith('"') and piece.endswith('"'):
+            pieces.append(piece[1:-1])
+        else:
+            pieces.append(macros.get(piece.lower(), piece))
+    return ''.join(pieces)
+
+
+def _split_top_level(text, separator):
+    """Split text on a separator, ignoring separators nested inside braces or quotes."""
+    parts, depth, in_quotes, start, i = [], 0, False, 0, 0
+    while i < len(text):
+        char = text[i]
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        elif char == '"' and depth == 0:
+            in_quotes = not in_quotes
+        elif depth == 0 and not in_quotes and text.startswith(separator, i):
+            parts.append(text[start:i])
+            i += len(separator)
+            start = i
+            continue
+        i += 1
+    parts.append(text[start:])
+    return parts
+
+
+def _clean(value):
+    """Remove LaTeX grouping braces and collapse whitespace."""
+    return ' '.join(value.replace('{', '').replace('}', '').split())
+
+
+def _normalize_author(author):
+    """Convert 'Last, First' author names to 'First Last'."""
+    author = _clean(author)
+    last, sep, first = author.partition(',')
+    return f"{first.strip()} {last.strip()}".strip() if sep else author
+
+
+def _split_keywords(value):
+    """Split a keyword list separated by commas or semicolons."""
+    return [keyword.strip() for keyword in re.split(r"[;,]", value) if keyword.strip()]
+
+
+def _format_date(year, month='', day=''):
+    """Build a YYYY-MM-DD date, defaulting missing months and days to 01."""
+    if not re.fullmatch(r"\d{4}", (year or '').strip()):
+        raise ImportEntryError(f"Invalid publication year '{year}'.")
+    month = (month or '').strip().lower()
+    month_number = MONTHS.get(month[:3]) if month and not month.isdigit() else _parse_int(month)
+    day_number = _parse_int((day or '').strip())
+    return f"{year.strip()}-{(month_number or 1):02d}-{(day_number or 1):02d}"
+
+
+def _count_pages(start, end=None):
+    """Return the number of pages covered by a page range, or None if it cannot be determined."""
+    start, end = _parse_int(start), _parse_int(end)
+    if start is None or end is None or end < start:
+        return None
+    return end - start + 1
+
+
+def _parse_int(value):
+    """Parse an integer, returning None for empty or non-numeric values."""
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else None
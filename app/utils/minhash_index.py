@@ -0,0 +1,171 @@
+import re  # Import the re module to split text into words
+import threading  # Import threading to guard the index
+import zlib  # Import zlib for a fast, stable hash of the shingles
+from collections import defaultdict  # Import defaultdict to group articles into buckets
+
+import numpy as np  # Import NumPy to compute all the hash permutations at once
+
+from app.utils.article_index import ArticleIndex  # Import the base class of the article indexes
+
+NON_ALPHANUMERIC = re.compile(r"[\W_]+")  # Runs of characters that separate words
+SHINGLE_SIZE = 3  # Words per shingle
+SEED = 0x5EED  # Fixed, so signatures do not depend on the process
+
+
+def shingles(article):
+    """
+    Return the set of shingles (runs of SHINGLE_SIZE consecutive words) of an article's title and abstract.
+
+    Words are lower-cased and stripped of punctuation, so formatting differences between sources
+    do not matter. A text shorter than a shingle yields its words as a single shingle.
+    """
+    words = NON_ALPHANUMERIC.sub(' ', f"{article.title or ''} {article.abstract or ''}".lower()).split()
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+class MinHashIndex(ArticleIndex):
+    """
+    An in-memory index of MinHash signatures of the articles, banded for locality-sensitive hashing
+    (LSH) and partitioned by user, to find near-duplicate articles without comparing every pair.
+
+    The signature of an article holds, for each of `permutations` hash functions, the minimum hash
+    of its shingles; the share of equal positions between two signatures estimates the Jaccard
+    similarity of their shingle sets. Signatures are stored as packed 32-bit integers
+    (4 bytes per permutation). Each signature is cut into `bands` bands, and articles whose
+    signatures are equal on a whole band share a bucket: only articles sharing a bucket are compared,
+    and two articles with similarity s share one with probability 1 - (1 - s^rows)^bands.
+    """
+
+    def __init__(self, permutations, bands):
+        self.permutations = permutations
+        self.bands = bands
+        self.rows = permutations // bands  # Signature positions per band
+        # Hash functions h(x) = (a * x + b) mod 2^64 >> 32 with odd a (multiply-shift hashing)
+        random = np.random.default_rng(SEED)
+        self.multipliers = random.integers(0, 2 ** 64, permutations, dtype=np.uint64) | np.uint64(1)
+        self.increments = random.integers(0, 2 ** 64, permutations, dtype=np.uint64)
+        self.signatures = {}  # article_id -> (user_id, packed signature)
+        self.buckets = defaultdict(lambda: defaultdict(set))  # user_id -> (band, band bytes) -> {article_id}
+        self.lock = threading.Lock()
+
+    def signature(self, article):
+        """Return the packed MinHash signature of an article, or None if it has no words."""
+        grams = shingles(article)
+        if not grams:
+            return None
+        hashes = np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+        with np.errstate(over='ignore'):  # The products wrap modulo 2^64 on purpose
+            permuted = (hashes[:, None] * self.multipliers + self.increments) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32).tobytes()
+
+    def build(self, articles):
+        """Replace the indexed articles."""
+        with self.lock:
+            self.signatures.clear()
+            self.buckets.clear()
+            for article in articles:
+                self._add(article.id, article.user_id, self.signature(article))
+
+    def add(self, article):
+        """Index a created or updated article, computing its signature."""
+        signature = self.signature(article)  # Outside the lock, it is the costly part
+        with self.lock:
+            self._remove(article.id)
+            self._add(article.id, article.user_id, signature)
+
+    def remove(self, article_id):
+        """Remove a deleted article."""
+        with self.lock:
+            self._remove(article_id)
+
+    def _bands(self, signature):
+        """Return the bucket keys of a signature, one per band."""
+        size = self.rows * 4  # Bytes per band
+        return [(band, signature[band * size:(band + 1) * size]) for band in range(self.bands)]
+
+    def _add(self, article_id, user_id, signature):
+        """Add a signature to its user's buckets."""
+        if signature is None:
+            return  # Nothing to compare
+        self.signatures[article_id] = (user_id, signature)
+        user_buckets = self.buckets[user_id]
+        for key in self._bands(signature):
+            user_buckets[key].add(article_id)
+
+    def _remove(self, article_id):
+        """Remove an article from its user's buckets."""
+        entry = self.signatures.pop(article_id, None)
+        if entry is None:
+            return
+        user_id, signature = entry
+        user_buckets = self.buckets[user_id]
+        for key in self._bands(signature):
+            ids = user_buckets.get(key)
+            if ids is not None:
+                ids.discard(article_id)
+                if not ids:
+                    del user_buckets[key]  # Keep the index compact
+        if not user_buckets:
+            del self.buckets[user_id]
+
+    def _similarity(self, first, second):
+        """Estimate the Jaccard similarity of two packed signatures."""
+        return np.count_nonzero(np.frombuffer(first, dtype=np.uint32) == np.frombuffer(second, dtype=np.uint32)) \
+            / self.permutations
+
+    def similar(self, article_id, threshold, limit):
+        """
+        Find the near-duplicates of an indexed article in its user's library.
+
+        **Returns:**
+            - A list of `(article_id, similarity)` tuples with an estimated similarity of at least
+              `threshold`, most similar first.
+        """
+        with self.lock:
+            entry = self.signatures.get(article_id)
+            if entry is None:
+                return []
+            user_id, signature = entry
+            user_buckets = self.buckets.get(user_id, {})
+            candidates = set().union(*(user_buckets.get(key, ()) for key in self._bands(signature)))
+            candidates.discard(article_id)
+            scored = [(self._similarity(signature, self.signatures[candidate][1]), candidate)
+                      for candidate in candidates]
+
+        scored = sorted((item for item in scored if item[0] >= threshold), key=lambda item: (-item[0], item[1]))
+        return [(candidate, round(similarity, 4)) for similarity, candidate in scored[:limit]]
+
+    def duplicates(self, user_id, threshold, limit):
+        """
+        Find the pairs of near-duplicate articles in a user's library.
+
+        Only the pairs sharing an LSH bucket are compared, so the cost grows with the number of
+        candidate pairs rather than with the square of the library size.
+
+        **Returns:**
+            - A list of `(first_id, second_id, similarity)` tuples with an estimated similarity of
+              at least `threshold`, most similar first.
+        """
+        with self.lock:
+            pairs = set()
+            for ids in self.buckets.get(user_id, {}).values():
+                if len(ids) > 1:
+                    ordered = sorted(ids)
+                    pairs.update((first, second) for index, first in enumerate(ordered) for second in ordered[index + 1:])
+            scored = [(self._similarity(self.signatures[first][1], self.signatures[second][1]), first, second)
+                      for first, second in pairs]
+
+        scored = sorted((item for item in scored if item[0] >= threshold), key=lambda item: (-item[0], item[1], item[2]))
+        return [(first, second, round(similarity, 4)) for similarity, first, second in scored[:limit]]
+
+    def stats(self):
+        """Return the size of the index."""
+        with self.lock:
+            return {
+                "articles": len(self.signatures),
+                "users": len(self.buckets),
+                "buckets": sum(len(user_buckets) for user_buckets in self.buckets.values()),
+                "signature_bytes": len(self.signatures) * self.permutations * 4
+            }
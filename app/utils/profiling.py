@@ -0,0 +1,275 @@
+import hmac  # Import hmac to compare profiling tokens in constant time
+import json  # Import the JSON library to store profile metadata
+import logging  # Import logging to report profiles that cannot be stored
+import os  # Import os to manage the profile files
+import random  # Import random to sample requests
+import re  # Import re to validate profile IDs
+import secrets  # Import secrets to make profile IDs unique across processes
+import sys  # Import sys to read the stacks of the request threads
+import threading  # Import threading to run the sampler in the background
+import time  # Import time to pace the sampler and time requests
+from collections import Counter  # Import Counter to count the samples of each stack
+from datetime import datetime, timezone  # Import datetime to timestamp profiles
+
+from flask import request  # Import request to decide which requests are profiled
+
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'X-Profile-Token'
+OUTPUT_HEADER = 'X-Profile-Output'
+EXCLUDED_BLUEPRINTS = ('swagger_ui', 'profile')  # API documentation, and the profiles themselves
+PROFILE_ID = re.compile(r"^[0-9]{20}-[0-9a-f]{8}$")
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # The project directory
+
+_labels = {}  # code object -> frame label
+
+
+def _frame_label(code):
+    """Return the label of a function in a collapsed stack: `name (file:line)`, cached per code object."""
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        if 'site-packages' in path:
+            path = path.split('site-packages' + os.sep, 1)[-1]
+        elif path.startswith(ROOT):
+            path = os.path.relpath(path, ROOT)
+        label = _labels[code] = f"{code.co_name} ({path}:{code.co_firstlineno})".replace(';', ':')
+    return label
+
+
+def collapse(frame):
+    """Return the stack of a frame in collapsed format: frame labels from the root, joined by `;`."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+def folded(stacks):
+    """Format sampled stacks as collapsed-stack lines (`stack count`), read by flamegraph.pl and speedscope."""
+    return ''.join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+class StackSampler:
+    """
+    A sampling profiler of the threads running profiled requests.
+
+    A single background thread wakes every `interval` seconds, reads the current frame of each
+    profiled thread (`sys._current_frames`) and counts its stack. The profiled code is not traced,
+    so its overhead is that of the sampler thread, and the thread only runs while requests are profiled.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._reset()
+        register_after_fork(self._reset)
+
+    def _reset(self):
+        """Forget the profiled threads and the sampler thread, which do not exist in a forked child."""
+        self.targets = {}  # thread ID -> Counter of its sampled stacks
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self, thread_id):
+        """Start sampling a thread, starting the sampler thread if needed."""
+        with self.lock:
+            self.targets[thread_id] = Counter()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+                self.thread.start()
+
+    def stop(self, thread_id):
+        """Stop sampling a thread and return its sampled stacks."""
+        with self.lock:
+            return self.targets.pop(thread_id, Counter())
+
+    def _run(self):
+        """Sample the profiled threads until there are none left."""
+        while True:
+            with self.lock:
+                if not self.targets:
+                    self.thread = None
+                    return
+                thread_ids = list(self.targets)
+            frames = sys._current_frames()
+            stacks = [(thread_id, collapse(frames[thread_id])) for thread_id in thread_ids if thread_id in frames]
+            with self.lock:
+                for thread_id, stack in stacks:
+                    counter = self.targets.get(thread_id)
+                    if counter is not None:  # Not stopped in the meantime
+                        counter[stack] += 1
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """
+    A bounded ring buffer of profiles on disk, shared by the processes using the same directory.
+
+    Each profile is a `<id>.folded` file of collapsed stacks with a `<id>.json` file of metadata.
+    IDs start with the creation time, so they sort from oldest to newest; once more than
+    `max_profiles` are stored, the oldest are deleted.
+    """
+
+    def __init__(self, directory, max_profiles):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def save(self, metadata, stacks):
+        """
+        Store a profile.
+
+        **Returns:**
+            - The ID of the profile.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = f"{time.time_ns():020d}-{secrets.token_hex(4)}"
+        metadata = {"id": profile_id, **metadata}
+        self._write(f"{profile_id}.folded", folded(stacks))
+        self._write(f"{profile_id}.json", json.dumps(metadata))  # Last: the profile is listed once complete
+        self._prune()
+        return profile_id
+
+    def _write(self, name, text):
+        """Write a file atomically, so readers never see it partially written."""
+        path = os.path.join(self.directory, name)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(f"{path}.tmp", path)
+
+    def _ids(self):
+        """Return the IDs of the stored profiles, oldest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith('.json') and PROFILE_ID.match(name[:-5]))
+
+    def _prune(self):
+        """Delete the oldest profiles beyond `max_profiles`."""
+        ids = self._ids()
+        for profile_id in ids[:max(0, len(ids) - self.max_profiles)]:
+            for extension in ('.json', '.folded'):
+                try:
+                    os.unlink(os.path.join(self.directory, profile_id + extension))
+                except FileNotFoundError:
+                    pass  # Pruned by another process
+
+    def list(self, path_prefix=None, min_duration_ms=0, limit=100):
+        """Return the metadata of the stored profiles, newest first, optionally filtered by path and duration."""
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            try:
+                with open(os.path.join(self.directory, f"{profile_id}.json"), encoding='utf-8') as file:
+                    metadata = json.load(file)
+            except FileNotFoundError:
+                continue  # Pruned in the meantime
+            if path_prefix and not metadata['path'].startswith(path_prefix):
+                continue
+            if metadata['duration_ms'] < min_duration_ms:
+                continue
+            profiles.append(metadata)
+            if len(profiles) == limit:
+                break
+        return profiles
+
+    def get(self, profile_id):
+        """Return the collapsed stacks of a profile, or None if there is no such profile."""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{profile_id}.folded"), encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+
+def is_authorized(app):
+    """Return whether the current request carries the profiling token (header or `profile_token` parameter)."""
+    expected = app.config.get('PROFILING_TOKEN')
+    token = request.headers.get(TOKEN_HEADER) or request.args.get('profile_token')
+    return bool(expected and token) and hmac.compare_digest(token.encode('utf-8'), expected.encode('utf-8'))
+
+
+def init_profiling(app):
+    """
+    Register on-demand sampling profiling of requests.
+
+    A request is profiled when it carries the `PROFILING_TOKEN` (in the `X-Profile-Token` header or
+    the `profile_token` query parameter), or at random for a `PROFILING_SAMPLE_RATE` share of the
+    requests. Its profile, in collapsed-stack format, is stored in the `PROFILING_DIR` ring buffer
+    (its ID is returned in the `X-Profile-Id` header), or returned instead of the response body when
+    a token-authorized request asks for `inline` output (`X-Profile-Output` header or
+    `profile_output` parameter). Sampled requests faster than `PROFILING_SLOW_MS` are not stored.
+
+    **Parameters:**
+        - `app`: The Flask application.
+    """
+    if not app.config.get('PROFILING_ENABLED', False):
+        return
+
+    sampler = StackSampler(app.config['PROFILING_INTERVAL_MS'] / 1000)
+    store = ProfileStore(app.config['PROFILING_DIR'], app.config['PROFILING_MAX_PROFILES'])
+    app.extensions['profile_store'] = store
+    sample_rate = app.config.get('PROFILING_SAMPLE_RATE', 0)
+    slow_ms = app.config.get('PROFILING_SLOW_MS', 0)
+
+    @app.before_request
+    def start_profiling():
+        """Start sampling the request's thread if the request is profiled."""
+        if request.endpoint is None or request.blueprint in EXCLUDED_BLUEPRINTS or request.endpoint == 'static':
+            return
+        if is_authorized(app):
+            output = request.headers.get(OUTPUT_HEADER) or request.args.get('profile_output', 'store')
+            mode = 'inline' if output.lower() == 'inline' else 'requested'
+        elif sample_rate and random.random() < sample_rate:
+            mode = 'sampled'
+        else:
+            return
+        thread_id = threading.get_ident()
+        request.environ['profiling.request'] = (mode, thread_id, time.perf_counter())
+        sampler.start(thread_id)
+
+    @app.after_request
+    def finish_profiling(response):
+        """Store the request's profile, or return it instead of the response for inline output."""
+        profiled = request.environ.pop('profiling.request', None)
+        if profiled is None:
+            return response
+        mode, thread_id, started = profiled
+        stacks = sampler.stop(thread_id)
+        duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        if mode == 'sampled' and duration_ms < slow_ms:
+            return response
+
+        if mode == 'inline':
+            inline = app.response_class(folded(stacks), mimetype='text/plain')
+            inline.headers['X-Profile-Status'] = str(response.status_code)  # The status of the profiled response
+            inline.headers['X-Profile-Duration-Ms'] = str(duration_ms)
+            return inline
+
+        metadata = {
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "duration_ms": duration_ms,
+            "samples": sum(stacks.values()),
+            "interval_ms": app.config['PROFILING_INTERVAL_MS'],
+            "trigger": mode,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        try:
+            response.headers['X-Profile-Id'] = store.save(metadata, stacks)
+        except OSError:
+            logger.exception("Could not store the profile of %s %s", request.method, request.path)
+        return response
+
+    @app.teardown_request
+    def stop_profiling(exception=None):
+        """Stop sampling a request that ended without a response (an unhandled exception)."""
+        profiled = request.environ.pop('profiling.request', None)
+        if profiled is not None:
+            sampler.stop(profiled[1])
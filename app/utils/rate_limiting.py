@@ -0,0 +1,267 @@
+import math  # Import math to round Retry-After values up
+import threading  # Import threading for the bucket store lock and the concurrency limit
+import time  # Import time to refill the token buckets
+from collections import OrderedDict  # Import OrderedDict to evict the least recently used buckets
+
+from flask import current_app, jsonify, request  # Import Flask helpers to inspect requests and build responses
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request  # Import JWT helpers to identify clients
+
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+
+try:
+    import redis  # Optional shared backend, used when RATE_LIMIT_STORAGE_URL is set
+except ImportError:  # pragma: no cover - depends on the environment
+    redis = None
+
+# Endpoints that are never rate limited (API documentation and static files)
+EXEMPT_BLUEPRINTS = ('swagger_ui',)
+
+# Endpoints grouped into the "login" route class
+LOGIN_ENDPOINTS = ('user.login', 'user.register', 'user.refresh')
+
+# Endpoints grouped into the "search" route class
+SEARCH_ENDPOINTS = ('article.search_articles',)
+
+# Token bucket refill script for the shared Redis backend: returns {allowed, retry_after_ms}
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, retry_after}
+"""
+
+
+class TokenBucketStore:
+    """
+    An in-process store of token buckets with least-recently-used eviction.
+
+    Each bucket is a two-item list `[tokens, updated_at]`, and at most `max_entries` buckets are
+    kept; evicting an idle bucket is harmless because it would have refilled to full capacity.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries  # Maximum number of buckets kept in memory
+        self.buckets = OrderedDict()  # key -> [tokens, updated_at], in LRU order
+        self.lock = threading.Lock()
+        register_after_fork(self._reset)
+
+    def _reset(self):
+        """Replace the lock, which may have been held when the process forked; buckets stay valid."""
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        """
+        Take one token from a bucket.
+
+        **Parameters:**
+            - `key`: str - The bucket key (route class and client identity).
+            - `capacity`: int - Maximum number of tokens in the bucket (the burst size).
+            - `rate`: float - Tokens added per second.
+
+        **Returns:**
+            - A tuple `(allowed, retry_after)` where `retry_after` is the number of seconds until a
+              token is available.
+        """
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [capacity, now]
+                if len(self.buckets) > self.max_entries:
+                    self.buckets.popitem(last=False)  # Evict the least recently used bucket
+            else:
+                self.buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)  # Refill since the last request
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0
+            return False, (1 - bucket[0]) / rate
+
+    def clear(self):
+        """Remove every bucket."""
+        with self.lock:
+            self.buckets.clear()
+
+
+class RedisTokenBucketStore:
+    """A token bucket store shared by every process through Redis."""
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
+
+    def consume(self, key, capacity, rate):
+        """Take one token from a bucket; see `TokenBucketStore.consume`."""
+        allowed, retry_after_ms = self.script(keys=[f"rate_limit:{key}"], args=[capacity, rate, time.time()])
+        return bool(allowed), retry_after_ms / 1000
+
+    def clear(self):
+        """Buckets expire on their own in Redis."""
+
+
+def parse_rate_limits(value):
+    """
+    Parse rate limits in the form `"login=5/60,search=30/60"`.
+
+    **Parameters:**
+        - `value`: str - Comma-separated `route_class=requests/seconds` pairs.
+
+    **Returns:**
+        - A dictionary mapping each route class to a `(capacity, rate)` tuple, where `rate` is the
+          number of tokens refilled per second.
+
+    **Raises:**
+        - `ValueError`: If the value is malformed.
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        route_class, _, limit = item.partition('=')
+        requests, _, seconds = limit.partition('/')
+        limits[route_class.strip()] = (int(requests), int(requests) / float(seconds or 1))
+    return limits
+
+
+def get_route_class(endpoint, method):
+    """
+    Classify a request into a rate limiting route class.
+
+    **Parameters:**
+        - `endpoint`: str - The Flask endpoint name (e.g. `'article.search_articles'`).
+        - `method`: str - The HTTP method.
+
+    **Returns:**
+        - `'login'`, `'search'`, `'write'` or `'read'`.
+    """
+    if endpoint in LOGIN_ENDPOINTS:
+        return 'login'
+    if endpoint in SEARCH_ENDPOINTS:
+        return 'search'
+    if method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+        return 'write'
+    return 'read'
+
+
+def get_client_key():
+    """
+    Identify the client making the request.
+
+    **Returns:**
+        - `'user:<id>'` for requests carrying a valid JWT, otherwise `'ip:<address>'`.
+    """
+    try:
+        if verify_jwt_in_request(optional=True):
+            return f"user:{get_jwt_identity()}"
+    except Exception:  # Invalid or expired tokens are rejected later by the route itself
+        pass
+    return f"ip:{request.remote_addr}"
+
+
+def check_rate_limit(endpoint, method, client_key):
+    """
+    Apply the rate limit of a route to a request dispatched within another one (a batch sub-request).
+
+    **Parameters:**
+        - `endpoint`: str - The Flask endpoint name of the dispatched request.
+        - `method`: str - Its HTTP method.
+        - `client_key`: str - The client making it (see `get_client_key`).
+
+    **Returns:**
+        - None if the request may run, or the 429 response to return for it.
+    """
+    check = current_app.extensions.get('rate_limit_check')  # Missing when rate limiting is disabled
+    return check(endpoint, method, client_key) if check is not None else None
+
+
+def too_many_requests(message, retry_after, status_code=429):
+    """Build a rate limiting error response with a Retry-After header."""
+    response = jsonify({"status": "error", "message": message})
+    response.status_code = status_code
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def init_rate_limiting(app):
+    """
+    Register per-client token bucket rate limiting and a global concurrency limit.
+
+    Each request takes a token from the bucket of its route class (login, search, write or read)
+    for its client (JWT identity, or IP address for anonymous requests). Requests over the limit
+    get a 429 response. When `MAX_CONCURRENT_REQUESTS` requests are already in progress, new ones
+    wait up to `RATE_LIMIT_QUEUE_TIMEOUT` seconds and are then shed with a 503 response.
+
+    **Parameters:**
+        - `app`: The Flask application.
+    """
+    if not app.config.get('RATE_LIMIT_ENABLED', True):
+        return
+
+    limits = parse_rate_limits(app.config['RATE_LIMITS'])
+    storage_url = app.config.get('RATE_LIMIT_STORAGE_URL')
+    if storage_url and redis is None:
+        raise RuntimeError("RATE_LIMIT_STORAGE_URL requires the 'redis' package.")
+    store = RedisTokenBucketStore(storage_url) if storage_url else TokenBucketStore(
+        app.config['RATE_LIMIT_MAX_BUCKETS'])
+    app.extensions['rate_limit_store'] = store
+
+    max_concurrent = app.config.get('MAX_CONCURRENT_REQUESTS', 0)
+    concurrency = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+    queue_timeout = app.config.get('RATE_LIMIT_QUEUE_TIMEOUT', 0)
+
+    def reset_concurrency():
+        """Give each worker process its own concurrency limit, with every slot free."""
+        nonlocal concurrency
+        concurrency = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+
+    register_after_fork(reset_concurrency)
+
+    def consume_token(endpoint, method, client_key=None):
+        """Take a token from the client's bucket of the route class; return a 429 response if it is empty."""
+        route_class = get_route_class(endpoint, method)
+        if route_class in limits:
+            capacity, rate = limits[route_class]
+            allowed, retry_after = store.consume(f"{route_class}:{client_key or get_client_key()}", capacity, rate)
+            if not allowed:
+                return too_many_requests("Too many requests. Please retry later.", retry_after)
+        return None
+
+    app.extensions['rate_limit_check'] = consume_token  # Also used for requests dispatched by a batch
+
+    @app.before_request
+    def apply_rate_limits():
+        """Reject requests over their rate limit or over the global concurrency limit."""
+        if request.endpoint is None or request.blueprint in EXEMPT_BLUEPRINTS or request.endpoint == 'static':
+            return None
+
+        limited = consume_token(request.endpoint, request.method)
+        if limited is not None:
+            return limited
+
+        if concurrency is not None:
+            if not concurrency.acquire(timeout=queue_timeout):
+                return too_many_requests("Server is busy. Please retry later.", 1, 503)
+            # Kept on the request rather than on `g`, which the sub-requests of a batch share
+            request.environ['rate_limiting.concurrency_slot'] = concurrency  # Released at teardown
+        return None
+
+    @app.teardown_request
+    def release_concurrency_slot(exception=None):
+        """Release the concurrency slot held by the request, if any."""
+        slot = request.environ.pop('rate_limiting.concurrency_slot', None)
+        if slot is not None:
+            slot.release()
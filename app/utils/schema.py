@@ -0,0 +1,247 @@
+import re  # Import the re module to check string patterns
+from datetime import date  # Import date to check calendar dates
+
+from app.config import Config  # Import the configuration settings
+
+EMAIL_PATTERN = r"^[\w.-]+@[\w.-]+\.\w+$"  # The username format of the users
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"  # YYYY-MM-DD
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a payload does not match its schema.
+
+    **Attributes:**
+        - `errors`: dict - One message per invalid field (e.g. `{"pages": "must be an integer"}`);
+          array items are reported as `field[index]` and missing fields as "is required".
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        missing = [field for field, message in errors.items() if message == "is required"]
+        invalid = [f"{field} {message}" for field, message in errors.items() if message != "is required"]
+        parts = ([f"Missing required fields: {', '.join(missing)}"] if missing else []) + invalid
+        super().__init__('; '.join(parts) + '.')
+
+
+def _is_date(value):
+    """Return whether a YYYY-MM-DD string is a valid calendar date."""
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+class Field:
+    """
+    Base class of the schema field types.
+
+    A field declares its checks as Python expressions over the value; compiling a Schema inlines
+    them into the source of a single validator function, so validating a payload runs no
+    per-field function calls or loops over the declaration.
+    """
+
+    def __init__(self, required=True, nullable=False):
+        self.required = required  # Whether the field must be present (ignored by partial validators)
+        self.nullable = nullable  # Whether null is accepted
+
+    def checks(self, value, constant):
+        """
+        Return the `(condition, message)` pairs of the field, in order; the first condition that
+        holds rejects the value with its message.
+
+        **Parameters:**
+            - `value`: str - The expression of the value being checked.
+            - `constant`: callable - Registers an object for the generated code and returns its name.
+        """
+        return []
+
+    def emit(self, lines, indent, value, path, constant):
+        """Append the source checking `value` and recording an error under the key `path`."""
+        keyword = 'if'
+        for condition, message in self.checks(value, constant):
+            lines.append(f"{indent}{keyword} {condition}:")
+            lines.append(f"{indent}    errors[{path}] = {message!r}")
+            keyword = 'elif'
+
+
+class String(Field):
+    """A string, optionally limited in length (characters, and bytes once encoded) and matched against a pattern."""
+
+    def __init__(self, min_length=None, max_length=None, max_bytes=None, pattern=None, message=None, **kwargs):
+        super().__init__(**kwargs)
+        self.min_length = min_length
+        self.max_length = max_length
+        self.max_bytes = max_bytes  # E.g. the size of a TEXT column in UTF-8
+        self.pattern = pattern
+        self.message = message  # Custom message when the pattern does not match
+
+    def checks(self, value, constant):
+        checks = [(f"type({value}) is not str", "must be a string")]
+        if self.min_length == 1:
+            checks.append((f"not {value}", "must not be empty"))
+        elif self.min_length:
+            checks.append((f"len({value}) < {self.min_length}",
+                           f"must be at least {self.min_length} characters long"))
+        if self.max_length is not None:
+            checks.append((f"len({value}) > {self.max_length}", f"must be at most {self.max_length} characters long"))
+        if self.max_bytes is not None:
+            # Only encode strings long enough to possibly exceed the limit (4 bytes per character at most)
+            checks.append((f"len({value}) > {self.max_bytes // 4} and len({value}.encode('utf-8')) > {self.max_bytes}",
+                           f"must be at most {self.max_bytes} bytes long"))
+        if self.pattern is not None:
+            pattern = constant(re.compile(self.pattern))
+            checks.append((f"{pattern}.match({value}) is None", self.message or "has an invalid format"))
+        return checks
+
+
+class Date(Field):
+    """A date as a YYYY-MM-DD string."""
+
+    def checks(self, value, constant):
+        pattern, is_date = constant(re.compile(DATE_PATTERN)), constant(_is_date)
+        return [(f"type({value}) is not str", "must be a string"),
+                (f"{pattern}.match({value}) is None or not {is_date}({value})", "must be a valid date (YYYY-MM-DD)")]
+
+
+class Integer(Field):
+    """An integer (booleans are rejected), optionally within bounds."""
+
+    def __init__(self, minimum=None, maximum=None, **kwargs):
+        super().__init__(**kwargs)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def checks(self, value, constant):
+        checks = [(f"type({value}) is not int", "must be an integer")]
+        if self.minimum is not None:
+            checks.append((f"{value} < {self.minimum}", f"must be at least {self.minimum}"))
+        if self.maximum is not None:
+            checks.append((f"{value} > {self.maximum}", f"must be at most {self.maximum}"))
+        return checks
+
+
+class Array(Field):
+    """An array whose items all match a field type; each invalid item is reported as `field[index]`."""
+
+    def __init__(self, items, min_items=None, max_items=None, **kwargs):
+        super().__init__(**kwargs)
+        self.items = items
+        self.min_items = min_items
+        self.max_items = max_items
+
+    def checks(self, value, constant):
+        checks = [(f"type({value}) is not list", "must be an array")]
+        if self.min_items:
+            checks.append((f"len({value}) < {self.min_items}", "must not be empty" if self.min_items == 1
+                           else f"must have at least {self.min_items} items"))
+        if self.max_items is not None:
+            checks.append((f"len({value}) > {self.max_items}", f"must have at most {self.max_items} items"))
+        return checks
+
+    def emit(self, lines, indent, value, path, constant):
+        super().emit(lines, indent, value, path, constant)
+        depth = len(indent) // 4  # Unique names for nested arrays
+        lines.append(f"{indent}else:")
+        lines.append(f"{indent}    for index{depth}, item{depth} in enumerate({value}):")
+        self.items.emit(lines, indent + '        ', f"item{depth}", f"{path} + '[' + str(index{depth}) + ']'", constant)
+
+
+class Schema:
+    """
+    The declaration of a payload shape: a JSON object with the given fields.
+
+    `compile()` turns it into a validator function that returns the validated fields (a new dict
+    holding only the declared fields) or raises a ValidationError listing every invalid field.
+    Compile each schema once, at import time, and reuse the validator.
+    """
+
+    def __init__(self, fields, unknown='reject'):
+        self.fields = fields  # field name -> Field
+        self.unknown = unknown  # 'reject' (an error per unknown field) or 'drop' (ignored)
+
+    def compile(self, partial=False):
+        """
+        Compile the schema into a validator function.
+
+        **Parameters:**
+            - `partial`: bool - Whether every field is optional (e.g. for PATCH), instead of the
+              fields declared as required.
+
+        **Returns:**
+            - A function `validate(data)` returning the dict of validated fields.
+        """
+        namespace = {'ValidationError': ValidationError, 'MISSING': object()}
+
+        def constant(value):
+            name = f"c{len(namespace)}"
+            namespace[name] = value
+            return name
+
+        lines = ["def validate(data):",
+                 "    if type(data) is not dict:",
+                 "        raise ValidationError({'body': 'must be a JSON object'})",
+                 "    errors = {}",
+                 "    result = {}"]
+        for name, field in self.fields.items():
+            key = repr(name)
+            lines.append(f"    value = data.get({key}, MISSING)")
+            lines.append("    if value is MISSING:")
+            lines.append(f"        errors[{key}] = 'is required'" if field.required and not partial else "        pass")
+            lines.append("    elif value is None:")
+            lines.append(f"        result[{key}] = None" if field.nullable else f"        errors[{key}] = 'must not be null'")
+            lines.append("    else:")
+            lines.append(f"        result[{key}] = value")
+            field.emit(lines, '        ', 'value', key, constant)
+        if self.unknown == 'reject':
+            lines.append("    if len(data) > len(result):")  # Only look for the unknown fields if there are any
+            lines.append(f"        for name in data.keys() - {constant(frozenset(self.fields))}:")
+            lines.append("            errors[name] = 'is not allowed'")
+        lines.append("    if errors:")
+        lines.append("        raise ValidationError(errors)")
+        lines.append("    return result")
+
+        exec(compile('\n'.join(lines), f"<schema {', '.join(self.fields)}>", 'exec'), namespace)
+        return namespace['validate']
+
+
+# Article payloads, limited to what the scientific_articles columns hold
+ARTICLE_FIELDS = {
+    'title': String(min_length=1, max_length=255),
+    'authors': Array(String(min_length=1)),
+    'publication_date': Date(),
+    'keywords': Array(String(min_length=1)),
+    'abstract': String(max_bytes=65535),
+    'journal': String(max_length=255),
+    'doi': String(min_length=1, max_length=255),
+    'pages': Integer(minimum=0, maximum=2 ** 31 - 1, required=False, nullable=True),
+}
+ARTICLE_SCHEMA = Schema({**ARTICLE_FIELDS, 'user_id': Integer(minimum=1)})
+ARTICLE_UPDATE_SCHEMA = Schema(ARTICLE_FIELDS, unknown='drop')  # Other fields (e.g. `id`) are ignored
+IMPORT_ENTRY_SCHEMA = Schema(ARTICLE_FIELDS, unknown='drop')  # Parsers may read extra reference fields
+DOI_LOOKUP_SCHEMA = Schema({'user_id': Integer(minimum=1),
+                            'dois': Array(String(max_length=255), max_items=Config.DOI_LOOKUP_MAX)})
+CITATIONS_SCHEMA = Schema({'cited_ids': Array(Integer(minimum=1), min_items=1, max_items=Config.CITATION_BATCH_MAX)})
+
+# User payloads, limited to what the users columns hold
+USERNAME = String(max_length=50, pattern=EMAIL_PATTERN, message="must be a valid email address")
+PASSWORD = String(min_length=6, max_length=255)
+NAME = String(min_length=1, max_length=50)
+REGISTER_SCHEMA = Schema({'username': USERNAME, 'password': PASSWORD, 'first_name': NAME, 'last_name': NAME},
+                         unknown='drop')
+LOGIN_SCHEMA = Schema({'username': USERNAME, 'password': PASSWORD}, unknown='drop')
+USER_UPDATE_SCHEMA = Schema({'username': USERNAME, 'first_name': NAME, 'last_name': NAME}, unknown='drop')
+PASSWORD_CHANGE_SCHEMA = Schema({'old_password': String(), 'new_password': PASSWORD}, unknown='drop')
+
+# The compiled validators, shared by the single-item, partial (PATCH) and bulk endpoints
+validate_article = ARTICLE_SCHEMA.compile()
+validate_article_update = ARTICLE_UPDATE_SCHEMA.compile()
+validate_article_patch = ARTICLE_UPDATE_SCHEMA.compile(partial=True)
+validate_import_entry = IMPORT_ENTRY_SCHEMA.compile()
+validate_doi_lookup = DOI_LOOKUP_SCHEMA.compile()
+validate_citations = CITATIONS_SCHEMA.compile()
+validate_registration = REGISTER_SCHEMA.compile()
+validate_login = LOGIN_SCHEMA.compile()
+validate_user_update = USER_UPDATE_SCHEMA.compile()
+validate_password_change = PASSWORD_CHANGE_SCHEMA.compile()
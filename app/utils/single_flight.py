@@ -0,0 +1,86 @@
+import threading  # Import threading to coordinate concurrent callers
+
+from werkzeug.exceptions import ServiceUnavailable  # Import ServiceUnavailable for callers that wait too long
+
+from app.utils.database import register_after_fork  # Import the hook run in worker processes after a fork
+from app.utils.deadlines import DeadlineExceeded  # Import DeadlineExceeded for followers past their deadline
+
+
+class _Call:
+    """An in-flight call whose result is shared by every caller with the same key."""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()  # Set once the leader has finished
+        self.result = None  # The value returned by the leader
+        self.error = None  # The exception raised by the leader, if any
+        self.waiters = 0  # Number of callers sharing this call besides the leader
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls so that only one of them does the work.
+
+    The first caller for a key (the leader) runs the function; callers arriving with the same key
+    while it is running wait for it and receive the same result, or the same exception. The call
+    is forgotten as soon as it finishes, so results are never served stale.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout  # Maximum number of seconds a follower waits for the leader
+        self.shared = 0  # Number of calls answered from another caller's result (for monitoring)
+        self._reset()
+        register_after_fork(self._reset)  # Calls in flight in the parent never finish in a child
+
+    def _reset(self):
+        """Forget the calls in flight."""
+        self.calls = {}  # key -> _Call currently in flight
+        self.lock = threading.Lock()
+
+    def do(self, key, function, *args, deadline=None, **kwargs):
+        """
+        Run `function(*args, **kwargs)` once for all concurrent callers with the same key.
+
+        **Parameters:**
+            - `key`: A hashable key identifying identical calls.
+            - `function`: The function to run.
+            - `deadline`: The caller's Deadline, or None; a follower waits for the leader at most
+              until then (the function gets it only if it is also passed in `args`).
+
+        **Returns:**
+            - The function's result.
+
+        **Raises:**
+            - The exception raised by the function, for the leader and every follower.
+            - `ServiceUnavailable`: If a follower waited longer than the timeout.
+            - `DeadlineExceeded`: If a follower's deadline passed while it waited.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if leader:
+            try:
+                call.result = function(*args, **kwargs)
+            except Exception as e:
+                call.error = e
+            finally:
+                with self.lock:
+                    del self.calls[key]  # New callers start a fresh call from now on
+                    self.shared += call.waiters
+                call.done.set()  # Wake up the followers
+        else:
+            timeout = self.timeout if deadline is None else max(0.0, min(self.timeout, deadline.remaining()))
+            if not call.done.wait(timeout):
+                if deadline is not None and deadline.remaining() <= 0:
+                    raise DeadlineExceeded()
+                raise ServiceUnavailable("Timed out waiting for an identical request in progress.")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
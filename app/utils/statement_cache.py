@@ -0,0 +1,98 @@
+import os  # Import os to hook process forks
+import threading  # Import threading to guard the registry of caches
+import weakref  # Import weakref so that the registry does not keep closed connections alive
+from collections import OrderedDict  # Import OrderedDict to keep the statements in LRU order
+
+_caches = weakref.WeakSet()  # Every open StatementCache of the process, for the statistics
+_caches_lock = threading.Lock()
+
+
+class StatementCache:
+    """
+    The server-side prepared statements of one connection, least recently used first.
+
+    Each cached statement is a prepared cursor: it is parsed and planned by the server once, then
+    executed with new parameters over the binary protocol. At most `capacity` statements are kept;
+    the least recently used one is closed (deallocated on the server) to make room. Statements are
+    prepared lazily on first use and again after a reconnect, which starts a new server session
+    (detected by its connection ID) where the old statements no longer exist.
+
+    A cache belongs to its connection, and is only used by the thread the connection is bound to.
+    """
+
+    def __init__(self, connection, cursor, capacity):
+        self.connection = connection
+        self.cursor = cursor  # The connection's plain cursor, used when caching is disabled
+        self.capacity = capacity  # Prepared statements kept (0 disables preparing)
+        self.statements = OrderedDict()  # SQL -> (the same SQL string object, its prepared cursor)
+        self.session = None  # Connection ID of the session the statements were prepared on
+        self.hits = 0  # Executions of an already prepared statement
+        self.prepares = 0  # Statements prepared (first use, after an eviction or a reconnect)
+        self.evictions = 0
+        with _caches_lock:
+            _caches.add(self)
+
+    def execute(self, statement, params=()):
+        """
+        Execute a statement as a prepared statement and return its cursor, to fetch the results from.
+
+        Only use this for statements whose text does not vary (no generated lists of placeholders),
+        so that they are actually reused.
+        """
+        if not self.capacity:
+            self.cursor.execute(statement, params)
+            return self.cursor
+
+        session = self.connection.connection_id
+        if session != self.session:
+            self.statements.clear()  # The server forgot them with the old session; do not close them
+            self.session = session
+
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.prepares += 1
+            entry = self.statements[statement] = (statement, self.connection.cursor(prepared=True))
+            if len(self.statements) > self.capacity:
+                _, (_, evicted) = self.statements.popitem(last=False)
+                self.evictions += 1
+                evicted.close()  # Deallocate the statement on the server
+        else:
+            self.hits += 1
+            self.statements.move_to_end(statement)
+
+        # A prepared cursor only reuses its statement when given the very string object it prepared
+        prepared_statement, cursor = entry
+        cursor.execute(prepared_statement, params)
+        return cursor
+
+
+def _forget_inherited_caches():
+    """Leave the caches of the parent's connections out of a child process's statistics."""
+    global _caches, _caches_lock
+    _caches, _caches_lock = weakref.WeakSet(), threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):  # Not available on Windows, which cannot fork
+    os.register_at_fork(after_in_child=_forget_inherited_caches)
+
+
+def statement_stats():
+    """
+    Return the prepared statement statistics of the connections currently open in this process.
+
+    **Returns:**
+        - A dictionary with the number of `connections`, cached `statements`, `hits`, `prepares`,
+          `evictions` and the `hit_rate` (share of executions that reused a prepared statement).
+    """
+    with _caches_lock:
+        caches = list(_caches)
+    hits = sum(cache.hits for cache in caches)
+    prepares = sum(cache.prepares for cache in caches)
+    return {
+        "connections": len(caches),
+        "statements": sum(len(cache.statements) for cache in caches),
+        "hits": hits,
+        "prepares": prepares,
+        "evictions": sum(cache.evictions for cache in caches),
+        "hit_rate": round(hits / (hits + prepares), 4) if hits + prepares else None,
+    }
@@ -0,0 +1,209 @@
+import re  # Import the re module to tokenize text
+import threading  # Import threading to guard the index during rebuilds
+import time  # Import time to throttle rebuilds
+from collections import Counter  # Import Counter to count term occurrences
+
+import numpy as np  # Import NumPy for vectorized weighting and ranking
+from scipy import sparse  # Import SciPy sparse matrices for the document-term matrix
+
+from app.utils.article_index import ArticleIndex  # Import the base class of the article indexes
+from app.utils.validations import as_list  # Import the helper reading list fields as lists
+
+TOKEN = re.compile(r"[^\W\d_][\w-]+")  # Words of at least two characters starting with a letter
+
+# Common English words that carry no topical information
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the their this to using was
+we were which with within without via based new study analysis results approach paper
+""".split())
+
+TITLE_WEIGHT = 2  # Title terms count twice as much as abstract terms
+KEYWORD_WEIGHT = 3  # Keywords are curated by the user, so they count the most
+
+
+def tokenize(text):
+    """Split text into lower-cased terms, dropping stop words."""
+    return [term for term in TOKEN.findall(text.lower()) if term not in STOP_WORDS]
+
+
+def article_terms(article):
+    """Count the weighted terms of an article's title, keywords and abstract."""
+    counts = Counter()
+    for term in tokenize(article.title or ''):
+        counts[term] += TITLE_WEIGHT
+    for keyword in as_list(article.keywords):
+        for term in tokenize(str(keyword)):
+            counts[term] += KEYWORD_WEIGHT
+    counts.update(tokenize(article.abstract or ''))
+    return counts
+
+
+class TfidfIndex(ArticleIndex):
+    """
+    A sparse TF-IDF index over article titles, keywords and abstracts, answering "related
+    articles" queries with top-k cosine similarity.
+
+    Term counts are kept per article and the L2-normalized TF-IDF matrix is rebuilt in batches:
+    changes mark the index dirty, and the next query rebuilds it if at least `rebuild_interval`
+    seconds have passed since the last build. Until then, a queried article that is new (e.g.
+    created by another process) or updated is weighted with the vocabulary and IDF of the built
+    matrix and compared with the articles already in it, and deleted articles are masked out.
+
+    The matrix is kept within `memory_budget` bytes by dropping terms that appear in only one
+    article (they cannot make two articles similar) and then the most common terms, which carry
+    the least weight and account for most of the non-zero entries.
+    """
+
+    def __init__(self, memory_budget, rebuild_interval):
+        self.memory_budget = memory_budget  # Maximum size of the matrix in bytes
+        self.rebuild_interval = rebuild_interval  # Minimum number of seconds between rebuilds
+        self.documents = {}  # article_id -> Counter of weighted terms
+        self.lock = threading.RLock()
+        self.dirty = False  # True when documents changed since the last build
+        self.built_at = 0.0  # time.monotonic() of the last build
+        self.removed = set()  # Articles deleted since the last build
+        self._reset_matrix()
+
+    def _reset_matrix(self):
+        """Drop the built matrix."""
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)  # Rows are articles, columns are terms
+        self.row_ids = np.zeros(0, dtype=np.int64)  # Article ID of each matrix row
+        self.rows = {}  # article_id -> matrix row
+        self.vocabulary = {}  # term -> matrix column
+        self.idf = np.zeros(0, dtype=np.float32)  # Inverse document frequency of each column
+        self.dropped_terms = 0  # Number of terms dropped to respect the memory budget
+
+    def build(self, articles):
+        """Replace the indexed articles and rebuild the matrix."""
+        with self.lock:
+            self.documents = {article.id: article_terms(article) for article in articles}
+            self.removed.clear()
+            self.rebuild()
+
+    def add(self, article):
+        """Index a created or updated article; it is included in the matrix at the next rebuild."""
+        with self.lock:
+            self.documents[article.id] = article_terms(article)
+            self.removed.discard(article.id)
+            self.dirty = True
+
+    def remove(self, article_id):
+        """Remove an article; it is excluded from results immediately."""
+        with self.lock:
+            if self.documents.pop(article_id, None) is not None:
+                self.removed.add(article_id)
+                self.dirty = True
+
+    def rebuild(self):
+        """Rebuild the TF-IDF matrix from the indexed term counts."""
+        with self.lock:
+            article_ids = np.fromiter(self.documents.keys(), dtype=np.int64, count=len(self.documents))
+            document_frequency = Counter()
+            for counts in self.documents.values():
+                document_frequency.update(counts.keys())
+
+            vocabulary = self._select_vocabulary(document_frequency)
+
+            # Assemble the (row, column, count) triplets of the document-term matrix
+            indptr, indices, data = [0], [], []
+            for counts in self.documents.values():
+                for term, count in counts.items():
+                    column = vocabulary.get(term)
+                    if column is not None:
+                        indices.append(column)
+                        data.append(count)
+                indptr.append(len(indices))
+
+            matrix = sparse.csr_matrix(
+                (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+                shape=(len(article_ids), len(vocabulary)))
+
+            df = np.bincount(matrix.indices, minlength=matrix.shape[1]).astype(np.float32)
+            idf = (np.log((1 + len(article_ids)) / (1 + df)) + 1).astype(np.float32)
+            if matrix.nnz:
+                # Sublinear term frequency times smoothed inverse document frequency
+                matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+
+                # L2-normalize the rows so that dot products are cosine similarities
+                norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+                norms[norms == 0] = 1
+                matrix = sparse.diags(1 / norms).dot(matrix).tocsr().astype(np.float32)
+
+            self.matrix, self.row_ids, self.vocabulary, self.idf = matrix, article_ids, vocabulary, idf
+            self.rows = {int(article_id): row for row, article_id in enumerate(article_ids)}
+            self.removed.clear()
+            self.dirty = False
+            self.built_at = time.monotonic()
+
+    def _select_vocabulary(self, document_frequency):
+        """Choose the matrix columns, dropping terms until the matrix fits the memory budget."""
+        terms = [(df, term) for term, df in document_frequency.items() if df > 1]
+        terms.sort()  # Rarest terms first
+        bytes_per_entry = np.dtype(np.float32).itemsize + np.dtype(np.int32).itemsize
+        budget_entries = max(0, self.memory_budget - 8 * (len(self.documents) + 1)) // bytes_per_entry
+
+        # Keep the rarest (most discriminating) terms whose entries fit in the budget
+        total, keep = 0, 0
+        for df, _ in terms:
+            if total + df > budget_entries:
+                break
+            total += df
+            keep += 1
+        self.dropped_terms = len(document_frequency) - keep
+        return {term: column for column, (_, term) in enumerate(terms[:keep])}
+
+    def related(self, article_id, k):
+        """
+        Find the articles most similar to the given article.
+
+        **Parameters:**
+            - `article_id`: int - The ID of the article.
+            - `k`: int - Maximum number of related articles to return.
+
+        **Returns:**
+            - A list of `(article_id, score)` tuples, most similar first, or None if the article
+              is not indexed.
+        """
+        with self.lock:
+            if article_id not in self.documents:
+                return None
+            if self.dirty and time.monotonic() - self.built_at >= self.rebuild_interval:
+                self.rebuild()
+            matrix, row_ids, removed = self.matrix, self.row_ids, set(self.removed)
+            row = self.rows.get(article_id)  # None if the article was added since the last build
+            vector = self._vector(self.documents[article_id])  # Its current terms, even if updated since
+
+        scores = matrix.dot(vector) if len(vector) else np.zeros(len(row_ids), dtype=np.float32)
+        if row is not None:
+            scores[row] = 0  # Never return the article itself
+        if removed:
+            scores[np.isin(row_ids, list(removed))] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(scores[candidates], -k)[-k:]]  # Top k in linear time
+        candidates = candidates[np.argsort(-scores[candidates])]
+        return [(int(row_ids[index]), float(scores[index])) for index in candidates]
+
+    def _vector(self, counts):
+        """Weight an article's term counts like a row of the built matrix (with its vocabulary and IDF)."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] = (1 + np.log(count)) * self.idf[column]
+        norm = np.sqrt(vector.dot(vector))
+        return vector / norm if norm else vector
+
+    def stats(self):
+        """Return the size of the index."""
+        with self.lock:
+            return {
+                "articles": len(self.documents),
+                "terms": len(self.vocabulary),
+                "dropped_terms": self.dropped_terms,
+                "non_zero_entries": int(self.matrix.nnz),
+                "matrix_bytes": int(self.matrix.data.nbytes + self.matrix.indices.nbytes + self.matrix.indptr.nbytes),
+                "memory_budget": self.memory_budget,
+                "dirty": self.dirty
+            }
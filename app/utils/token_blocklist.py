@@ -0,0 +1,103 @@
+import hashlib  # Import hashlib to derive the Bloom filter bit positions
+import math  # Import math to size the Bloom filter
+import threading  # Import threading to guard updates of the blocklist
+import time  # Import time to prune expired entries
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter of strings.
+
+    Membership tests never give false negatives, and give false positives with about the
+    configured probability while the filter holds at most `capacity` items. Items cannot be
+    removed; the filter is rebuilt instead.
+    """
+
+    __slots__ = ('size', 'hashes', 'bits')
+
+    def __init__(self, capacity, false_positive_rate):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))  # Bits
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))  # Bit positions per item
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        """Yield the bit positions of an item (double hashing over one 128-bit digest)."""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, item):
+        """Add an item to the filter."""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        """Return False if the item was certainly never added, True if it probably was."""
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenBlocklist:
+    """
+    An in-memory set of revoked token IDs (`jti` claims) with their expiry times.
+
+    Lookups first test a Bloom filter, which answers "not revoked" for almost every valid token
+    without touching the exact set; only probable hits are confirmed against the exact dictionary.
+    Expired entries are pruned, since an expired token is rejected anyway, and the filter is rebuilt
+    from the remaining entries (twice as large when they outgrow its capacity).
+
+    Lookups take no lock: the filter and the dictionary are replaced, never mutated in a way a
+    concurrent reader could observe half-done, and entries are added to the dictionary first.
+    """
+
+    def __init__(self, capacity, false_positive_rate):
+        self.capacity = capacity  # Entries the filter is sized for
+        self.false_positive_rate = false_positive_rate
+        self.entries = {}  # jti -> expires_at (seconds since the epoch)
+        self.bloom = BloomFilter(capacity, false_positive_rate)
+        self.lock = threading.Lock()
+
+    def is_revoked(self, jti):
+        """Return whether the token with the given ID is revoked."""
+        return jti in self.bloom and jti in self.entries
+
+    def add(self, jti, expires_at):
+        """Revoke a token until it expires."""
+        with self.lock:
+            if jti in self.entries:
+                return
+            self.entries[jti] = expires_at
+            if len(self.entries) > self.capacity:
+                self.capacity *= 2  # Keep the false positive rate by growing the filter
+                self._rebuild()
+            else:
+                self.bloom.add(jti)
+
+    def prune(self, now=None):
+        """Forget the tokens that have expired and return how many were removed."""
+        now = time.time() if now is None else now
+        with self.lock:
+            entries = {jti: expires_at for jti, expires_at in self.entries.items() if expires_at > now}
+            removed = len(self.entries) - len(entries)
+            if removed:
+                self.entries = entries
+                self._rebuild()
+            return removed
+
+    def _rebuild(self):
+        """Replace the Bloom filter with one holding exactly the current entries (the caller holds the lock)."""
+        bloom = BloomFilter(self.capacity, self.false_positive_rate)
+        for jti in self.entries:
+            bloom.add(jti)
+        self.bloom = bloom
+
+    def reset_lock(self):
+        """Replace the lock, which may have been held when the process forked."""
+        self.lock = threading.Lock()
+
+    def stats(self):
+        """Return the size of the blocklist."""
+        return {"revoked": len(self.entries), "capacity": self.capacity, "bloom_bytes": len(self.bloom.bits),
+                "bloom_hashes": self.bloom.hashes}
@@ -0,0 +1,124 @@
+import re  # Import the re module to normalize text
+import threading  # Import threading to guard the index
+from collections import Counter, defaultdict  # Import containers used to count and group trigrams
+
+from app.utils.article_index import ArticleIndex  # Import the base class of the article indexes
+
+NON_ALPHANUMERIC = re.compile(r"[\W_]+")  # Runs of characters that separate words
+
+
+def trigrams(text):
+    """
+    Compute the set of trigrams of a text.
+
+    Words are lower-cased and padded (two spaces before, one after) so that short words and word
+    boundaries produce trigrams too, e.g. "cat" -> {"  c", " ca", "cat", "at "}. Since the result is
+    a set, word order does not matter.
+    """
+    result = set()
+    for word in NON_ALPHANUMERIC.sub(' ', (text or '').lower()).split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class TrigramIndex(ArticleIndex):
+    """
+    An in-memory trigram index over article titles and journal names, partitioned by user.
+
+    Each user has their own posting lists (trigram -> article IDs), so a search only ever touches
+    the postings of the searching user's library. Candidates are scored by the fraction of the
+    query's trigrams they contain, which tolerates typos and word reordering.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(lambda: defaultdict(set))  # user_id -> trigram -> {article_id}
+        self.documents = {}  # article_id -> (user_id, frozenset of trigrams)
+        self.lock = threading.Lock()
+
+    def build(self, articles):
+        """Replace the indexed articles."""
+        with self.lock:
+            self.postings.clear()
+            self.documents.clear()
+            for article in articles:
+                self._add(article)
+
+    def add(self, article):
+        """Index a created or updated article."""
+        with self.lock:
+            self._remove(article.id)
+            self._add(article)
+
+    def remove(self, article_id):
+        """Remove a deleted article."""
+        with self.lock:
+            self._remove(article_id)
+
+    def _add(self, article):
+        """Add an article's title and journal trigrams to its user's posting lists."""
+        grams = frozenset(trigrams(article.title) | trigrams(article.journal))
+        self.documents[article.id] = (article.user_id, grams)
+        user_postings = self.postings[article.user_id]
+        for gram in grams:
+            user_postings[gram].add(article.id)
+
+    def _remove(self, article_id):
+        """Remove an article from its user's posting lists."""
+        document = self.documents.pop(article_id, None)
+        if document is None:
+            return
+        user_id, grams = document
+        user_postings = self.postings[user_id]
+        for gram in grams:
+            ids = user_postings.get(gram)
+            if ids is not None:
+                ids.discard(article_id)
+                if not ids:
+                    del user_postings[gram]  # Keep the index compact
+        if not user_postings:
+            del self.postings[user_id]
+
+    def search(self, user_id, query, threshold, limit):
+        """
+        Find a user's articles whose title or journal resembles the query.
+
+        **Parameters:**
+            - `user_id`: int - The user whose library is searched.
+            - `query`: str - The search text.
+            - `threshold`: float - Minimum fraction (0-1) of the query's trigrams an article must contain.
+            - `limit`: int - Maximum number of results.
+
+        **Returns:**
+            - A list of `(article_id, score)` tuples, best match first.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        with self.lock:
+            user_postings = self.postings.get(user_id, {})
+            shared = Counter()  # article_id -> number of query trigrams it contains
+            for gram in query_grams:
+                shared.update(user_postings.get(gram, ()))
+            sizes = {article_id: len(self.documents[article_id][1]) for article_id in shared}
+
+        minimum = threshold * len(query_grams)
+        scored = []
+        for article_id, count in shared.items():
+            if count >= minimum:
+                score = count / len(query_grams)
+                overlap = count / (len(query_grams) + sizes[article_id] - count)  # Jaccard, to break ties
+                scored.append((score, overlap, article_id))
+
+        scored.sort(reverse=True)
+        return [(article_id, round(score, 4)) for score, _, article_id in scored[:limit]]
+
+    def stats(self):
+        """Return the size of the index."""
+        with self.lock:
+            return {
+                "articles": len(self.documents),
+                "users": len(self.postings),
+                "postings": sum(len(ids) for user_postings in self.postings.values() for ids in user_postings.values())
+            }
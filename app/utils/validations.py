@@ -1,51 +1,62 @@
+import json  # Import the JSON library to decode list fields read from the database
 import re
 
 from flask import request  # Import the request object from Flask
 
+# Prefixes commonly found in front of DOIs (resolver URLs and the "doi:" scheme)
+DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
 
-def validate_json_and_required_fields(required_fields):
+
+def validate_json(validator):
     """
-    Validate that the request is JSON and contains the required fields.
+    Validate that the request is JSON and that its body matches a schema.
 
     **Parameters:**
-        - `required_fields`: List of required fields that must be present in the request JSON.
+        - `validator`: callable - A compiled schema validator (see `app.utils.schema`).
 
     **Returns:**
-        - Parsed JSON data from the request if valid.
+        - The validated fields of the request body.
 
     **Raises:**
-        - `ValueError`: If the request is not JSON or if any required fields are missing.
+        - `ValueError`: If the request is not JSON.
+        - `ValidationError`: If the body does not match the schema, with an error per invalid field.
     """
     if not request.is_json:  # Check if the request body is JSON
         raise ValueError("Request body must be JSON.")  # Raise an error if not JSON
 
-    data = request.get_json()  # Parse the JSON body of the request
-    missing_fields = [field for field in required_fields if field not in data]  # Identify any missing fields
+    return validator(request.get_json())  # Return the validated fields
+
 
-    if missing_fields:  # If there are missing fields
-        raise ValueError(
-            f"Missing required fields: {', '.join(missing_fields)}")  # Raise an error listing the missing fields
+def as_list(value):
+    """
+    Return a list field of an article (authors or keywords) as a list.
 
-    return data  # Return the parsed JSON data if all validations pass
+    Articles read from the database carry these fields as JSON strings, while articles built
+    from request payloads carry them as lists.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+    return list(value) if isinstance(value, (list, tuple)) else []
 
 
-def validate_username_and_password(username=None, password=None):
+def normalize_doi(doi):
     """
-    Validate the username and password.
+    Normalize a DOI so that equivalent spellings compare equal.
+
+    DOIs are case-insensitive, and are often written as resolver URLs (`https://doi.org/...`)
+    or with a `doi:` prefix. The normalized form is the bare, lower-cased DOI (e.g. `10.1234/abc`).
 
     **Parameters:**
-        - `username`: str, optional - The username to validate.
-        - `password`: str, optional - The password to validate.
+        - `doi`: str - The DOI to normalize.
 
-    **Raises:**
-        - ValueError: If the username is not a valid email format or the password is less than 6 characters.
+    **Returns:**
+        - The normalized DOI, or the value unchanged if it is not a string.
     """
-    if username is not None:  # Check if username is provided
-        # Check if username is a valid email
-        if not re.match(r"^[\w.-]+@[\w.-]+\.\w+$", username):
-            raise ValueError("Invalid email format for username.")
-
-    if password is not None:  # Check if password is provided
-        # Check if password meets security requirements (length)
-        if len(password) < 6:
-            raise ValueError("Password must be at least 6 characters long.")
+    if not isinstance(doi, str):
+        return doi
+    return DOI_PREFIX.sub('', doi.strip()).strip().lower()
@@ -0,0 +1,82 @@
+"""
+Benchmark of the compiled payload validators.
+
+Measures the cost of validating one article payload (valid and invalid) with the compiled
+validator, and with an equivalent hand-written validator for comparison. Run from the project
+root with:
+
+    python -m benchmarks.validation [--items 100000]
+"""
+import argparse  # Import argparse to read the command-line options
+import timeit  # Import timeit to time the validators
+from datetime import date  # Import date for the hand-written date check
+
+from app.utils.schema import ValidationError, validate_article  # Import the validator being measured
+
+VALID = {
+    "title": "Deep learning for protein structure prediction",
+    "authors": ["John Doe", "Jane Roe", "Alex Poe"],
+    "publication_date": "2021-07-15",
+    "keywords": ["deep learning", "proteins", "structure"],
+    "abstract": "We present a method for predicting protein structures. " * 10,
+    "journal": "Nature",
+    "doi": "10.1038/s41586-021-03819-2",
+    "pages": 12,
+    "user_id": 1,
+}
+INVALID = {**VALID, "authors": ["John Doe", 42], "publication_date": "2021-02-30", "pages": "12"}
+
+
+def validate_by_hand(data):
+    """A straightforward validator with the same rules, written as sequential checks."""
+    errors = {}
+    for field in ("title", "authors", "publication_date", "keywords", "abstract", "journal", "doi", "user_id"):
+        if field not in data:
+            errors[field] = "is required"
+    for field in ("title", "journal", "doi"):
+        value = data.get(field)
+        if field in data and (not isinstance(value, str) or not value or len(value) > 255):
+            errors[field] = "is invalid"
+    for field in ("authors", "keywords"):
+        value = data.get(field)
+        if field in data and (not isinstance(value, list) or
+                              not all(isinstance(item, str) and item for item in value)):
+            errors[field] = "is invalid"
+    if "publication_date" in data:
+        try:
+            date.fromisoformat(data["publication_date"])
+        except (TypeError, ValueError):
+            errors["publication_date"] = "is invalid"
+    pages = data.get("pages")
+    if pages is not None and (type(pages) is not int or pages < 0):
+        errors["pages"] = "is invalid"
+    if errors:
+        raise ValidationError(errors)
+    return data
+
+
+def per_item(validator, payload, items):
+    """Return the average time, in microseconds, to validate (or reject) one payload."""
+
+    def run():
+        try:
+            validator(payload)
+        except ValidationError:
+            pass
+
+    return min(timeit.repeat(run, number=items, repeat=5)) / items * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100000, help="payloads validated per measurement")
+    args = parser.parse_args()
+
+    print(f"{'validator':<14}{'valid (us)':>12}{'invalid (us)':>14}")
+    for name, validator in (("compiled", validate_article), ("hand-written", validate_by_hand)):
+        print(f"{name:<14}{per_item(validator, VALID, args.items):>12.2f}"
+              f"{per_item(validator, INVALID, args.items):>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# Gunicorn settings for serving the API with several worker processes: `gunicorn wsgi:app`.
+#
+# The application is loaded once in the master process and inherited by the forked workers. Database
+# connections are opened lazily and each process re-initializes its connections, locks and caches
+# after the fork (see app/utils/database.py), so nothing opened in the master is shared.
+#
+# Reload the workers gracefully with `kill -HUP <master pid>`. With preloading, HUP restarts the
+# workers with the code already loaded; to deploy new code without downtime, send USR2 to start a
+# new master and then QUIT to the old one (or set GUNICORN_PRELOAD=false so HUP reloads the code).
+import math
+import os
+
+from app.config import Config
+
+
+def available_cores():
+    """Count the cores this process may use, honoring CPU affinity and cgroup (container) quotas."""
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as cpu_max:  # cgroup v2, e.g. "200000 100000" for 2 CPUs
+            quota, period = cpu_max.read().split()
+        if quota != 'max':
+            cores = min(cores, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cores
+
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = Config.WEB_CONCURRENCY or available_cores() * 2 + 1  # One busy and one waiting on I/O per core
+worker_class = 'gthread'
+threads = Config.WEB_THREADS  # Each thread binds its own database connection while serving a request
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))  # Seconds before a silent worker is killed
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))  # Seconds to finish requests on reload
+keepalive = 5
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))  # Recycle workers after N requests (0 = never)
+max_requests_jitter = max_requests // 10  # Avoid recycling every worker at once
+accesslog = '-'
+
+
+def worker_exit(server, worker):
+    """Hand running background jobs back to the queue and close the worker's database connections."""
+    from app.services.job_service import job_service
+    from app.utils.database import close_connections
+
+    job_service.shutdown(graceful_timeout)
+    close_connections()
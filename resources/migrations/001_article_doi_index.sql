@@ -0,0 +1,14 @@
+-- Normalize stored DOIs (bare, lower-cased, without resolver prefixes) and make them unique
+-- within a user's library, which also indexes exact DOI lookups.
+
+UPDATE scientific_articles
+SET doi = LOWER(TRIM(REGEXP_REPLACE(TRIM(doi), '^(https?://(dx\\.)?doi\\.org/|doi:[[:space:]]*)', '', 1, 0, 'i')))
+WHERE doi IS NOT NULL;
+
+-- Keep only the oldest article of each DOI in a user's library (normalizing may reveal duplicates)
+DELETE duplicate
+FROM scientific_articles duplicate
+JOIN scientific_articles original
+  ON original.user_id = duplicate.user_id AND original.doi = duplicate.doi AND original.id < duplicate.id;
+
+CREATE UNIQUE INDEX idx_articles_user_doi ON scientific_articles (user_id, doi);
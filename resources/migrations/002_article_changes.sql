@@ -0,0 +1,17 @@
+-- Change log of the scientific_articles table, read by sync clients through
+-- GET /api/articles/changes. Every create, update and delete appends a row in the
+-- same transaction as the article write; deletes are kept as tombstones.
+
+CREATE TABLE article_changes (
+    seq BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    article_id INT NOT NULL,
+    user_id INT NOT NULL,
+    operation ENUM('upsert', 'delete') NOT NULL,
+    changed_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    PRIMARY KEY (seq),
+    KEY idx_article_changes_user_seq (user_id, seq)
+);
+
+-- Seed the log with the existing articles so that a sync from the beginning returns them all.
+INSERT INTO article_changes (article_id, user_id, operation)
+SELECT id, user_id, 'upsert' FROM scientific_articles ORDER BY id;
@@ -0,0 +1,23 @@
+-- Background jobs (bulk imports, index rebuilds, ...) run by the in-process worker pool and
+-- polled by clients through GET /api/jobs/<id>. A job is claimed by the worker that moves it
+-- from 'queued' to 'running'; updated_at doubles as the heartbeat of a running job.
+
+CREATE TABLE jobs (
+    id CHAR(32) NOT NULL,
+    type VARCHAR(64) NOT NULL,
+    status ENUM('queued', 'running', 'succeeded', 'failed', 'cancelled') NOT NULL DEFAULT 'queued',
+    user_id INT NULL,
+    params JSON NOT NULL,
+    progress INT NOT NULL DEFAULT 0,
+    total INT NULL,
+    result LONGTEXT NULL,
+    error TEXT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (id),
+    KEY idx_jobs_status_updated (status, updated_at)
+);
@@ -0,0 +1,24 @@
+-- JWT revocation. Every issued token is recorded by its jti so that all the tokens of a user can be
+-- revoked (password change, account deletion); revoked tokens are copied to revoked_tokens, which
+-- every process loads into memory and polls for new rows. Rows are pruned once the token expires.
+-- expires_at is the token's "exp" claim (seconds since the epoch).
+
+CREATE TABLE issued_tokens (
+    jti CHAR(36) NOT NULL,
+    user_id INT NOT NULL,
+    token_type ENUM('access', 'refresh') NOT NULL,
+    expires_at BIGINT NOT NULL,
+    PRIMARY KEY (jti),
+    KEY idx_issued_tokens_user_expires (user_id, expires_at),
+    KEY idx_issued_tokens_expires (expires_at)
+);
+
+CREATE TABLE revoked_tokens (
+    jti CHAR(36) NOT NULL,
+    user_id INT NOT NULL,
+    expires_at BIGINT NOT NULL,
+    revoked_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    PRIMARY KEY (jti),
+    KEY idx_revoked_tokens_revoked_at (revoked_at),
+    KEY idx_revoked_tokens_expires (expires_at)
+);
@@ -0,0 +1,11 @@
+-- Shard directory, read from the main database when ARTICLE_SHARDS lists extra databases.
+-- Users are placed on a shard by consistent hashing of their ID; a row here pins a user to a
+-- shard instead (0 = the main database, 1.. = the shards of ARTICLE_SHARDS, in order), e.g.
+-- after moving a large library to its own database. Every shard needs the scientific_articles
+-- and article_changes tables (the initial schema plus migrations 001 and 002).
+
+CREATE TABLE shard_directory (
+    user_id INT NOT NULL,
+    shard SMALLINT UNSIGNED NOT NULL,
+    PRIMARY KEY (user_id)
+);
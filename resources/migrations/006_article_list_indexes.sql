@@ -0,0 +1,12 @@
+-- Composite indexes of the filtered and sorted article lists (GET /api/articles and
+-- GET /api/articles/user/<user_id> with from/to/journal/sort/cursor). Each index starts with the
+-- equality filters, followed by the sort column; InnoDB appends the primary key (id) to every
+-- secondary index, so the keyset condition (column, id) > (?, ?) is a single range scan.
+-- Apply to every shard.
+
+CREATE INDEX idx_articles_user_date ON scientific_articles (user_id, publication_date);
+CREATE INDEX idx_articles_user_title ON scientific_articles (user_id, title);
+CREATE INDEX idx_articles_user_journal_date ON scientific_articles (user_id, journal, publication_date);
+CREATE INDEX idx_articles_date ON scientific_articles (publication_date);
+CREATE INDEX idx_articles_title ON scientific_articles (title);
+CREATE INDEX idx_articles_journal_date ON scientific_articles (journal, publication_date);
@@ -0,0 +1,14 @@
+-- Citation graph between articles (POST/DELETE/GET /api/articles/<article_id>/citations).
+-- Each row says that `citing_id` cites `cited_id`. IDs are the global article IDs returned by
+-- the API (which encode the article's shard), so the table lives on the main database only and
+-- has no foreign keys; the citations of a deleted article are removed by the application.
+-- The primary key serves outgoing traversals (what an article cites) and the reverse index
+-- incoming ones (what cites an article), each frontier of a traversal being one range scan per node.
+
+CREATE TABLE article_citations (
+    citing_id BIGINT NOT NULL,
+    cited_id BIGINT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (citing_id, cited_id),
+    KEY idx_article_citations_cited (cited_id, citing_id)
+);
@@ -0,0 +1,7 @@
+-- Deferred user deletion. Deleting a user marks the account (deleted_at) so it disappears right
+-- away, and a background job then deletes the user's articles in small batches before deleting
+-- the users row itself. Accounts still being purged are listed through the deleted_at index.
+
+ALTER TABLE users
+    ADD COLUMN deleted_at DATETIME NULL DEFAULT NULL,
+    ADD KEY idx_users_deleted_at (deleted_at);
@@ -0,0 +1,11 @@
+-- Generation of the in-memory article indexes. POST /api/articles/indexes/rebuild increments it,
+-- and every process rebuilds its indexes when it sees a generation other than the one they were
+-- built for, so a rebuild requested through one worker reaches them all.
+
+CREATE TABLE index_generation (
+    id TINYINT UNSIGNED NOT NULL,
+    generation BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    PRIMARY KEY (id)
+);
+
+INSERT INTO index_generation (id, generation) VALUES (1, 0);
@@ -0,0 +1,5 @@
+# Production entry point, e.g. `gunicorn wsgi:app` (settings are read from gunicorn.conf.py).
+from app import create_app
+
+# Create the Flask application once; with preloading, worker processes inherit it when they are forked.
+app = create_app()